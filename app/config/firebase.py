@@ -11,6 +11,7 @@ from .settings import settings
 
 firebase_app: Optional[firebase_admin.App] = None
 firestore_client = None
+async_firestore_client = None
 
 
 def initialize_firebase() -> Optional[firebase_admin.App]:
@@ -116,6 +117,29 @@ def get_firestore_client():
     return firestore_client
 
 
+def get_async_firestore_client():
+    global async_firestore_client
+
+    if async_firestore_client:
+        return async_firestore_client
+
+    app = initialize_firebase()
+    if not app:
+        print("Firebase app not available, async Firestore client will be None")
+        return None
+
+    try:
+        from firebase_admin import firestore_async
+
+        async_firestore_client = firestore_async.client(app)
+        print("Async Firestore client created successfully")
+    except Exception as e:
+        print(f"Failed to create async Firestore client: {e}")
+        async_firestore_client = None
+
+    return async_firestore_client
+
+
 async def verify_firebase_token(token: str) -> Optional[dict]:
     app = initialize_firebase()
     if not app:
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import ConfigDict, computed_field
 
 
@@ -26,6 +26,40 @@ class Settings(BaseSettings):
     twilio_auth_token: Optional[str] = None
     twilio_verify_service_sid: Optional[str] = None
     
+    # Datastore engine: "firestore" (sync client on a thread pool),
+    # "firestore_async" (native asyncio client), "sqlite" (local file at
+    # sqlite_path) or "memory".
+    # The Firestore engines fall back to memory when Firebase is unavailable.
+    datastore_engine: str = "firestore"
+    sqlite_path: str = "data/collab.sqlite3"
+    # Directory for the in-memory store's snapshot + mutation log; unset keeps
+    # it purely in memory. A snapshot is taken every memory_snapshot_every writes.
+    memory_store_path: Optional[str] = None
+    memory_snapshot_every: int = 100_000
+    # Documents fetched per round trip by streaming scans (iter_query).
+    query_page_size: int = 500
+    # Read-through entity cache for get_by_id, enabled per collection by
+    # giving it a TTL in seconds, e.g. {"users": 30, "orders": 10}.
+    # Each enabled collection keeps at most entity_cache_max_entries documents.
+    entity_cache_ttl_seconds: Dict[str, float] = {}
+    entity_cache_max_entries: int = 10_000
+    # Query result cache for list endpoints, enabled per collection with a
+    # TTL in seconds. For query_cache_stale_seconds after that a result is
+    # still served while it is refreshed in the background.
+    query_cache_ttl_seconds: Dict[str, float] = {}
+    query_cache_stale_seconds: float = 30
+    query_cache_max_entries: int = 1_000
+    # Debug aid: run full model validation on documents read from the
+    # datastore instead of trusting what the repositories wrote.
+    validate_stored_documents: bool = False
+
+    # Dedicated thread pools for blocking Firestore / Cloud Storage calls.
+    # Calls beyond *_max_queue waiting tasks fail fast instead of queueing.
+    datastore_executor_workers: int = 32
+    datastore_executor_max_queue: int = 256
+    storage_executor_workers: int = 8
+    storage_executor_max_queue: int = 64
+
     environment: str = "development"
     log_level: str = "INFO"
 
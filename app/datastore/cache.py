@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+from prometheus_client import Counter
+
+from ..config.settings import settings
+from .indexes import FilterClause
+from .values import matches_clause
+
+ENTITY_CACHE_HITS = Counter(
+    "entity_cache_hits_total",
+    "Entity reads served from the read-through cache",
+    ["collection"],
+)
+ENTITY_CACHE_MISSES = Counter(
+    "entity_cache_misses_total",
+    "Entity reads that went to the datastore (absent or expired)",
+    ["collection"],
+)
+ENTITY_CACHE_EVICTIONS = Counter(
+    "entity_cache_evictions_total",
+    "Cached entities dropped to stay within entity_cache_max_entries",
+    ["collection"],
+)
+
+
+class EntityCache:
+    """Bounded LRU of documents of one collection, each valid for ``ttl`` seconds.
+
+    Documents are stored as read from the datastore and handed out as is:
+    callers must not change them, and the models built from them copy their
+    lists and dicts (``TimestampedModel.from_stored``) for that reason. Writes
+    made through the repositories drop the affected entry; the TTL bounds
+    how long changes made by other processes can go unseen.
+    """
+
+    def __init__(self, collection: str, ttl: float, max_entries: int) -> None:
+        self.collection = collection
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(doc_id)
+        if entry is not None:
+            expires_at, document = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(doc_id)
+                ENTITY_CACHE_HITS.labels(self.collection).inc()
+                return document
+            del self._entries[doc_id]
+        ENTITY_CACHE_MISSES.labels(self.collection).inc()
+        return None
+
+    def put(self, doc_id: str, document: Dict[str, Any]) -> None:
+        self._entries[doc_id] = (time.monotonic() + self.ttl, document)
+        self._entries.move_to_end(doc_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            ENTITY_CACHE_EVICTIONS.labels(self.collection).inc()
+
+    def invalidate(self, doc_id: str) -> None:
+        self._entries.pop(doc_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_CACHES: Dict[str, EntityCache] = {}
+
+
+def get_entity_cache(collection: str) -> Optional[EntityCache]:
+    """Return the shared cache of ``collection``, or None when it is not enabled
+    in ``settings.entity_cache_ttl_seconds``."""
+    cache = _CACHES.get(collection)
+    if cache is None:
+        ttl = settings.entity_cache_ttl_seconds.get(collection)
+        if not ttl:
+            return None
+        cache = EntityCache(collection, ttl, settings.entity_cache_max_entries)
+        _CACHES[collection] = cache
+    return cache
+
+
+def clear_entity_caches() -> None:
+    for cache in _CACHES.values():
+        cache.clear()
+
+
+QUERY_CACHE_REQUESTS = Counter(
+    "query_cache_requests_total",
+    "Cached query lookups by outcome: hit, stale (served while refreshing) or miss",
+    ["collection", "outcome"],
+)
+QUERY_CACHE_INVALIDATIONS = Counter(
+    "query_cache_invalidations_total",
+    "Cached query results dropped because a write could change them",
+    ["collection"],
+)
+
+
+def _top_level(field: str) -> str:
+    return field.split(".", 1)[0]
+
+
+@dataclass
+class _QueryEntry:
+    value: Any
+    filters: List[FilterClause]
+    # top-level fields the query filters or orders on
+    fields: FrozenSet[str]
+    # ids of the returned documents; None when unknown (counts)
+    doc_ids: Optional[FrozenSet[str]]
+    offset: int
+    fresh_until: float
+    stale_until: float
+
+
+class QueryCache:
+    """Results of one collection's queries, keyed on the normalized query.
+
+    A result is served as is for ``ttl`` seconds, then for ``stale``
+    seconds more while a background task refreshes it. Repository writes
+    report what they changed and only the results that write can affect
+    are dropped: those containing the document, those filtering or
+    ordering on a changed field, and those a new document would match.
+    """
+
+    def __init__(self, collection: str, ttl: float, stale: float, max_entries: int) -> None:
+        self.collection = collection
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _QueryEntry]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Future] = {}
+        # bumped by every write; a load that overlapped one is not stored
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        options: Any,
+        load: Callable[[], Awaitable[Any]],
+        doc_ids: Callable[[Any], Optional[Iterable[str]]],
+    ) -> Any:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now < entry.stale_until:
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                QUERY_CACHE_REQUESTS.labels(self.collection, "hit").inc()
+            else:
+                QUERY_CACHE_REQUESTS.labels(self.collection, "stale").inc()
+                self._refresh(key, options, load, doc_ids)
+            return entry.value
+        QUERY_CACHE_REQUESTS.labels(self.collection, "miss").inc()
+        return await self._load(key, options, load, doc_ids)
+
+    async def _load(self, key, options, load, doc_ids) -> Any:
+        version = self._version
+        value = await load()
+        if version == self._version:
+            ids = doc_ids(value)
+            filters = list(options.filters)
+            fields = {_top_level(field) for field, _, _ in filters}
+            if options.order_by:
+                fields.add(_top_level(options.order_by[0]))
+            now = time.monotonic()
+            self._entries[key] = _QueryEntry(
+                value=value,
+                filters=filters,
+                fields=frozenset(fields),
+                doc_ids=None if ids is None else frozenset(ids),
+                offset=options.offset,
+                fresh_until=now + self.ttl,
+                stale_until=now + self.ttl + self.stale,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _refresh(self, key, options, load, doc_ids) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.ensure_future(self._load(key, options, load, doc_ids))
+        self._refreshing[key] = task
+
+        def _done(done: asyncio.Future) -> None:
+            self._refreshing.pop(key, None)
+            if not done.cancelled():
+                # a failed refresh keeps serving the stale result until it
+                # expires; the next miss then loads (and raises) in the caller
+                done.exception()
+
+        task.add_done_callback(_done)
+
+    def _drop(self, affected: Callable[[_QueryEntry], bool]) -> None:
+        self._version += 1
+        stale = [key for key, entry in self._entries.items() if affected(entry)]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            QUERY_CACHE_INVALIDATIONS.labels(self.collection).inc(len(stale))
+
+    def on_create(self, doc_id: str, document: Dict[str, Any]) -> None:
+        """A new document can only change results whose filters it matches."""
+        self._drop(lambda entry: all(matches_clause(document, *clause) for clause in entry.filters))
+
+    def on_replace(self, doc_id: str, document: Dict[str, Any]) -> None:
+        """The old version is unknown, so also drop results it may have been part of."""
+        self._drop(
+            lambda entry: entry.doc_ids is None
+            or doc_id in entry.doc_ids
+            or entry.offset > 0
+            or all(matches_clause(document, *clause) for clause in entry.filters)
+        )
+
+    def on_update(self, doc_id: str, fields: Iterable[str]) -> None:
+        changed = {_top_level(field) for field in fields}
+        self._drop(
+            lambda entry: not entry.fields.isdisjoint(changed)
+            or (entry.doc_ids is not None and doc_id in entry.doc_ids)
+        )
+
+    def on_delete(self, doc_id: str) -> None:
+        self._drop(lambda entry: entry.doc_ids is None or doc_id in entry.doc_ids or entry.offset > 0)
+
+    def clear(self) -> None:
+        self._version += 1
+        self._entries.clear()
+
+
+_QUERY_CACHES: Dict[str, QueryCache] = {}
+
+
+def get_query_cache(collection: str) -> Optional[QueryCache]:
+    """Return the shared query cache of ``collection``, or None when it is not
+    enabled in ``settings.query_cache_ttl_seconds``."""
+    cache = _QUERY_CACHES.get(collection)
+    if cache is None:
+        ttl = settings.query_cache_ttl_seconds.get(collection)
+        if not ttl:
+            return None
+        cache = QueryCache(
+            collection,
+            ttl,
+            settings.query_cache_stale_seconds,
+            settings.query_cache_max_entries,
+        )
+        _QUERY_CACHES[collection] = cache
+    return cache
+
+
+def clear_query_caches() -> None:
+    for cache in _QUERY_CACHES.values():
+        cache.clear()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from ..config.settings import settings
+
+R = TypeVar("R")
+
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "io_executor_queue_depth",
+    "Blocking I/O calls waiting for a worker thread",
+    ["pool"],
+)
+EXECUTOR_ACTIVE = Gauge(
+    "io_executor_active_workers",
+    "Worker threads currently running a blocking I/O call",
+    ["pool"],
+)
+EXECUTOR_WAIT_SECONDS = Histogram(
+    "io_executor_wait_seconds",
+    "Time a blocking I/O call waited in the queue before a worker picked it up",
+    ["pool"],
+)
+EXECUTOR_REJECTED = Counter(
+    "io_executor_rejected_total",
+    "Blocking I/O calls rejected because the executor queue was full",
+    ["pool"],
+)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised instead of queueing more work on an executor whose backlog is full."""
+
+
+class BoundedExecutor:
+    """Thread pool with a bounded backlog for one I/O subsystem.
+
+    Calls beyond ``max_queue`` waiting tasks fail fast with
+    ``ExecutorSaturatedError`` rather than piling up latency behind the
+    workers.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-io")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @property
+    def active_workers(self) -> int:
+        return self._active
+
+    def _dequeue(self, started: bool) -> None:
+        with self._lock:
+            self._queued -= 1
+            if started:
+                self._active += 1
+            EXECUTOR_QUEUE_DEPTH.labels(self.name).set(self._queued)
+            EXECUTOR_ACTIVE.labels(self.name).set(self._active)
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._active -= 1
+            EXECUTOR_ACTIVE.labels(self.name).set(self._active)
+
+    async def run(self, func: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        with self._lock:
+            if self._queued >= self.max_queue:
+                EXECUTOR_REJECTED.labels(self.name).inc()
+                raise ExecutorSaturatedError(
+                    f"{self.name} executor is saturated ({self._queued} calls waiting)"
+                )
+            self._queued += 1
+            EXECUTOR_QUEUE_DEPTH.labels(self.name).set(self._queued)
+
+        submitted_at = time.perf_counter()
+        context = contextvars.copy_context()
+        call = functools.partial(func, *args, **kwargs)
+
+        def _worker():
+            self._dequeue(started=True)
+            EXECUTOR_WAIT_SECONDS.labels(self.name).observe(time.perf_counter() - submitted_at)
+            try:
+                return context.run(call)
+            finally:
+                self._finish()
+
+        def _on_done(future: Future) -> None:
+            # A call cancelled while still queued never reaches _worker.
+            if future.cancelled():
+                self._dequeue(started=False)
+
+        try:
+            future = self._pool.submit(_worker)
+        except RuntimeError:
+            self._dequeue(started=False)
+            raise
+        future.add_done_callback(_on_done)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_EXECUTORS: Dict[str, BoundedExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _executor_limits(name: str) -> tuple[int, int]:
+    if name == "storage":
+        return settings.storage_executor_workers, settings.storage_executor_max_queue
+    return settings.datastore_executor_workers, settings.datastore_executor_max_queue
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Return the shared executor for a subsystem ("datastore" or "storage")."""
+    executor: Optional[BoundedExecutor] = _EXECUTORS.get(name)
+    if executor is None:
+        with _EXECUTORS_LOCK:
+            executor = _EXECUTORS.get(name)
+            if executor is None:
+                max_workers, max_queue = _executor_limits(name)
+                executor = BoundedExecutor(name, max_workers, max_queue)
+                _EXECUTORS[name] = executor
+    return executor
+
+
+def shutdown_executors() -> None:
+    with _EXECUTORS_LOCK:
+        for executor in _EXECUTORS.values():
+            executor.shutdown()
+        _EXECUTORS.clear()
@@ -1,19 +1,47 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import heapq
+from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import structlog
 
 try:  # pragma: no cover - firebase optional at runtime
     from firebase_admin import firestore as admin_firestore
 except Exception:  # pragma: no cover - firebase optional at runtime
     admin_firestore = None
 
-from ..config.firebase import get_firestore_client
+try:  # pragma: no cover - firebase optional at runtime
+    from google.api_core.exceptions import NotFound as FirestoreNotFound
+except Exception:  # pragma: no cover - firebase optional at runtime
+    FirestoreNotFound = None
+
+from ..config.firebase import get_async_firestore_client, get_firestore_client
+from ..config.settings import settings
+from .cache import clear_entity_caches, clear_query_caches
+from .executor import get_executor
+from .indexes import CollectionIndexes, FilterClause
+from .locks import CollectionLocks
+from .persistence import StorePersistence
+from .singleflight import SingleFlight, query_key
+from .values import matches_clause, sort_key
+
+logger = structlog.get_logger()
 
-FilterClause = Tuple[str, str, Any]
 OrderClause = Tuple[str, str]
+# (value of the order_by field, document id) of the last document already seen
+CursorClause = Tuple[Any, str]
+# (document id, data) as returned by an engine's _query_entries
+Entry = Tuple[str, Dict[str, Any]]
+
+# Firestore rejects batches with more than 500 writes.
+MAX_BATCH_WRITES = 500
+
+
+class DocumentNotFoundError(LookupError):
+    """Raised when a batched update targets a document that does not exist."""
 
 
 @dataclass
@@ -22,80 +50,434 @@ class QueryOptions:
     limit: Optional[int] = None
     offset: int = 0
     order_by: Optional[OrderClause] = None
+    start_after: Optional[CursorClause] = None
+    # Fields to return instead of whole documents; [] returns empty dicts
+    # (existence only).
+    select: Optional[List[str]] = None
+
+
+@dataclass
+class WriteOperation:
+    kind: str  # "set", "update", "merge" or "delete"
+    collection: str
+    doc_id: str
+    data: Optional[Dict[str, Any]] = None
+
+
+class WriteBatch:
+    """Collects writes so they can be committed together with ``commit_many``."""
+
+    def __init__(self, store) -> None:
+        self._store = store
+        self._operations: List[WriteOperation] = []
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def set(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
+        self._operations.append(WriteOperation("set", collection, doc_id, data))
+
+    def update(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
+        self._operations.append(WriteOperation("update", collection, doc_id, data))
+
+    def merge(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
+        """Like ``update``, but creates the document when it does not exist."""
+        self._operations.append(WriteOperation("merge", collection, doc_id, data))
+
+    def delete(self, collection: str, doc_id: str) -> None:
+        self._operations.append(WriteOperation("delete", collection, doc_id))
+
+    async def commit(self) -> int:
+        operations, self._operations = self._operations, []
+        if operations:
+            await self._store.commit_many(operations)
+        return len(operations)
+
+
+@dataclass
+class ArrayUnion:
+    """Update value that appends each of ``values`` the array field does not
+    already contain, applied by the datastore in the same write."""
+
+    values: List[Any]
+
+    def apply(self, current: Any) -> List[Any]:
+        result = list(current) if isinstance(current, list) else []
+        for value in self.values:
+            if value not in result:
+                result.append(value)
+        return result
+
+
+@dataclass
+class ArrayRemove:
+    """Update value that removes every occurrence of ``values`` from the array
+    field, applied by the datastore in the same write."""
+
+    values: List[Any]
+
+    def apply(self, current: Any) -> List[Any]:
+        if not isinstance(current, list):
+            return []
+        return [value for value in current if value not in self.values]
+
+
+def _apply_update(document: Dict[str, Any], data: Dict[str, Any]) -> None:
+    for key, value in data.items():
+        if value is None:
+            document.pop(key, None)
+        elif isinstance(value, (ArrayUnion, ArrayRemove)):
+            document[key] = value.apply(document.get(key))
+        else:
+            document[key] = value
+
+
+def _update_result(
+    data: Dict[str, Any],
+    base: Optional[Dict[str, Any]],
+    update_time: Any,
+) -> Dict[str, Any]:
+    """Result of a single-round-trip update: ``base`` with ``data`` merged in
+    locally, or just the server ``update_time`` when no base was supplied."""
+    if base is None:
+        return {"update_time": update_time}
+    merged = base.copy()
+    _apply_update(merged, data)
+    return merged
+
+
+def _project(data: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return data.copy()
+    return {field: data[field] for field in fields if field in data}
+
+
+def _matches(data: Dict[str, Any], filters: List[FilterClause]) -> bool:
+    return all(matches_clause(data, field, op, value) for field, op, value in filters)
+
+
+async def iterate_pages(
+    fetch_entries: Callable[[str, QueryOptions], Awaitable[List[Entry]]],
+    collection: str,
+    options: QueryOptions,
+    page_size: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the documents of ``options`` one page of ``page_size`` at a time.
+
+    Each page resumes after the last document of the previous one with a
+    ``start_after`` cursor, so only one page is held in memory and every
+    page costs the same. ``options.offset`` and ``options.limit`` apply to
+    the whole iteration.
+    """
+    page_size = page_size or settings.query_page_size
+    field = options.order_by[0] if options.order_by else None
+    select = options.select
+    if select is not None and field is not None and field not in select:
+        # the cursor needs the order value of the last document
+        select = [*select, field]
+    strip_order_field = select is not options.select
+    remaining = options.limit
+    page_options = replace(options, select=select)
+    while True:
+        size = page_size if remaining is None else min(page_size, remaining)
+        entries = await fetch_entries(collection, replace(page_options, limit=size))
+        for _, data in entries:
+            yield _project(data, options.select) if strip_order_field else data
+        if len(entries) < size:
+            return
+        if remaining is not None:
+            remaining -= size
+            if not remaining:
+                return
+        last_id, last = entries[-1]
+        page_options = replace(
+            page_options,
+            offset=0,
+            start_after=(last.get(field) if field else None, last_id),
+        )
 
 
 class InMemoryStore:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        persistence: Optional[StorePersistence] = None,
+        snapshot_every: int = 0,
+    ) -> None:
         self._collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
-        self._lock = asyncio.Lock()
+        self._indexes: Dict[str, CollectionIndexes] = {}
+        # Readers of a collection share its lock; writers only block their
+        # own collection(s).
+        self._locks = CollectionLocks()
+        # Optional durability: every write is appended to a log, and after
+        # ``snapshot_every`` records the state is compacted into a snapshot.
+        self._persistence = persistence
+        self._snapshot_every = snapshot_every
+        self._compaction: Optional[asyncio.Task] = None
+        if persistence is not None:
+            self._load()
+
+    def _load(self) -> None:
+        collections, records = self._persistence.load()
+        self._collections = collections
+        for record in records:
+            self._apply_record(record)
+
+    def _apply_record(self, record: tuple) -> None:
+        kind = record[0]
+        if kind == "batch":
+            for write in record[1]:
+                self._apply_record(write)
+        elif kind == "reset":
+            self._collections.clear()
+            self._indexes.clear()
+        else:
+            _, collection, doc_id, data = record
+            if kind == "set":
+                self._put(collection, doc_id, data.copy())
+            elif kind == "update":
+                if doc_id in self._collections.get(collection, {}):
+                    self._patch(collection, doc_id, data)
+            elif kind == "merge":
+                if doc_id in self._collections.get(collection, {}):
+                    self._patch(collection, doc_id, data)
+                else:
+                    document: Dict[str, Any] = {}
+                    _apply_update(document, data)
+                    self._put(collection, doc_id, document)
+            else:
+                self._pop(collection, doc_id)
+
+    def _journal(self, record: tuple) -> None:
+        if self._persistence is None:
+            return
+        self._persistence.append(record)
+        if (
+            self._snapshot_every
+            and self._persistence.records_since_snapshot >= self._snapshot_every
+            and self._compaction is None
+        ):
+            self._compaction = asyncio.get_running_loop().create_task(self._compact_in_background())
+
+    async def _compact_in_background(self) -> None:
+        # nobody awaits this task: log a failure instead of leaving it to
+        # "Task exception was never retrieved". The logs it would have
+        # dropped are kept, so nothing is lost and the next one retries.
+        try:
+            await self.compact()
+        except Exception:
+            logger.exception("Compaction of the in-memory store failed", directory=self._persistence.directory)
+
+    async def compact(self) -> None:
+        """Write a snapshot of the current state and drop the logs it covers.
+
+        Only the rotation and a shallow copy of each collection happen under
+        the locks; pickling the copy on a worker thread then relies on
+        stored documents never being changed in place: writes replace them
+        (``_patch`` copies on write) and the models built from them copy
+        their lists and dicts.
+        """
+        if self._persistence is None:
+            return
+        try:
+            async with self._locks.write_all():
+                snapshot = {name: dict(docs) for name, docs in self._collections.items()}
+                generation = self._persistence.rotate()
+            await get_executor("datastore").run(self._persistence.write_snapshot, snapshot, generation)
+        finally:
+            self._compaction = None
+
+    # Every mutation goes through these three helpers so the secondary
+    # indexes stay in step with the documents.
+    def _put(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        docs = self._collections.setdefault(collection, {})
+        indexes = self._indexes.setdefault(collection, CollectionIndexes())
+        previous = docs.get(doc_id)
+        if previous is not None:
+            indexes.remove(doc_id, previous)
+        docs[doc_id] = data
+        indexes.add(doc_id, data)
+        return data
+
+    def _patch(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        docs = self._collections[collection]
+        previous = docs[doc_id]
+        indexes = self._indexes.setdefault(collection, CollectionIndexes())
+        indexes.remove(doc_id, previous)
+        # copy-on-write: snapshots may still reference the previous version
+        document = previous.copy()
+        _apply_update(document, data)
+        docs[doc_id] = document
+        indexes.add(doc_id, document)
+        return document
+
+    def _pop(self, collection: str, doc_id: str) -> None:
+        docs = self._collections.get(collection)
+        if not docs or doc_id not in docs:
+            return
+        document = docs.pop(doc_id)
+        indexes = self._indexes.get(collection)
+        if indexes is not None:
+            indexes.remove(doc_id, document)
+
+    def _select(self, collection: str, filters: List[FilterClause]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Lazily yield documents matching ``filters``, narrowed through the
+        secondary indexes first. Nothing is copied.
+
+        May build a missing index, which is safe under a read lock because
+        nothing here awaits.
+        """
+        docs = self._collections.get(collection, {})
+        indexes = self._indexes.setdefault(collection, CollectionIndexes())
+        candidate_ids = indexes.candidates(filters, docs)
+        if candidate_ids is None:
+            items = docs.items()
+        else:
+            items = ((doc_id, docs[doc_id]) for doc_id in candidate_ids)
+        return ((doc_id, data) for doc_id, data in items if _matches(data, filters))
 
     async def get_document(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
-        async with self._lock:
+        async with self._locks.read(collection):
             docs = self._collections.get(collection, {})
             data = docs.get(doc_id)
             return None if data is None else data.copy()
 
+    async def get_documents(self, collection: str, doc_ids: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+        async with self._locks.read(collection):
+            docs = self._collections.get(collection, {})
+            results: List[Optional[Dict[str, Any]]] = []
+            for doc_id in doc_ids:
+                data = docs.get(doc_id)
+                results.append(None if data is None else data.copy())
+            return results
+
     async def create_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        async with self._lock:
-            docs = self._collections.setdefault(collection, {})
-            docs[doc_id] = data.copy()
-            return docs[doc_id].copy()
+        async with self._locks.write(collection):
+            stored = self._put(collection, doc_id, data.copy())
+            self._journal(("set", collection, doc_id, stored))
+            return stored.copy()
 
     async def set_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         return await self.create_document(collection, doc_id, data)
 
-    async def update_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        async with self._lock:
-            docs = self._collections.setdefault(collection, {})
-            if doc_id not in docs:
+    async def update_document(
+        self,
+        collection: str,
+        doc_id: str,
+        data: Dict[str, Any],
+        *,
+        base: Optional[Dict[str, Any]] = None,
+        reread: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        async with self._locks.write(collection):
+            if doc_id not in self._collections.get(collection, {}):
                 return None
-            for key, value in data.items():
-                if value is None:
-                    docs[doc_id].pop(key, None)
-                else:
-                    docs[doc_id][key] = value
-            return docs[doc_id].copy()
+            document = self._patch(collection, doc_id, data)
+            self._journal(("update", collection, doc_id, data))
+            if reread:
+                return document.copy()
+            return _update_result(data, base, datetime.utcnow())
 
     async def delete_document(self, collection: str, doc_id: str) -> None:
-        async with self._lock:
-            docs = self._collections.get(collection)
-            if docs and doc_id in docs:
-                del docs[doc_id]
+        async with self._locks.write(collection):
+            if doc_id in self._collections.get(collection, {}):
+                self._pop(collection, doc_id)
+                self._journal(("delete", collection, doc_id, None))
+
+    def write_batch(self) -> WriteBatch:
+        return WriteBatch(self)
+
+    async def commit_many(self, operations: Iterable[WriteOperation]) -> None:
+        """Apply all operations atomically: either every write lands or none does."""
+        operations = list(operations)
+        async with self._locks.write_many(op.collection for op in operations):
+            exists: Dict[Tuple[str, str], bool] = {}
+            for op in operations:
+                key = (op.collection, op.doc_id)
+                if key not in exists:
+                    exists[key] = op.doc_id in self._collections.get(op.collection, {})
+                if op.kind == "update" and not exists[key]:
+                    raise DocumentNotFoundError(f"{op.collection}/{op.doc_id}")
+                exists[key] = op.kind != "delete"
+
+            records = [(op.kind, op.collection, op.doc_id, op.data) for op in operations]
+            for record in records:
+                self._apply_record(record)
+            self._journal(("batch", records))
 
     async def query(self, collection: str, options: QueryOptions) -> List[Dict[str, Any]]:
-        async with self._lock:
-            docs = list(self._collections.get(collection, {}).items())
-
-        def _matches(data: Dict[str, Any]) -> bool:
-            for field, op, value in options.filters:
-                current = data.get(field)
-                if op == "==" and current != value:
-                    return False
-                if op == "in":
-                    if not isinstance(value, list):
-                        raise ValueError("Value for 'in' operator must be a list")
-                    if current not in value:
-                        return False
-            return True
-
-        filtered = [(doc_id, data) for doc_id, data in docs if _matches(data)]
+        return [data for _, data in await self._query_entries(collection, options)]
 
+    def iter_query(
+        self,
+        collection: str,
+        options: QueryOptions,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        return iterate_pages(self._query_entries, collection, options, page_size)
+
+    async def _query_entries(self, collection: str, options: QueryOptions) -> List[Entry]:
+        """Filter, order and page a collection.
+
+        With a limit only the first ``offset + limit`` matches are kept, on a
+        heap of that size, so a page costs O(N log k) rather than a full sort,
+        and only the returned documents are copied.
+        """
+        filters = list(options.filters)
+
+        # Like Firestore, break ties (or order entirely) by document id so
+        # cursors address a stable position, and compare values of different
+        # types by Firestore's type order.
         if options.order_by:
             field, direction = options.order_by
             reverse = direction.lower() == "desc"
-            filtered.sort(key=lambda item: item[1].get(field), reverse=reverse)
 
-        if options.offset:
-            filtered = filtered[options.offset :]
+            def _key(item):
+                return (sort_key(item[1][field]), item[0])
 
-        if options.limit:
-            filtered = filtered[: options.limit]
+        else:
+            reverse = False
 
-        return [data.copy() for _, data in filtered]
+            def _key(item):
+                return item[0]
+
+        async with self._locks.read(collection):
+            matches = self._select(collection, filters)
+            if options.order_by:
+                # ordering by a field also filters out documents without it
+                matches = (item for item in matches if field in item[1])
+
+            if options.start_after is not None:
+                value, cursor_id = options.start_after
+                cursor_key = (sort_key(value), cursor_id) if options.order_by else cursor_id
+                if reverse:
+                    matches = (item for item in matches if _key(item) < cursor_key)
+                else:
+                    matches = (item for item in matches if _key(item) > cursor_key)
+
+            if options.limit:
+                wanted = options.offset + options.limit
+                select_top = heapq.nlargest if reverse else heapq.nsmallest
+                ordered = select_top(wanted, matches, key=_key)
+            else:
+                ordered = sorted(matches, key=_key, reverse=reverse)
+
+            page = ordered[options.offset :] if options.offset else ordered
+            return [(doc_id, _project(data, options.select)) for doc_id, data in page]
+
+    async def count(self, collection: str, filters: Iterable[FilterClause] = ()) -> int:
+        filters = list(filters)
+        async with self._locks.read(collection):
+            return sum(1 for _ in self._select(collection, filters))
+
+    async def exists(self, collection: str, filters: Iterable[FilterClause] = ()) -> bool:
+        filters = list(filters)
+        async with self._locks.read(collection):
+            return next(self._select(collection, filters), None) is not None
 
     async def reset(self) -> None:
-        async with self._lock:
-            self._collections.clear()
+        async with self._locks.write_all():
+            self._apply_record(("reset",))
+            self._journal(("reset",))
 
 
 class FirestoreStore:
@@ -108,18 +490,30 @@ class FirestoreStore:
             self._client = None
             self._memory = memory_store
         else:
-            self._client = client if client is not None else get_firestore_client()
+            self._client = client if client is not None else self._default_client()
             self._memory = None
             if self._client is None:
                 self._memory = memory_store or InMemoryStore()
+        # concurrent identical reads share one RPC
+        self._single_flight = SingleFlight()
+
+    @staticmethod
+    def _default_client():
+        return get_firestore_client()
 
     async def _run_in_thread(self, func, *args, **kwargs):
-        return await asyncio.to_thread(func, *args, **kwargs)
+        return await get_executor("datastore").run(func, *args, **kwargs)
 
     async def get_document(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
         if self._memory:
             return await self._memory.get_document(collection, doc_id)
+        return await self._single_flight.run(
+            ("get", collection, doc_id),
+            "get_document",
+            lambda: self._fetch_document(collection, doc_id),
+        )
 
+    async def _fetch_document(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
         def _get():
             doc = self._client.collection(collection).document(doc_id).get()
             if not doc.exists:
@@ -128,6 +522,33 @@ class FirestoreStore:
 
         return await self._run_in_thread(_get)
 
+    async def get_documents(self, collection: str, doc_ids: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+        """Fetch several documents of one collection in a single round trip.
+
+        The result is aligned with ``doc_ids``; missing documents are ``None``.
+        """
+        doc_ids = list(doc_ids)
+        if self._memory:
+            return await self._memory.get_documents(collection, doc_ids)
+        if not doc_ids:
+            return []
+
+        def _get_all():
+            collection_ref = self._client.collection(collection)
+            refs = [collection_ref.document(doc_id) for doc_id in dict.fromkeys(doc_ids)]
+            found = {}
+            # get_all streams snapshots in arbitrary order, so key them by id
+            for snapshot in self._client.get_all(refs):
+                if snapshot.exists:
+                    found[snapshot.id] = snapshot.to_dict()
+            results: List[Optional[Dict[str, Any]]] = []
+            for doc_id in doc_ids:
+                data = found.get(doc_id)
+                results.append(None if data is None else data.copy())
+            return results
+
+        return await self._run_in_thread(_get_all)
+
     async def create_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         if self._memory:
             return await self._memory.create_document(collection, doc_id, data)
@@ -148,27 +569,59 @@ class FirestoreStore:
 
         return await self._run_in_thread(_set)
 
-    async def update_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def update_document(
+        self,
+        collection: str,
+        doc_id: str,
+        data: Dict[str, Any],
+        *,
+        base: Optional[Dict[str, Any]] = None,
+        reread: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Update a document with a single ``update()`` call.
+
+        Returns ``None`` if the document does not exist (Firestore rejects the
+        update with NotFound, so no read is needed first). Otherwise returns
+        ``base`` with ``data`` merged in locally when ``base`` is given, or
+        ``{"update_time": ...}``. ``reread=True`` fetches the stored document
+        afterwards at the cost of a second round trip. ``ArrayUnion`` and
+        ``ArrayRemove`` values become Firestore transforms, so concurrent
+        changes to the same array are not lost.
+        """
         if self._memory:
-            return await self._memory.update_document(collection, doc_id, data)
+            return await self._memory.update_document(collection, doc_id, data, base=base, reread=reread)
 
         def _update():
             doc_ref = self._client.collection(collection).document(doc_id)
-            snapshot = doc_ref.get()
-            if not snapshot.exists:
-                return None
-            payload = {}
-            for key, value in data.items():
-                if value is None and admin_firestore is not None:
-                    payload[key] = admin_firestore.DELETE_FIELD
-                else:
-                    payload[key] = value
-            doc_ref.update(payload)
-            new_snapshot = doc_ref.get()
-            return new_snapshot.to_dict()
+            try:
+                result = doc_ref.update(self._update_payload(data))
+            except Exception as exc:
+                if self._is_not_found(exc):
+                    return None
+                raise
+            if reread:
+                snapshot = doc_ref.get()
+                return snapshot.to_dict() if snapshot.exists else None
+            return _update_result(data, base, result.update_time)
 
         return await self._run_in_thread(_update)
 
+    @staticmethod
+    def _update_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {}
+        for key, value in data.items():
+            if admin_firestore is None:
+                payload[key] = value
+            elif value is None:
+                payload[key] = admin_firestore.DELETE_FIELD
+            elif isinstance(value, ArrayUnion):
+                payload[key] = admin_firestore.ArrayUnion(value.values)
+            elif isinstance(value, ArrayRemove):
+                payload[key] = admin_firestore.ArrayRemove(value.values)
+            else:
+                payload[key] = value
+        return payload
+
     async def delete_document(self, collection: str, doc_id: str) -> None:
         if self._memory:
             await self._memory.delete_document(collection, doc_id)
@@ -179,40 +632,152 @@ class FirestoreStore:
 
         await self._run_in_thread(_delete)
 
+    def write_batch(self) -> WriteBatch:
+        return WriteBatch(self)
+
+    async def commit_many(self, operations: Iterable[WriteOperation]) -> None:
+        """Commit operations as Firestore batches of at most ``MAX_BATCH_WRITES``.
+
+        Each chunk is atomic on its own; a failing chunk leaves the earlier
+        chunks committed, so callers should order writes accordingly.
+        """
+        operations = list(operations)
+        if self._memory:
+            await self._memory.commit_many(operations)
+            return
+
+        def _commit():
+            for start in range(0, len(operations), MAX_BATCH_WRITES):
+                batch = self._stage_batch(operations[start : start + MAX_BATCH_WRITES])
+                try:
+                    batch.commit()
+                except Exception as exc:
+                    self._raise_not_found(exc)
+                    raise
+
+        await self._run_in_thread(_commit)
+
+    def _stage_batch(self, operations: List[WriteOperation]):
+        batch = self._client.batch()
+        for op in operations:
+            doc_ref = self._client.collection(op.collection).document(op.doc_id)
+            if op.kind == "set":
+                batch.set(doc_ref, op.data)
+            elif op.kind == "update":
+                batch.update(doc_ref, self._update_payload(op.data))
+            elif op.kind == "merge":
+                batch.set(doc_ref, self._update_payload(op.data), merge=True)
+            else:
+                batch.delete(doc_ref)
+        return batch
+
+    @staticmethod
+    def _is_not_found(exc: Exception) -> bool:
+        return FirestoreNotFound is not None and isinstance(exc, FirestoreNotFound)
+
+    @classmethod
+    def _raise_not_found(cls, exc: Exception) -> None:
+        if cls._is_not_found(exc):
+            raise DocumentNotFoundError(str(exc)) from exc
+
     async def query(self, collection: str, options: QueryOptions) -> List[Dict[str, Any]]:
         if self._memory:
             return await self._memory.query(collection, options)
+        return [data for _, data in await self._query_entries(collection, options)]
 
+    def iter_query(
+        self,
+        collection: str,
+        options: QueryOptions,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream matching documents page by page instead of materialising
+        the whole result, for scans over large collections."""
+        if self._memory:
+            return self._memory.iter_query(collection, options, page_size)
+        return iterate_pages(self._query_entries, collection, options, page_size)
+
+    async def _query_entries(self, collection: str, options: QueryOptions) -> List[Entry]:
+        options = replace(options, filters=list(options.filters))
+        return await self._single_flight.run(
+            query_key(collection, options),
+            "query",
+            lambda: self._fetch_entries(collection, options),
+        )
+
+    async def _fetch_entries(self, collection: str, options: QueryOptions) -> List[Entry]:
         def _query():
-            query = self._client.collection(collection)
-            for field, op, value in options.filters:
-                query = query.where(field, op, value)
-            if options.order_by:
-                field, direction = options.order_by
-                if admin_firestore is None:
-                    query = query.order_by(field)
-                else:
-                    direction_map = {
-                        "asc": admin_firestore.Query.ASCENDING,
-                        "desc": admin_firestore.Query.DESCENDING,
-                    }
-                    query = query.order_by(
-                        field,
-                        direction=direction_map.get(
-                            direction.lower(),
-                            admin_firestore.Query.ASCENDING,
-                        ),
-                    )
-            if options.limit:
-                query = query.limit(options.limit)
-            docs = list(query.stream())
-            results = [doc.to_dict() for doc in docs]
-            if options.offset:
-                results = results[options.offset :]
-            return results
+            query = self._build_query(collection, options)
+            return [(doc.id, doc.to_dict() or {}) for doc in query.stream()]
 
         return await self._run_in_thread(_query)
 
+    def _filtered(self, collection: str, filters: Iterable[FilterClause]):
+        query = self._client.collection(collection)
+        for field, op, value in filters:
+            query = query.where(field, op, value)
+        return query
+
+    def _build_query(self, collection: str, options: QueryOptions):
+        query = self._filtered(collection, options.filters)
+        direction = None
+        if options.order_by:
+            field, direction = options.order_by
+            direction = self._direction(direction)
+            if direction is None:
+                query = query.order_by(field)
+            else:
+                query = query.order_by(field, direction=direction)
+        if options.start_after is not None:
+            # Order by document id explicitly (Firestore does so implicitly)
+            # so the cursor can name it as the tie breaker.
+            value, doc_id = options.start_after
+            if direction is None:
+                query = query.order_by("__name__")
+            else:
+                query = query.order_by("__name__", direction=direction)
+            cursor = [value, doc_id] if options.order_by else [doc_id]
+            query = query.start_after(cursor)
+        if options.offset:
+            query = query.offset(options.offset)
+        if options.limit:
+            query = query.limit(options.limit)
+        if options.select is not None:
+            # an empty projection would return every field; __name__ alone
+            # returns just the document reference
+            query = query.select(list(options.select) or ["__name__"])
+        return query
+
+    async def count(self, collection: str, filters: Iterable[FilterClause] = ()) -> int:
+        """Count matching documents with an aggregation query (no document reads)."""
+        if self._memory:
+            return await self._memory.count(collection, filters)
+
+        def _count():
+            results = self._filtered(collection, filters).count(alias="total").get()
+            return int(results[0][0].value) if results else 0
+
+        return await self._run_in_thread(_count)
+
+    async def exists(self, collection: str, filters: Iterable[FilterClause] = ()) -> bool:
+        """Whether any document matches, via a keys-only query of one result."""
+        if self._memory:
+            return await self._memory.exists(collection, filters)
+
+        def _exists():
+            query = self._filtered(collection, filters).select(["__name__"]).limit(1)
+            return any(True for _ in query.stream())
+
+        return await self._run_in_thread(_exists)
+
+    @staticmethod
+    def _direction(direction: str):
+        if admin_firestore is None:
+            return None
+        if direction.lower() == "desc":
+            return admin_firestore.Query.DESCENDING
+        return admin_firestore.Query.ASCENDING
+
     async def reset(self) -> None:
         if self._memory:
             await self._memory.reset()
@@ -237,23 +802,59 @@ _MEMORY_STORE = InMemoryStore()
 _GLOBAL_STORE: Optional[FirestoreStore] = None
 
 
+def _memory_store() -> InMemoryStore:
+    """The in-memory store, restored from ``settings.memory_store_path`` when
+    set. Only called once the memory store is actually chosen."""
+    if not settings.memory_store_path:
+        return _MEMORY_STORE
+    print(f"💾 Restoring in-memory store from {settings.memory_store_path}")
+    return InMemoryStore(
+        persistence=StorePersistence(settings.memory_store_path),
+        snapshot_every=settings.memory_snapshot_every,
+    )
+
+
 def get_firestore_store() -> FirestoreStore:
     global _GLOBAL_STORE
     if _GLOBAL_STORE is None:
+        engine = settings.datastore_engine.lower()
+        if engine == "memory":
+            print("💾 Using IN-MEMORY Firestore store (configured)")
+            _GLOBAL_STORE = FirestoreStore(memory_store=_memory_store())
+            return _GLOBAL_STORE
+        if engine == "sqlite":
+            from .sqlite import SQLiteStore
+
+            print(f"🗄️ Using SQLite store at {settings.sqlite_path}")
+            _GLOBAL_STORE = SQLiteStore(settings.sqlite_path)
+            return _GLOBAL_STORE
+
         # Try to get real Firebase client first
-        client = get_firestore_client()
-        if client is not None:
-            print("🔥 Using REAL Firebase Firestore client")
-            _GLOBAL_STORE = FirestoreStore(client=client)
+        if engine == "firestore_async":
+            from .firestore_async import AsyncFirestoreStore
+
+            async_client = get_async_firestore_client()
+            if async_client is not None:
+                print("🔥 Using REAL Firebase Firestore client (asyncio)")
+                _GLOBAL_STORE = AsyncFirestoreStore(client=async_client)
+                return _GLOBAL_STORE
         else:
-            print("💾 Using IN-MEMORY Firestore store (Firebase not available)")
-            _GLOBAL_STORE = FirestoreStore(memory_store=_MEMORY_STORE)
+            client = get_firestore_client()
+            if client is not None:
+                print("🔥 Using REAL Firebase Firestore client")
+                _GLOBAL_STORE = FirestoreStore(client=client)
+                return _GLOBAL_STORE
+
+        print("💾 Using IN-MEMORY Firestore store (Firebase not available)")
+        _GLOBAL_STORE = FirestoreStore(memory_store=_memory_store())
     return _GLOBAL_STORE
 
 
 async def reset_firestore_store() -> None:
     store = get_firestore_store()
     await store.reset()
+    clear_entity_caches()
+    clear_query_caches()
 
 
 async def firestore_healthcheck() -> bool:
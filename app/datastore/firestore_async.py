@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config.firebase import get_async_firestore_client
+from .firestore import (
+    MAX_BATCH_WRITES,
+    Entry,
+    FilterClause,
+    FirestoreStore,
+    QueryOptions,
+    WriteOperation,
+    _update_result,
+)
+
+
+class AsyncFirestoreStore(FirestoreStore):
+    """FirestoreStore engine built on ``google.cloud.firestore.AsyncClient``.
+
+    Calls are awaited on the event loop directly instead of hopping onto the
+    datastore thread pool, so concurrent requests share one gRPC channel.
+    Query construction and the in-memory fallback are inherited.
+    """
+
+    @staticmethod
+    def _default_client():
+        return get_async_firestore_client()
+
+    async def _fetch_document(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        doc = await self._client.collection(collection).document(doc_id).get()
+        if not doc.exists:
+            return None
+        return doc.to_dict()
+
+    async def get_documents(self, collection: str, doc_ids: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+        doc_ids = list(doc_ids)
+        if self._memory:
+            return await self._memory.get_documents(collection, doc_ids)
+        if not doc_ids:
+            return []
+
+        collection_ref = self._client.collection(collection)
+        refs = [collection_ref.document(doc_id) for doc_id in dict.fromkeys(doc_ids)]
+        found = {}
+        async for snapshot in self._client.get_all(refs):
+            if snapshot.exists:
+                found[snapshot.id] = snapshot.to_dict()
+        results: List[Optional[Dict[str, Any]]] = []
+        for doc_id in doc_ids:
+            data = found.get(doc_id)
+            results.append(None if data is None else data.copy())
+        return results
+
+    async def create_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        if self._memory:
+            return await self._memory.create_document(collection, doc_id, data)
+
+        await self._client.collection(collection).document(doc_id).set(data)
+        return data
+
+    async def set_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        if self._memory:
+            return await self._memory.set_document(collection, doc_id, data)
+
+        await self._client.collection(collection).document(doc_id).set(data)
+        return data
+
+    async def update_document(
+        self,
+        collection: str,
+        doc_id: str,
+        data: Dict[str, Any],
+        *,
+        base: Optional[Dict[str, Any]] = None,
+        reread: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        if self._memory:
+            return await self._memory.update_document(collection, doc_id, data, base=base, reread=reread)
+
+        doc_ref = self._client.collection(collection).document(doc_id)
+        try:
+            result = await doc_ref.update(self._update_payload(data))
+        except Exception as exc:
+            if self._is_not_found(exc):
+                return None
+            raise
+        if reread:
+            snapshot = await doc_ref.get()
+            return snapshot.to_dict() if snapshot.exists else None
+        return _update_result(data, base, result.update_time)
+
+    async def delete_document(self, collection: str, doc_id: str) -> None:
+        if self._memory:
+            await self._memory.delete_document(collection, doc_id)
+            return
+
+        await self._client.collection(collection).document(doc_id).delete()
+
+    async def commit_many(self, operations: Iterable[WriteOperation]) -> None:
+        operations = list(operations)
+        if self._memory:
+            await self._memory.commit_many(operations)
+            return
+
+        for start in range(0, len(operations), MAX_BATCH_WRITES):
+            batch = self._stage_batch(operations[start : start + MAX_BATCH_WRITES])
+            try:
+                await batch.commit()
+            except Exception as exc:
+                self._raise_not_found(exc)
+                raise
+
+    async def _fetch_entries(self, collection: str, options: QueryOptions) -> List[Entry]:
+        query = self._build_query(collection, options)
+        return [(doc.id, doc.to_dict() or {}) async for doc in query.stream()]
+
+    async def count(self, collection: str, filters: Iterable[FilterClause] = ()) -> int:
+        if self._memory:
+            return await self._memory.count(collection, filters)
+
+        results = await self._filtered(collection, filters).count(alias="total").get()
+        return int(results[0][0].value) if results else 0
+
+    async def exists(self, collection: str, filters: Iterable[FilterClause] = ()) -> bool:
+        if self._memory:
+            return await self._memory.exists(collection, filters)
+
+        query = self._filtered(collection, filters).select(["__name__"]).limit(1)
+        async for _ in query.stream():
+            return True
+        return False
+
+    async def healthcheck(self) -> bool:
+        if self._memory:
+            return True
+
+        # touching the iterator is enough to confirm connectivity
+        async for _ in self._client.collections():
+            break
+        return True
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+Document = Optional[Dict[str, Any]]
+
+_MISSING = object()
+
+
+class IdentityMap:
+    """Documents loaded or written during one request, by (collection, doc_id).
+
+    ``None`` records that a document is known not to exist. Repositories
+    build a new entity from the recorded document on every lookup; the
+    entity copies the document's lists and dicts, so a caller mutating its
+    entity affects neither the recorded document nor the other entities.
+    """
+
+    def __init__(self) -> None:
+        self._documents: Dict[Tuple[str, str], Document] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, collection: str, doc_id: str) -> Tuple[bool, Document]:
+        """Return ``(known, document)``; ``known`` is False when it was never seen."""
+        document = self._documents.get((collection, doc_id), _MISSING)
+        if document is _MISSING:
+            return False, None
+        return True, document
+
+    def put(self, collection: str, doc_id: str, document: Document) -> None:
+        self._documents[(collection, doc_id)] = document
+
+    def discard(self, collection: str, doc_id: str) -> None:
+        self._documents.pop((collection, doc_id), None)
+
+
+_CURRENT: ContextVar[Optional[IdentityMap]] = ContextVar("identity_map", default=None)
+
+
+def current_identity_map() -> Optional[IdentityMap]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def identity_map_scope() -> Iterator[IdentityMap]:
+    """Bind a fresh identity map to the current context (one request)."""
+    identity_map = IdentityMap()
+    token = _CURRENT.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        _CURRENT.reset(token)
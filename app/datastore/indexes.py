@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .values import ARRAY_OPERATORS, RANGE_OPERATORS, comparable, sort_key
+
+FilterClause = Tuple[str, str, Any]
+
+_MISSING = object()
+_entry_key = itemgetter(0)
+
+
+def _index_key(value: Any) -> Any:
+    """Hashable stand-in for a field value that keeps ``==`` semantics."""
+    if isinstance(value, list):
+        return ("__list__", tuple(_index_key(item) for item in value))
+    if isinstance(value, dict):
+        return ("__map__", frozenset((key, _index_key(item)) for key, item in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return ("__repr__", repr(value))
+    return value
+
+
+class HashIndex:
+    """Document ids of one collection grouped by the value of one field.
+
+    Documents without the field are filed under ``None``, matching how
+    ``_matches`` compares ``data.get(field)``.
+    """
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._entries: Dict[Any, Set[str]] = {}
+
+    def add(self, doc_id: str, document: Mapping[str, Any]) -> None:
+        key = _index_key(document.get(self.field))
+        self._entries.setdefault(key, set()).add(doc_id)
+
+    def remove(self, doc_id: str, document: Mapping[str, Any]) -> None:
+        key = _index_key(document.get(self.field))
+        doc_ids = self._entries.get(key)
+        if doc_ids is None:
+            return
+        doc_ids.discard(doc_id)
+        if not doc_ids:
+            del self._entries[key]
+
+    def lookup(self, value: Any) -> Set[str]:
+        return self._entries.get(_index_key(value), set())
+
+    def lookup_any(self, values: Iterable[Any]) -> Set[str]:
+        found: Set[str] = set()
+        for value in values:
+            found |= self.lookup(value)
+        return found
+
+
+class SortedIndex:
+    """``(sort_key, doc_id)`` pairs of one field kept in Firestore order.
+
+    Range filters bisect to the slice of values that share the operand's
+    type, so a lookup costs O(log N + k). Documents without the field are
+    not indexed, matching Firestore's range semantics.
+    """
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._entries: List[Tuple[Tuple[Any, ...], str]] = []
+
+    def add(self, doc_id: str, document: Mapping[str, Any]) -> None:
+        value = document.get(self.field, _MISSING)
+        if value is not _MISSING:
+            insort(self._entries, (sort_key(value), doc_id))
+
+    def remove(self, doc_id: str, document: Mapping[str, Any]) -> None:
+        value = document.get(self.field, _MISSING)
+        if value is _MISSING:
+            return
+        entry = (sort_key(value), doc_id)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def range(self, op: str, operand: Any) -> Set[str]:
+        if not comparable(operand, operand):
+            return set()
+        key = sort_key(operand)
+        # all values of the operand's type sit between these two positions
+        type_start = bisect_left(self._entries, (key[0],), key=_entry_key)
+        type_end = bisect_left(self._entries, (key[0] + 1,), key=_entry_key)
+        if op == "<":
+            start, end = type_start, bisect_left(self._entries, key, key=_entry_key)
+        elif op == "<=":
+            start, end = type_start, bisect_right(self._entries, key, key=_entry_key)
+        elif op == ">":
+            start, end = bisect_right(self._entries, key, key=_entry_key), type_end
+        else:
+            start, end = bisect_left(self._entries, key, key=_entry_key), type_end
+        return {doc_id for _, doc_id in self._entries[start:end]}
+
+
+class ArrayIndex:
+    """Inverted index from array elements to the documents containing them."""
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._entries: Dict[Any, Set[str]] = {}
+
+    @staticmethod
+    def _elements(document: Mapping[str, Any], field: str) -> Set[Any]:
+        value = document.get(field)
+        if not isinstance(value, list):
+            return set()
+        return {_index_key(item) for item in value}
+
+    def add(self, doc_id: str, document: Mapping[str, Any]) -> None:
+        for key in self._elements(document, self.field):
+            self._entries.setdefault(key, set()).add(doc_id)
+
+    def remove(self, doc_id: str, document: Mapping[str, Any]) -> None:
+        for key in self._elements(document, self.field):
+            doc_ids = self._entries.get(key)
+            if doc_ids is None:
+                continue
+            doc_ids.discard(doc_id)
+            if not doc_ids:
+                del self._entries[key]
+
+    def lookup_any(self, values: Iterable[Any]) -> Set[str]:
+        found: Set[str] = set()
+        for value in values:
+            found |= self._entries.get(_index_key(value), set())
+        return found
+
+
+class CollectionIndexes:
+    """Secondary indexes of one in-memory collection.
+
+    An index is built the first time a query filters on its field and is
+    kept up to date by the store's write paths from then on.
+    """
+
+    def __init__(self) -> None:
+        self._hash: Dict[str, HashIndex] = {}
+        self._sorted: Dict[str, SortedIndex] = {}
+        self._array: Dict[str, ArrayIndex] = {}
+
+    def _all(self):
+        yield from self._hash.values()
+        yield from self._sorted.values()
+        yield from self._array.values()
+
+    def add(self, doc_id: str, document: Mapping[str, Any]) -> None:
+        for index in self._all():
+            index.add(doc_id, document)
+
+    def remove(self, doc_id: str, document: Mapping[str, Any]) -> None:
+        for index in self._all():
+            index.remove(doc_id, document)
+
+    @staticmethod
+    def _build(registry: Dict[str, Any], factory, field: str, documents: Mapping[str, Mapping[str, Any]]):
+        index = registry.get(field)
+        if index is None:
+            index = factory(field)
+            for doc_id, document in documents.items():
+                index.add(doc_id, document)
+            registry[field] = index
+        return index
+
+    def hash_index(self, field: str, documents: Mapping[str, Mapping[str, Any]]) -> HashIndex:
+        return self._build(self._hash, HashIndex, field, documents)
+
+    def sorted_index(self, field: str, documents: Mapping[str, Mapping[str, Any]]) -> SortedIndex:
+        return self._build(self._sorted, SortedIndex, field, documents)
+
+    def array_index(self, field: str, documents: Mapping[str, Mapping[str, Any]]) -> ArrayIndex:
+        return self._build(self._array, ArrayIndex, field, documents)
+
+    def candidates(
+        self,
+        filters: List[FilterClause],
+        documents: Mapping[str, Mapping[str, Any]],
+    ) -> Optional[Set[str]]:
+        """Ids of documents that can satisfy the indexable filters.
+
+        Equality filters use hash indexes, range filters sorted indexes and
+        array membership the inverted index. ``!=`` and ``not-in`` are left to
+        the caller. Returns ``None`` when no filter can use an index (the
+        caller scans). The smallest matching id set drives the intersection,
+        so the cost is bounded by the most selective filter.
+        """
+        id_sets: List[Set[str]] = []
+        for field, op, value in filters:
+            if op == "==":
+                id_sets.append(self.hash_index(field, documents).lookup(value))
+            elif op == "in":
+                if not isinstance(value, list):
+                    raise ValueError("Value for 'in' operator must be a list")
+                id_sets.append(self.hash_index(field, documents).lookup_any(value))
+            elif op in RANGE_OPERATORS:
+                id_sets.append(self.sorted_index(field, documents).range(op, value))
+            elif op in ARRAY_OPERATORS:
+                values = [value] if op == "array_contains" else value
+                if not isinstance(values, list):
+                    raise ValueError(f"Value for '{op}' operator must be a list")
+                id_sets.append(self.array_index(field, documents).lookup_any(values))
+        if not id_sets:
+            return None
+
+        id_sets.sort(key=len)
+        smallest, rest = id_sets[0], id_sets[1:]
+        return {doc_id for doc_id in smallest if all(doc_id in other for other in rest)}
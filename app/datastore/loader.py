@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import weakref
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import Histogram
+
+Document = Optional[Dict[str, Any]]
+
+LOADER_BATCH_SIZE = Histogram(
+    "datastore_loader_batch_size",
+    "Distinct documents fetched per batched read of a DocumentLoader",
+    ["collection"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+
+
+class DocumentLoader:
+    """Batches single-document reads of one collection.
+
+    Ids requested during the same event-loop iteration are fetched together
+    with one ``get_documents`` call (one ``get_all`` on Firestore), so
+    concurrent ``get_by_id`` calls, e.g. from ``asyncio.gather``, cost one
+    round trip. A document requested more than once in a batch is fetched
+    once; every requester after the first gets a deep copy.
+    """
+
+    def __init__(self, store, collection: str) -> None:
+        self._store = store
+        self.collection = collection
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def load(self, doc_id: str) -> Document:
+        loop = asyncio.get_running_loop()
+        if not self._pending or self._loop is not loop:
+            # a batch left behind by a loop that stopped can never complete
+            self._pending, self._loop = {}, loop
+            loop.call_soon(self._dispatch)
+        future = loop.create_future()
+        self._pending.setdefault(doc_id, []).append(future)
+        return await future
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        if batch:
+            asyncio.ensure_future(self._fetch(batch))
+
+    async def _fetch(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        doc_ids = list(batch)
+        LOADER_BATCH_SIZE.labels(self.collection).observe(len(doc_ids))
+        try:
+            if len(doc_ids) == 1:
+                documents = [await self._store.get_document(self.collection, doc_ids[0])]
+            else:
+                documents = await self._store.get_documents(self.collection, doc_ids)
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        for doc_id, document in zip(doc_ids, documents):
+            for position, future in enumerate(batch[doc_id]):
+                if not future.done():
+                    future.set_result(document if position == 0 else copy.deepcopy(document))
+
+
+_LOADERS: "weakref.WeakKeyDictionary[Any, Dict[str, DocumentLoader]]" = weakref.WeakKeyDictionary()
+
+
+def get_document_loader(store, collection: str) -> DocumentLoader:
+    """Return the loader shared by every repository of ``collection`` on ``store``."""
+    loaders = _LOADERS.setdefault(store, {})
+    loader = loaders.get(collection)
+    if loader is None:
+        loader = loaders[collection] = DocumentLoader(store, collection)
+    return loader
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Tuple
+
+
+class _Guard:
+    __slots__ = ("_lock", "_write")
+
+    def __init__(self, lock: "AsyncRWLock", write: bool) -> None:
+        self._lock = lock
+        self._write = write
+
+    async def __aenter__(self) -> None:
+        lock = self._lock
+        # uncontended fast path, without creating another coroutine
+        if not lock._waiters and lock._available(self._write):
+            lock._grant(self._write)
+            return
+        await lock.acquire(self._write)
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._lock.release(self._write)
+
+
+class AsyncRWLock:
+    """Reader/writer lock for coroutines.
+
+    Any number of readers may hold it at once; a writer holds it alone.
+    Waiters are served in arrival order, so a queued writer is not starved by
+    a stream of new readers, and consecutive queued readers are admitted
+    together.
+    """
+
+    def __init__(self) -> None:
+        self._readers = 0
+        self._writer = False
+        self._waiters: Deque[Tuple[bool, asyncio.Future]] = deque()
+        # guards hold no per-use state, so one of each is reused
+        self._read_guard = _Guard(self, write=False)
+        self._write_guard = _Guard(self, write=True)
+
+    def read(self) -> _Guard:
+        return self._read_guard
+
+    def write(self) -> _Guard:
+        return self._write_guard
+
+    @property
+    def readers(self) -> int:
+        return self._readers
+
+    @property
+    def writing(self) -> bool:
+        return self._writer
+
+    def _available(self, write: bool) -> bool:
+        if write:
+            return not self._writer and not self._readers
+        return not self._writer
+
+    def _grant(self, write: bool) -> None:
+        if write:
+            self._writer = True
+        else:
+            self._readers += 1
+
+    async def acquire(self, write: bool) -> None:
+        if not self._waiters and self._available(write):
+            self._grant(write)
+            return
+
+        waiter = (write, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            if waiter[1].done() and not waiter[1].cancelled():
+                # granted just before the cancellation arrived
+                self.release(write)
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+                self._wake()
+            raise
+
+    def release(self, write: bool) -> None:
+        if write:
+            self._writer = False
+        else:
+            self._readers -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        waiters = self._waiters
+        while waiters:
+            write, future = waiters[0]
+            if future.done():
+                waiters.popleft()
+                continue
+            if not self._available(write):
+                return
+            waiters.popleft()
+            self._grant(write)
+            future.set_result(None)
+            if write:
+                return
+
+
+class CollectionLocks:
+    """One ``AsyncRWLock`` per collection, created on first use."""
+
+    def __init__(self) -> None:
+        self._locks: Dict[str, AsyncRWLock] = {}
+
+    def get(self, collection: str) -> AsyncRWLock:
+        lock = self._locks.get(collection)
+        if lock is None:
+            lock = self._locks.setdefault(collection, AsyncRWLock())
+        return lock
+
+    def read(self, collection: str) -> _Guard:
+        return self.get(collection).read()
+
+    def write(self, collection: str) -> _Guard:
+        return self.get(collection).write()
+
+    def write_many(self, collections: Iterable[str]) -> "_MultiGuard":
+        """Write-lock several collections, always in sorted order to avoid deadlocks."""
+        return _MultiGuard([self.get(name) for name in sorted(set(collections))])
+
+    def write_all(self) -> "_MultiGuard":
+        return self.write_many(list(self._locks))
+
+
+class _MultiGuard:
+    __slots__ = ("_locks", "_held")
+
+    def __init__(self, locks: List[AsyncRWLock]) -> None:
+        self._locks = locks
+        self._held = 0
+
+    async def __aenter__(self) -> None:
+        try:
+            for lock in self._locks:
+                await lock.acquire(True)
+                self._held += 1
+        except BaseException:
+            self._release()
+            raise
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._release()
+
+    def _release(self) -> None:
+        while self._held:
+            self._held -= 1
+            self._locks[self._held].release(True)
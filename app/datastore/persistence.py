@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import gc
+import mmap
+import os
+import pickle
+import re
+import struct
+from typing import Any, Dict, Iterator, List, Tuple
+
+Collections = Dict[str, Dict[str, Dict[str, Any]]]
+# (kind, collection, doc_id, data) with kind "set", "update", "merge" or "delete",
+# ("batch", [records...]) or ("reset",)
+Record = Tuple[Any, ...]
+
+_FRAME_HEADER = struct.Struct("<I")
+_LOG_NAME = re.compile(r"^mutations\.(\d+)\.log$")
+SNAPSHOT_NAME = "snapshot.pickle"
+
+
+class StorePersistence:
+    """Snapshot plus append-only mutation log for ``InMemoryStore``.
+
+    Every mutation is appended to ``mutations.<generation>.log`` as a
+    length-prefixed pickle frame. A compaction starts a new generation and
+    writes the state as of that point to ``snapshot.pickle``, after which the
+    older logs are deleted. Loading memory-maps the snapshot and replays the
+    logs of its generation and later, so a crash between the two steps loses
+    nothing and replays nothing twice.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.generation = 0
+        self.records_since_snapshot = 0
+        self._log = None
+
+    # -- paths --------------------------------------------------------------
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, SNAPSHOT_NAME)
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"mutations.{generation}.log")
+
+    def _log_generations(self) -> List[int]:
+        generations = []
+        for name in os.listdir(self.directory):
+            match = _LOG_NAME.match(name)
+            if match:
+                generations.append(int(match.group(1)))
+        return sorted(generations)
+
+    # -- loading ------------------------------------------------------------
+
+    def load(self) -> Tuple[Collections, Iterator[Record]]:
+        """Return the snapshot state and the log records to replay on top of it.
+
+        Also opens the current log for appending.
+        """
+        collections: Collections = {}
+        generation = 0
+        if os.path.exists(self.snapshot_path) and os.path.getsize(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as handle:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    # millions of new containers would otherwise trigger
+                    # repeated, pointless cyclic GC passes
+                    gc_was_enabled = gc.isenabled()
+                    gc.disable()
+                    try:
+                        snapshot = pickle.loads(mapped)
+                    finally:
+                        if gc_was_enabled:
+                            gc.enable()
+            generation = snapshot["generation"]
+            collections = snapshot["collections"]
+
+        generations = [g for g in self._log_generations() if g >= generation]
+        self.generation = generations[-1] if generations else generation
+        self._log = open(self._log_path(self.generation), "ab")
+        return collections, self._replay(generations)
+
+    def _replay(self, generations: List[int]) -> Iterator[Record]:
+        for generation in generations:
+            path = self._log_path(generation)
+            for record in self._read_log(path):
+                self.records_since_snapshot += 1
+                yield record
+
+    @staticmethod
+    def _read_log(path: str) -> Iterator[Record]:
+        size = os.path.getsize(path)
+        if not size:
+            return
+        valid_until = 0
+        with open(path, "rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                offset = 0
+                while offset + _FRAME_HEADER.size <= size:
+                    (length,) = _FRAME_HEADER.unpack_from(mapped, offset)
+                    end = offset + _FRAME_HEADER.size + length
+                    if end > size:
+                        break
+                    try:
+                        record = pickle.loads(mapped[offset + _FRAME_HEADER.size : end])
+                    except Exception:
+                        break
+                    offset = valid_until = end
+                    yield record
+        if valid_until < size:
+            # drop a frame that was only partly written when the process died
+            with open(path, "r+b") as handle:
+                handle.truncate(valid_until)
+
+    # -- writing ------------------------------------------------------------
+
+    def append(self, record: Record) -> None:
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        self._log.write(_FRAME_HEADER.pack(len(payload)) + payload)
+        self._log.flush()
+        self.records_since_snapshot += 1
+
+    def rotate(self) -> int:
+        """Start a new log generation; the next snapshot belongs to it."""
+        self._log.close()
+        self.generation += 1
+        self._log = open(self._log_path(self.generation), "ab")
+        self.records_since_snapshot = 0
+        return self.generation
+
+    def write_snapshot(self, collections: Collections, generation: int) -> None:
+        """Persist the state at the start of ``generation`` and drop older logs."""
+        temporary = self.snapshot_path + ".tmp"
+        with open(temporary, "wb") as handle:
+            pickle.dump(
+                {"generation": generation, "collections": collections},
+                handle,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.snapshot_path)
+        for old in self._log_generations():
+            if old < generation:
+                os.remove(self._log_path(old))
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
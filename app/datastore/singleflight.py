@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from prometheus_client import Counter
+
+from .indexes import _index_key
+
+R = TypeVar("R")
+
+COALESCED_READS = Counter(
+    "datastore_coalesced_reads_total",
+    "Reads that joined an identical read already in flight instead of issuing their own",
+    ["operation"],
+)
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The call runs in its own task, so a caller that is cancelled (e.g. a
+    client disconnecting) does not fail the others. The first caller gets
+    the result itself and every joining caller a deep copy, since callers
+    are free to mutate what a read returns.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def run(self, key: Hashable, operation: str, func: Callable[[], Awaitable[R]]) -> R:
+        task = self._calls.get(key)
+        joined = task is not None and not task.done()
+        if joined:
+            COALESCED_READS.labels(operation).inc()
+        else:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result) if joined else result
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # retrieved here so an error nobody awaited any more is not logged
+            task.exception()
+
+
+def query_key(collection: str, options: Any) -> Hashable:
+    """Hashable identity of a query, so equal ``QueryOptions`` coalesce."""
+    return (
+        "query",
+        collection,
+        tuple((field, op, _index_key(value)) for field, op, value in options.filters),
+        options.limit,
+        options.offset,
+        options.order_by,
+        _index_key(options.start_after),
+        None if options.select is None else tuple(options.select),
+    )
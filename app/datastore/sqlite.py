@@ -0,0 +1,482 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .executor import get_executor
+from .firestore import (
+    DocumentNotFoundError,
+    Entry,
+    FilterClause,
+    QueryOptions,
+    WriteBatch,
+    WriteOperation,
+    _apply_update,
+    _update_result,
+    iterate_pages,
+)
+from .values import ARRAY_OPERATORS, RANGE_OPERATORS, SUPPORTED_OPERATORS
+
+# A rowid table on purpose: WITHOUT ROWID makes the planner prefer the
+# primary key over the (collection, field) indexes.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    datetime_fields TEXT,
+    PRIMARY KEY (collection, doc_id)
+)
+"""
+
+# Field paths become part of generated column definitions, so only plain
+# (optionally dotted) identifiers are accepted.
+_FIELD_PATH = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+_TYPE_CHECKS = {
+    "number": "IN ('integer', 'real')",
+    "text": "= 'text'",
+}
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _to_utc_naive(value).isoformat()
+    # like Firestore, reject what cannot be stored instead of saving str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode(data: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Serialise a document; top-level datetimes are stored as ISO strings
+    (so they sort and compare in SQL) and remembered in a sidecar column.
+
+    Only top-level datetimes round-trip: one nested in a map or array is
+    stored as its ISO string and read back as that string.
+    """
+    datetime_fields = sorted(key for key, value in data.items() if isinstance(value, datetime))
+    encoded = json.dumps(data, default=_json_default, separators=(",", ":"))
+    return encoded, json.dumps(datetime_fields) if datetime_fields else None
+
+
+def _decode(encoded: str, datetime_fields: Optional[str]) -> Dict[str, Any]:
+    data = json.loads(encoded)
+    if datetime_fields:
+        for key in json.loads(datetime_fields):
+            if isinstance(data.get(key), str):
+                data[key] = datetime.fromisoformat(data[key])
+    return data
+
+
+def _param(value: Any) -> Any:
+    """Convert a filter operand to what ``json_extract`` yields for it."""
+    if isinstance(value, datetime):
+        return _to_utc_naive(value).isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default, separators=(",", ":"))
+    return value
+
+
+def _value_type(value: Any) -> Optional[str]:
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, (str, datetime)):
+        return "text"
+    return None
+
+
+class SQLiteStore:
+    """Datastore engine on a local SQLite file.
+
+    Documents are stored as JSON, one row per document. The first query that
+    filters or orders on a field adds a virtual generated column for it and
+    indexes ``(collection, column, doc_id)``, so later lookups and orderings
+    are index scans. The database runs in WAL mode, every datastore worker
+    thread keeps its own connection, and batches commit in one transaction.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        connection = self._connection()
+        connection.execute(_SCHEMA)
+        self._columns: Set[str] = {
+            row[1] for row in connection.execute("PRAGMA table_xinfo(documents)") if row[1].startswith("f_")
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    async def _run(self, func, *args):
+        def _call():
+            return func(self._connection(), *args)
+
+        return await get_executor("datastore").run(_call)
+
+    # -- schema -------------------------------------------------------------
+
+    def _column(self, connection: sqlite3.Connection, field: str) -> str:
+        """Name of the indexed generated column for ``field``, created on demand."""
+        if not _FIELD_PATH.match(field):
+            raise ValueError(f"Unsupported field path for the SQLite engine: {field}")
+        column = "f_" + field.replace(".", "__")
+        if column in self._columns:
+            return column
+        with self._schema_lock:
+            if column not in self._columns:
+                existing = {row[1] for row in connection.execute("PRAGMA table_xinfo(documents)")}
+                if column not in existing:
+                    connection.execute(
+                        f"ALTER TABLE documents ADD COLUMN {column} "
+                        f"GENERATED ALWAYS AS (json_extract(data, '$.{field}')) VIRTUAL"
+                    )
+                # doc_id is the tie-break of every ordering, so the index can
+                # serve ORDER BY without a sort step
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{column} ON documents (collection, {column}, doc_id)"
+                )
+                self._columns.add(column)
+        return column
+
+    def _where(
+        self,
+        connection: sqlite3.Connection,
+        collection: str,
+        filters: Iterable[FilterClause],
+    ) -> Tuple[List[str], List[Any]]:
+        clauses = ["collection = ?"]
+        params: List[Any] = [collection]
+        for field, op, value in filters:
+            if op not in SUPPORTED_OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            column = self._column(connection, field)
+            if op == "==":
+                if value is None:
+                    clauses.append(f"{column} IS NULL")
+                else:
+                    clauses.append(f"{column} = ?")
+                    params.append(_param(value))
+            elif op in ("in", "not-in"):
+                if not isinstance(value, list):
+                    raise ValueError(f"Value for '{op}' operator must be a list")
+                values = [_param(item) for item in value if item is not None]
+                placeholders = ", ".join("?" for _ in values)
+                if op == "in":
+                    options = [f"{column} IN ({placeholders})"] if values else []
+                    if len(values) != len(value):
+                        options.append(f"{column} IS NULL")
+                    clauses.append("(" + " OR ".join(options) + ")" if options else "0")
+                else:
+                    clauses.append(f"{column} IS NOT NULL")
+                    if values:
+                        clauses.append(f"{column} NOT IN ({placeholders})")
+                params.extend(values)
+            elif op == "!=":
+                clauses.append(f"{column} IS NOT NULL")
+                if value is not None:
+                    clauses.append(f"{column} != ?")
+                    params.append(_param(value))
+            elif op in RANGE_OPERATORS:
+                value_type = _value_type(value)
+                if value_type is None:
+                    clauses.append("0")
+                    continue
+                # like Firestore, only values of the operand's type qualify
+                clauses.append(f"typeof({column}) {_TYPE_CHECKS[value_type]}")
+                clauses.append(f"{column} {op} ?")
+                params.append(_param(value))
+            elif op in ARRAY_OPERATORS:
+                values = [value] if op == "array_contains" else value
+                if not isinstance(values, list):
+                    raise ValueError(f"Value for '{op}' operator must be a list")
+                placeholders = ", ".join("?" for _ in values) or "NULL"
+                clauses.append(
+                    f"json_type(data, '$.{field}') = 'array' AND EXISTS (SELECT 1 FROM json_each(data, '$.{field}') "
+                    f"WHERE json_each.value IN ({placeholders}))"
+                )
+                params.extend(_param(item) for item in values)
+        return clauses, params
+
+    # -- reads --------------------------------------------------------------
+
+    async def get_document(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        def _get(connection):
+            row = connection.execute(
+                "SELECT data, datetime_fields FROM documents WHERE collection = ? AND doc_id = ?",
+                (collection, doc_id),
+            ).fetchone()
+            return None if row is None else _decode(*row)
+
+        return await self._run(_get)
+
+    async def get_documents(self, collection: str, doc_ids: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+        doc_ids = list(doc_ids)
+        if not doc_ids:
+            return []
+
+        def _get_many(connection):
+            found: Dict[str, Tuple[str, Optional[str]]] = {}
+            unique = list(dict.fromkeys(doc_ids))
+            # stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = connection.execute(
+                    "SELECT doc_id, data, datetime_fields FROM documents "
+                    f"WHERE collection = ? AND doc_id IN ({placeholders})",
+                    [collection, *chunk],
+                )
+                for doc_id, data, datetime_fields in rows:
+                    found[doc_id] = (data, datetime_fields)
+            return [_decode(*found[doc_id]) if doc_id in found else None for doc_id in doc_ids]
+
+        return await self._run(_get_many)
+
+    async def query(self, collection: str, options: QueryOptions) -> List[Dict[str, Any]]:
+        return [data for _, data in await self._query_entries(collection, options)]
+
+    def iter_query(
+        self,
+        collection: str,
+        options: QueryOptions,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        return iterate_pages(self._query_entries, collection, options, page_size)
+
+    async def _query_entries(self, collection: str, options: QueryOptions) -> List[Entry]:
+        def _query(connection):
+            clauses, params = self._where(connection, collection, options.filters)
+            reverse = False
+            order_sql = "doc_id ASC"
+            if options.order_by:
+                field, direction = options.order_by
+                column = self._column(connection, field)
+                reverse = direction.lower() == "desc"
+                sql_direction = "DESC" if reverse else "ASC"
+                # ordering by a field also filters out documents without it
+                clauses.append(f"json_type(data, '$.{field}') IS NOT NULL")
+                order_sql = f"{column} {sql_direction}, doc_id {sql_direction}"
+
+            if options.start_after is not None:
+                value, cursor_id = options.start_after
+                after = "<" if reverse else ">"
+                if not options.order_by:
+                    clauses.append(f"doc_id {after} ?")
+                    params.append(cursor_id)
+                elif value is None:
+                    # nulls sort first
+                    if reverse:
+                        clauses.append(f"({column} IS NULL AND doc_id < ?)")
+                    else:
+                        clauses.append(f"({column} IS NOT NULL OR doc_id > ?)")
+                    params.append(cursor_id)
+                else:
+                    clauses.append(
+                        f"({column} {after} ? OR ({column} = ? AND doc_id {after} ?)"
+                        + (f" OR {column} IS NULL)" if reverse else ")")
+                    )
+                    params.extend([_param(value), _param(value), cursor_id])
+
+            if options.select is None:
+                columns, decode = "data, datetime_fields", _decode
+            else:
+                columns, decode = self._projection(options.select)
+            sql = (
+                f"SELECT doc_id, {columns} FROM documents WHERE "
+                + " AND ".join(clauses)
+                + f" ORDER BY {order_sql} LIMIT ? OFFSET ?"
+            )
+            params.extend([options.limit or -1, options.offset or 0])
+            return [(row[0], decode(*row[1:])) for row in connection.execute(sql, params)]
+
+        return await self._run(_query)
+
+    @staticmethod
+    def _projection(fields: List[str]):
+        """Columns extracting only ``fields`` in SQL, and the row decoder for them."""
+        for field in fields:
+            if not _FIELD_PATH.match(field):
+                raise ValueError(f"Unsupported field path for the SQLite engine: {field}")
+        columns = ["datetime_fields"]
+        for field in fields:
+            columns.append(f"json_extract(data, '$.{field}')")
+            columns.append(f"json_type(data, '$.{field}')")
+
+        def _decode_row(datetime_fields, *values):
+            restore = set(json.loads(datetime_fields)) if datetime_fields else set()
+            row: Dict[str, Any] = {}
+            for index, field in enumerate(fields):
+                value, value_type = values[2 * index], values[2 * index + 1]
+                if value_type is None:
+                    continue
+                if value_type in ("true", "false"):
+                    value = value_type == "true"
+                elif value_type in ("array", "object"):
+                    value = json.loads(value)
+                elif field in restore:
+                    value = datetime.fromisoformat(value)
+                row[field] = value
+            return row
+
+        return ", ".join(columns), _decode_row
+
+    async def exists(self, collection: str, filters: Iterable[FilterClause] = ()) -> bool:
+        filters = list(filters)
+
+        def _exists(connection):
+            clauses, params = self._where(connection, collection, filters)
+            row = connection.execute(
+                "SELECT 1 FROM documents WHERE " + " AND ".join(clauses) + " LIMIT 1",
+                params,
+            ).fetchone()
+            return row is not None
+
+        return await self._run(_exists)
+
+    async def count(self, collection: str, filters: Iterable[FilterClause] = ()) -> int:
+        filters = list(filters)
+
+        def _count(connection):
+            clauses, params = self._where(connection, collection, filters)
+            row = connection.execute(
+                "SELECT COUNT(*) FROM documents WHERE " + " AND ".join(clauses),
+                params,
+            ).fetchone()
+            return int(row[0])
+
+        return await self._run(_count)
+
+    # -- writes -------------------------------------------------------------
+
+    @staticmethod
+    def _put(connection: sqlite3.Connection, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
+        encoded, datetime_fields = _encode(data)
+        connection.execute(
+            "INSERT OR REPLACE INTO documents (collection, doc_id, data, datetime_fields) VALUES (?, ?, ?, ?)",
+            (collection, doc_id, encoded, datetime_fields),
+        )
+
+    @staticmethod
+    def _load(connection: sqlite3.Connection, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        row = connection.execute(
+            "SELECT data, datetime_fields FROM documents WHERE collection = ? AND doc_id = ?",
+            (collection, doc_id),
+        ).fetchone()
+        return None if row is None else _decode(*row)
+
+    async def create_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        await self._run(self._put, collection, doc_id, data)
+        return data
+
+    async def set_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.create_document(collection, doc_id, data)
+
+    async def update_document(
+        self,
+        collection: str,
+        doc_id: str,
+        data: Dict[str, Any],
+        *,
+        base: Optional[Dict[str, Any]] = None,
+        reread: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        def _update(connection):
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                document = self._load(connection, collection, doc_id)
+                if document is None:
+                    connection.execute("ROLLBACK")
+                    return None
+                _apply_update(document, data)
+                self._put(connection, collection, doc_id, document)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            if reread:
+                return document
+            return _update_result(data, base, datetime.utcnow())
+
+        return await self._run(_update)
+
+    async def delete_document(self, collection: str, doc_id: str) -> None:
+        def _delete(connection):
+            connection.execute("DELETE FROM documents WHERE collection = ? AND doc_id = ?", (collection, doc_id))
+
+        await self._run(_delete)
+
+    def write_batch(self) -> WriteBatch:
+        return WriteBatch(self)
+
+    async def commit_many(self, operations: Iterable[WriteOperation]) -> None:
+        """Apply all operations in one transaction: every write lands or none does."""
+        operations = list(operations)
+
+        def _commit(connection):
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._apply(connection, operations)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+        await self._run(_commit)
+
+    def _apply(self, connection: sqlite3.Connection, operations: Sequence[WriteOperation]) -> None:
+        for op in operations:
+            if op.kind == "set":
+                self._put(connection, op.collection, op.doc_id, op.data)
+            elif op.kind == "update":
+                document = self._load(connection, op.collection, op.doc_id)
+                if document is None:
+                    raise DocumentNotFoundError(f"{op.collection}/{op.doc_id}")
+                _apply_update(document, op.data)
+                self._put(connection, op.collection, op.doc_id, document)
+            elif op.kind == "merge":
+                document = self._load(connection, op.collection, op.doc_id) or {}
+                _apply_update(document, op.data)
+                self._put(connection, op.collection, op.doc_id, document)
+            else:
+                connection.execute(
+                    "DELETE FROM documents WHERE collection = ? AND doc_id = ?",
+                    (op.collection, op.doc_id),
+                )
+
+    # -- maintenance --------------------------------------------------------
+
+    async def reset(self) -> None:
+        def _reset(connection):
+            connection.execute("DELETE FROM documents")
+
+        await self._run(_reset)
+
+    async def healthcheck(self) -> bool:
+        def _ping(connection):
+            connection.execute("SELECT 1").fetchone()
+            return True
+
+        return await self._run(_ping)
+
+    @property
+    def using_memory(self) -> bool:
+        return False
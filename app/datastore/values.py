@@ -0,0 +1,101 @@
+"""
+Firestore value ordering and filter semantics for the in-memory engine
+"""
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Tuple
+
+RANGE_OPERATORS = ("<", "<=", ">", ">=")
+ARRAY_OPERATORS = ("array_contains", "array_contains_any")
+SUPPORTED_OPERATORS = ("==", "!=", "in", "not-in") + RANGE_OPERATORS + ARRAY_OPERATORS
+
+# Firestore orders values of different types by type first:
+# null < boolean < NaN < number < timestamp < string < bytes < array < map.
+_NULL, _BOOL, _NAN, _NUMBER, _TIMESTAMP, _STRING, _BYTES, _ARRAY, _MAP, _OTHER = range(10)
+
+
+def _type_rank(value: Any) -> int:
+    if value is None:
+        return _NULL
+    if isinstance(value, bool):
+        return _BOOL
+    if isinstance(value, (int, float)):
+        return _NAN if isinstance(value, float) and math.isnan(value) else _NUMBER
+    if isinstance(value, datetime):
+        return _TIMESTAMP
+    if isinstance(value, str):
+        return _STRING
+    if isinstance(value, bytes):
+        return _BYTES
+    if isinstance(value, (list, tuple)):
+        return _ARRAY
+    if isinstance(value, dict):
+        return _MAP
+    return _OTHER
+
+
+def sort_key(value: Any) -> Tuple[Any, ...]:
+    """Key that orders arbitrary field values the way Firestore does."""
+    rank = _type_rank(value)
+    if rank in (_NULL, _NAN):
+        return (rank,)
+    if rank == _TIMESTAMP:
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return (rank, value)
+    if rank == _ARRAY:
+        return (rank, tuple(sort_key(item) for item in value))
+    if rank == _MAP:
+        return (rank, tuple((key, sort_key(value[key])) for key in sorted(value)))
+    if rank == _OTHER:
+        return (rank, repr(value))
+    return (rank, value)
+
+
+def comparable(value: Any, operand: Any) -> bool:
+    """Range filters only match values of the operand's type (and never null/NaN)."""
+    rank = _type_rank(operand)
+    return rank not in (_NULL, _NAN) and _type_rank(value) == rank
+
+
+def matches_clause(document: dict, field: str, op: str, operand: Any) -> bool:
+    """Evaluate one ``(field, op, operand)`` filter against a stored document."""
+    if op == "==":
+        # documents without the field compare equal to None, as before
+        return document.get(field) == operand
+    if op == "in":
+        if not isinstance(operand, list):
+            raise ValueError("Value for 'in' operator must be a list")
+        return document.get(field) in operand
+    if op not in SUPPORTED_OPERATORS:
+        raise ValueError(f"Unsupported filter operator: {op}")
+
+    if field not in document:
+        return False
+    value = document[field]
+    if op in RANGE_OPERATORS:
+        if not comparable(value, operand):
+            return False
+        left, right = sort_key(value), sort_key(operand)
+        if op == "<":
+            return left < right
+        if op == "<=":
+            return left <= right
+        if op == ">":
+            return left > right
+        return left >= right
+    if op == "!=":
+        return value is not None and value != operand
+    if op == "not-in":
+        if not isinstance(operand, list):
+            raise ValueError("Value for 'not-in' operator must be a list")
+        return value is not None and value not in operand
+    if not isinstance(value, list):
+        return False
+    if op == "array_contains":
+        return operand in value
+    if not isinstance(operand, list):
+        raise ValueError("Value for 'array_contains_any' operator must be a list")
+    return any(item in value for item in operand)
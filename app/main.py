@@ -5,7 +5,8 @@ from fastapi.responses import JSONResponse
 from prometheus_client import generate_latest, Counter, Histogram
 import structlog
 from .config.firebase import initialize_firebase
-from .middleware import LoggingMiddleware, ErrorHandlingMiddleware, setup_cors_middleware
+from .datastore.executor import ExecutorSaturatedError, shutdown_executors
+from .middleware import IdentityMapMiddleware, LoggingMiddleware, ErrorHandlingMiddleware, setup_cors_middleware
 from .routers import (
     auth_router,
     users_router,
@@ -46,6 +47,7 @@ async def lifespan(app: FastAPI):
     initialize_firebase()
     yield
     logger.info("Application shutting down")
+    shutdown_executors()
 
 
 app = FastAPI(
@@ -61,6 +63,7 @@ REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP requests', ['method',
 REQUEST_DURATION = Histogram('http_request_duration_seconds', 'HTTP request duration')
 
 setup_cors_middleware(app)
+app.add_middleware(IdentityMapMiddleware)
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(ErrorHandlingMiddleware)
 
@@ -101,6 +104,19 @@ async def not_found_handler(request, exc):
     )
 
 
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated_handler(request, exc):
+    logger.warning("Rejected request under back-pressure", error=str(exc), path=request.url.path)
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content=APIResponse(
+            success=False,
+            error="Service is overloaded, please retry"
+        ).model_dump()
+    )
+
+
 @app.exception_handler(422)
 async def validation_error_handler(request, exc):
     return JSONResponse(
@@ -5,6 +5,7 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
+from .datastore.identity_map import identity_map_scope
 from .schemas.common import APIResponse
 
 logger = structlog.get_logger()
@@ -39,6 +40,15 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class IdentityMapMiddleware(BaseHTTPMiddleware):
+    """Give each request its own identity map so repositories read every
+    document at most once per request."""
+
+    async def dispatch(self, request: Request, call_next):
+        with identity_map_scope():
+            return await call_next(request)
+
+
 class ErrorHandlingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         try:
@@ -1,12 +1,101 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime
+from typing import Any, Callable, Dict
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from ..config.settings import settings
+
+_object_setattr = object.__setattr__
+
+
+def _compile_constructor(cls: type) -> Callable[[Dict[str, Any]], Any]:
+    """Trusted constructor of ``cls``: what ``model_construct`` does, with the
+    field list and defaults looked up once instead of on every call."""
+    if cls.__private_attributes__:
+        return lambda values: cls.model_construct(**values)
+    fields = tuple(cls.model_fields.items())
+
+    def construct(values: Dict[str, Any]) -> Any:
+        data = {
+            name: values[name] if name in values else field.get_default(call_default_factory=True)
+            for name, field in fields
+        }
+        instance = cls.__new__(cls)
+        _object_setattr(instance, "__dict__", data)
+        _object_setattr(instance, "__pydantic_fields_set__", set(values))
+        _object_setattr(instance, "__pydantic_extra__", None)
+        _object_setattr(instance, "__pydantic_private__", None)
+        return instance
+
+    return construct
+
+
+_CONSTRUCTORS: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+
+
+def copy_stored(value: Any) -> Any:
+    """Copy of a stored value, with nested lists and dicts copied as well.
+
+    Stored documents are shared with the datastore and its caches, so a
+    model must never hold their lists or dicts: changing one in place would
+    change the stored document behind the datastore's back.
+    """
+    if isinstance(value, dict):
+        return {key: copy_stored(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_stored(item) for item in value]
+    return value
+
+
+def stored_uuid(value: Any) -> uuid.UUID:
+    """Parse an id as written by ``to_firestore`` (``str(uuid)``).
+
+    Builds the UUID from its 32 hex digits without the format handling of
+    ``uuid.UUID()``, which makes up most of the cost of decoding a document.
+    """
+    if isinstance(value, uuid.UUID):
+        return value
+    if settings.validate_stored_documents:
+        return uuid.UUID(str(value))
+    hex_digits = str(value).replace("-", "")
+    if len(hex_digits) != 32:
+        raise ValueError(f"badly formed UUID: {value!r}")
+    parsed = uuid.UUID.__new__(uuid.UUID)
+    _object_setattr(parsed, "int", int(hex_digits, 16))
+    _object_setattr(parsed, "is_safe", uuid.SafeUUID.unknown)
+    return parsed
+
 
 class TimestampedModel(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+    @classmethod
+    def from_stored(cls, **fields):
+        """Build a model from fields its ``from_firestore`` already converted.
+
+        Stored documents were validated when they were written, so this
+        skips validation; set ``settings.validate_stored_documents`` to
+        validate them again. List and dict values are copied either way
+        (see ``copy_stored``).
+        """
+        for name, value in fields.items():
+            if isinstance(value, (list, dict)):
+                fields[name] = copy_stored(value)
+        if settings.validate_stored_documents:
+            return cls(**fields)
+        return cls.construct_stored(fields)
+
+    @classmethod
+    def construct_stored(cls, fields: Dict[str, Any]):
+        """``from_stored`` without validating or copying: ``fields`` must
+        already belong to the new model alone."""
+        construct = _CONSTRUCTORS.get(cls)
+        if construct is None:
+            construct = _CONSTRUCTORS[cls] = _compile_constructor(cls)
+        return construct(fields)
@@ -6,7 +6,7 @@ from typing import List
 
 from pydantic import Field
 
-from .base import TimestampedModel
+from .base import TimestampedModel, stored_uuid
 
 
 class Client(TimestampedModel):
@@ -31,10 +31,10 @@ class Client(TimestampedModel):
             created = datetime.fromisoformat(created)
         if isinstance(updated, str):
             updated = datetime.fromisoformat(updated)
-        return cls(
-            client_id=uuid.UUID(str(payload["client_id"])),
-            user_id=uuid.UUID(str(payload["user_id"])),
-            company_ids=[uuid.UUID(str(cid)) for cid in payload.get("company_ids", [])],
+        return cls.from_stored(
+            client_id=stored_uuid(payload["client_id"]),
+            user_id=stored_uuid(payload["user_id"]),
+            company_ids=[stored_uuid(cid) for cid in payload.get("company_ids", [])],
             created_at=created or datetime.utcnow(),
             updated_at=updated or datetime.utcnow(),
         )
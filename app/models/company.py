@@ -2,11 +2,24 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Callable, ClassVar, Dict, List, Optional
 
 from pydantic import Field
 
-from .base import TimestampedModel
+from .base import TimestampedModel, stored_uuid
+
+
+def _stored_id_list(values) -> List[uuid.UUID]:
+    # legacy documents may hold empty ids
+    return [stored_uuid(value) for value in values or [] if value and str(value).strip()]
+
+
+def _stored_owner_ids(payload: dict) -> List[uuid.UUID]:
+    owner_ids = _stored_id_list(payload.get("owner_ids"))
+    client_uuid = stored_uuid(payload["client_id"])
+    if client_uuid not in owner_ids:
+        owner_ids.append(client_uuid)
+    return owner_ids
 
 
 class Company(TimestampedModel):
@@ -22,6 +35,12 @@ class Company(TimestampedModel):
     company_orders: List[uuid.UUID] = Field(default_factory=list)
     normalized_company_name: Optional[str] = None
 
+    # decoders of lazy entities (see models.lazy) where the generic ones differ
+    lazy_decoders: ClassVar[Dict[str, Callable[[dict], Any]]] = {
+        "owner_ids": _stored_owner_ids,
+        "company_orders": lambda payload: _stored_id_list(payload.get("company_orders")),
+    }
+
     def to_firestore(self) -> dict:
         data = self.model_dump()
         data["company_id"] = str(self.company_id)
@@ -44,37 +63,26 @@ class Company(TimestampedModel):
             updated = datetime.fromisoformat(updated)
         
         try:
-            client_uuid = uuid.UUID(str(payload["client_id"]))
+            client_uuid = stored_uuid(payload["client_id"])
         except (ValueError, KeyError) as e:
             raise ValueError(f"Invalid client_id in payload: {payload.get('client_id', 'MISSING')} - {e}")
         
         try:
-            owner_ids_raw = payload.get("owner_ids", [])
-            owner_ids = []
-            for oid in owner_ids_raw:
-                if oid and str(oid).strip():  # Only process non-empty values
-                    owner_ids.append(uuid.UUID(str(oid)))
+            owner_ids = _stored_owner_ids(payload)
         except (ValueError, TypeError) as e:
             raise ValueError(f"Invalid owner_ids in payload: {payload.get('owner_ids', 'MISSING')} - {e}")
-            
-        if client_uuid not in owner_ids:
-            owner_ids.append(client_uuid)
 
         try:
-            company_id = uuid.UUID(str(payload["company_id"]))
+            company_id = stored_uuid(payload["company_id"])
         except (ValueError, KeyError) as e:
             raise ValueError(f"Invalid company_id in payload: {payload.get('company_id', 'MISSING')} - {e}")
 
         try:
-            company_orders_raw = payload.get("company_orders", [])
-            company_orders = []
-            for oid in company_orders_raw:
-                if oid and str(oid).strip():  # Only process non-empty values
-                    company_orders.append(uuid.UUID(str(oid)))
+            company_orders = _stored_id_list(payload.get("company_orders"))
         except (ValueError, TypeError) as e:
             raise ValueError(f"Invalid company_orders in payload: {payload.get('company_orders', 'MISSING')} - {e}")
 
-        return cls(
+        return cls.from_stored(
             company_id=company_id,
             client_id=client_uuid,
             owner_ids=owner_ids,
@@ -7,7 +7,7 @@ from typing import Dict, List, Optional
 
 from pydantic import Field
 
-from .base import TimestampedModel
+from .base import TimestampedModel, stored_uuid
 
 
 class FreelancerStatus(str, enum.Enum):
@@ -62,9 +62,9 @@ class Freelancer(TimestampedModel):
         avatar_uploaded_at = payload.get("avatar_uploaded_at")
         if isinstance(avatar_uploaded_at, str):
             avatar_uploaded_at = datetime.fromisoformat(avatar_uploaded_at)
-        return cls(
-            freelancer_id=uuid.UUID(str(payload["freelancer_id"])),
-            user_id=uuid.UUID(str(payload["user_id"])),
+        return cls.from_stored(
+            freelancer_id=stored_uuid(payload["freelancer_id"]),
+            user_id=stored_uuid(payload["user_id"]),
             iin=payload.get("iin", ""),
             city=payload.get("city", ""),
             email=payload.get("email", ""),
@@ -0,0 +1,184 @@
+"""
+Lazy entities: stored documents whose fields are converted on first access
+"""
+from __future__ import annotations
+
+import enum
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, get_args, get_origin
+
+from ..config.settings import settings
+from .base import copy_stored, stored_uuid
+
+Decoder = Callable[[Dict[str, Any]], Any]
+
+_object_setattr = object.__setattr__
+
+
+def _stored_datetime(value: Any) -> Any:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _field_decoder(name: str, field) -> Tuple[Optional[Decoder], Optional[Callable[[], Any]]]:
+    """``(decoder, None)`` for a field that needs converting, following what
+    the models' ``from_firestore`` do for its type, or ``(None, default)``
+    for one stored as is; ``default`` (a factory) replaces a missing or
+    ``None`` value. Required fields get neither (see ``LazyEntity``)."""
+    annotation = field.annotation
+    optional = False
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        optional = len(args) < len(get_args(annotation))
+        annotation = args[0] if len(args) == 1 else Any
+
+    if annotation is uuid.UUID:
+        if optional:
+            return (lambda document: stored_uuid(document[name]) if document.get(name) else None), None
+        return (lambda document: stored_uuid(document[name])), None
+    if annotation is datetime:
+        if optional:
+            return (lambda document: _stored_datetime(document.get(name))), None
+        return (lambda document: _stored_datetime(document.get(name)) or datetime.utcnow()), None
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        if field.is_required():
+            return (lambda document: annotation(document[name])), None
+        default = field.default.value
+        return (lambda document: annotation(document.get(name, default))), None
+    if get_origin(annotation) in (list, List) and not optional:
+        if get_args(annotation) == (uuid.UUID,):
+            return (lambda document: [stored_uuid(value) for value in document.get(name) or []]), None
+        return (lambda document: copy_stored(document.get(name) or [])), None
+    if field.is_required():
+        return None, None
+    if field.default_factory is not None:
+        return None, field.default_factory
+    if field.default is not None:
+        return None, lambda: field.default
+    return None, None
+
+
+class LazyEntity:
+    """Stand-in for a model, built from a stored document.
+
+    Every field is a slot. Fields stored as is are bound when the entity is
+    built; ids, timestamps, enums and lists are converted the first time
+    they are read and kept in their slot, so fields a caller never reads
+    are never converted. Lists and dicts are copied on the way in, like
+    ``from_stored`` does, since the document belongs to the datastore.
+    Required fields fall back to ``""`` only when missing, as in the
+    models' ``from_firestore``. Anything other than a field
+    (``to_firestore``, ``model_dump``, ...) is served by the full model,
+    built on first use.
+    """
+
+    __slots__ = ("_document", "_entity")
+
+    model: Any = None
+    # converted fields; the others are bound in __init__
+    decoders: Dict[str, Decoder] = {}
+    stored_fields: Tuple[Tuple[str, Optional[Callable[[], Any]]], ...] = ()
+    required_fields: Tuple[str, ...] = ()
+
+    def __init__(self, document: Dict[str, Any]) -> None:
+        _object_setattr(self, "_document", document)
+        _object_setattr(self, "_entity", None)
+        get = document.get
+        for name, default in self.stored_fields:
+            value = get(name)
+            if value is None:
+                if default is not None:
+                    value = default()
+            elif value.__class__ is list or value.__class__ is dict:
+                value = copy_stored(value)
+            _object_setattr(self, name, value)
+        for name in self.required_fields:
+            value = get(name, "")
+            if value.__class__ is list or value.__class__ is dict:
+                value = copy_stored(value)
+            _object_setattr(self, name, value)
+
+    def __getattr__(self, name: str) -> Any:
+        # only reached for slots not set yet and for non-field names
+        decode = self.decoders.get(name)
+        if decode is not None:
+            value = decode(self._document)
+            _object_setattr(self, name, value)
+            return value
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        _object_setattr(self, name, value)
+        if self._entity is not None:
+            setattr(self._entity, name, value)
+
+    def materialize(self):
+        """The full model, with every field converted."""
+        if self._entity is None:
+            fields = {name: getattr(self, name) for name in self.model.model_fields}
+            # the slots already hold copies, which the model shares so that
+            # in-place changes show on both
+            _object_setattr(self, "_entity", self.model.construct_stored(fields))
+        return self._entity
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyEntity):
+            other = other.materialize()
+        return self.materialize() == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self):
+        return type(self), (self._document,)
+
+    def __repr__(self) -> str:
+        return f"Lazy{self.materialize()!r}"
+
+
+_LAZY_CLASSES: Dict[type, type] = {}
+
+
+def lazy_factory(model: type) -> Callable[[Dict[str, Any]], Any]:
+    """Factory building lazy entities of ``model`` from stored documents.
+
+    Fields are decoded by type unless the model lists its own decoder in
+    ``lazy_decoders``. With ``settings.validate_stored_documents`` set the
+    factory returns fully decoded (and validated) models instead.
+    """
+    lazy_class = _LAZY_CLASSES.get(model)
+    if lazy_class is None:
+        overrides = getattr(model, "lazy_decoders", {})
+        decoders: Dict[str, Decoder] = {}
+        stored_fields = []
+        required_fields = []
+        for name, field in model.model_fields.items():
+            if name in overrides:
+                decoders[name] = lambda document, decode=overrides[name]: copy_stored(decode(document))
+                continue
+            decoder, default = _field_decoder(name, field)
+            if decoder is not None:
+                decoders[name] = decoder
+            elif field.is_required():
+                required_fields.append(name)
+            else:
+                stored_fields.append((name, default))
+        lazy_class = _LAZY_CLASSES[model] = type(
+            f"Lazy{model.__name__}",
+            (LazyEntity,),
+            {
+                "__slots__": tuple(model.model_fields),
+                "model": model,
+                "decoders": decoders,
+                "stored_fields": tuple(stored_fields),
+                "required_fields": tuple(required_fields),
+            },
+        )
+
+    def _build(document: Dict[str, Any]) -> Any:
+        if settings.validate_stored_documents:
+            return model.from_firestore(document)
+        return lazy_class(document)
+
+    return _build
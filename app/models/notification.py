@@ -7,7 +7,7 @@ from typing import Optional
 
 from pydantic import Field
 
-from .base import TimestampedModel
+from .base import TimestampedModel, stored_uuid
 
 
 class NotificationType(str, enum.Enum):
@@ -58,17 +58,17 @@ class Notification(TimestampedModel):
         if isinstance(updated, str):
             updated = datetime.fromisoformat(updated)
 
-        return cls(
-            notification_id=uuid.UUID(payload["notification_id"]),
+        return cls.from_stored(
+            notification_id=stored_uuid(payload["notification_id"]),
             type=NotificationType(payload["type"]),
             status=NotificationStatus(payload["status"]),
             title=payload["title"],
             message=payload["message"],
-            user_id=uuid.UUID(payload["user_id"]),
-            client_id=uuid.UUID(payload["client_id"]) if payload.get("client_id") else None,
-            order_id=uuid.UUID(payload["order_id"]) if payload.get("order_id") else None,
+            user_id=stored_uuid(payload["user_id"]),
+            client_id=stored_uuid(payload["client_id"]) if payload.get("client_id") else None,
+            order_id=stored_uuid(payload["order_id"]) if payload.get("order_id") else None,
             reason=payload.get("reason"),
             admin_notes=payload.get("admin_notes"),
-            created_at=created,
-            updated_at=updated,
+            created_at=created or datetime.utcnow(),
+            updated_at=updated or datetime.utcnow(),
         )
\ No newline at end of file
@@ -3,11 +3,11 @@ from __future__ import annotations
 import enum
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, ClassVar, Dict, List, Optional
 
 from pydantic import Field
 
-from .base import TimestampedModel
+from .base import TimestampedModel, stored_uuid
 
 
 class OrderStatus(str, enum.Enum):
@@ -21,6 +21,13 @@ class OrderCompleteStatus(str, enum.Enum):
     COMPLETED = "completed"
 
 
+def _stored_contracts(payload: dict) -> Optional[List[Dict[str, Any]]]:
+    contracts = payload.get("contracts")
+    if isinstance(contracts, dict):
+        contracts = [contracts]  # Backward compatibility: convert old dict to list
+    return contracts
+
+
 class Order(TimestampedModel):
     order_id: uuid.UUID = Field(default_factory=uuid.uuid4)
     order_description: str
@@ -34,6 +41,9 @@ class Order(TimestampedModel):
     contracts: Optional[List[Dict[str, Any]]] = None
     order_specializations: Optional[List[Dict[str, Any]]] = None
 
+    # decoders of lazy entities (see models.lazy) where the generic ones differ
+    lazy_decoders: ClassVar[Dict[str, Callable[[dict], Any]]] = {"contracts": _stored_contracts}
+
     def to_firestore(self) -> dict:
         data = self.model_dump()
         data["order_id"] = str(self.order_id)
@@ -53,14 +63,12 @@ class Order(TimestampedModel):
         if isinstance(updated, str):
             updated = datetime.fromisoformat(updated)
         
-        contracts = payload.get("contracts")
-        if isinstance(contracts, dict):
-            contracts = [contracts]  # Backward compatibility: convert old dict to list
+        contracts = _stored_contracts(payload)
         
-        return cls(
-            order_id=uuid.UUID(str(payload["order_id"])),
+        return cls.from_stored(
+            order_id=stored_uuid(payload["order_id"]),
             order_description=payload.get("order_description", ""),
-            company_id=uuid.UUID(str(payload["company_id"])),
+            company_id=stored_uuid(payload["company_id"]),
             order_status=OrderStatus(payload.get("order_status", OrderStatus.PENDING.value)),
             order_complete_status=OrderCompleteStatus(payload.get("order_complete_status", OrderCompleteStatus.PENDING.value)),
             order_title=payload.get("order_title"),
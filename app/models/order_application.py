@@ -7,7 +7,7 @@ from typing import Optional
 
 from pydantic import Field
 
-from .base import TimestampedModel
+from .base import TimestampedModel, stored_uuid
 
 
 class ApplicationStatus(str, enum.Enum):
@@ -44,11 +44,11 @@ class OrderApplication(TimestampedModel):
             created = datetime.fromisoformat(created)
         if isinstance(updated, str):
             updated = datetime.fromisoformat(updated)
-        return cls(
-            id=uuid.UUID(str(payload["id"])),
-            order_id=uuid.UUID(str(payload["order_id"])),
-            freelancer_id=uuid.UUID(str(payload["freelancer_id"])),
-            company_id=uuid.UUID(str(payload["company_id"])),
+        return cls.from_stored(
+            id=stored_uuid(payload["id"]),
+            order_id=stored_uuid(payload["order_id"]),
+            freelancer_id=stored_uuid(payload["freelancer_id"]),
+            company_id=stored_uuid(payload["company_id"]),
             status=ApplicationStatus(payload.get("status", ApplicationStatus.PENDING.value)),
             specialization_index=payload.get("specialization_index"),
             specialization_name=payload.get("specialization_name"),
@@ -7,7 +7,7 @@ from typing import List, Optional
 
 from pydantic import ConfigDict, Field
 
-from .base import TimestampedModel
+from .base import TimestampedModel, stored_uuid
 
 
 class Role(str, enum.Enum):
@@ -59,8 +59,8 @@ class User(TimestampedModel):
         avatar_uploaded_at = payload.get("avatar_uploaded_at")
         if isinstance(avatar_uploaded_at, str):
             avatar_uploaded_at = datetime.fromisoformat(avatar_uploaded_at)
-        return cls(
-            user_id=uuid.UUID(str(payload["user_id"])),
+        return cls.from_stored(
+            user_id=stored_uuid(payload["user_id"]),
             name=payload.get("name"),
             surname=payload.get("surname"),
             phone_number=payload.get("phone_number"),
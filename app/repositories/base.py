@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+from dataclasses import replace
+from typing import Any, AsyncIterator, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
 
+from ..datastore.cache import EntityCache, QueryCache, get_entity_cache, get_query_cache
+from ..datastore.identity_map import current_identity_map
+from ..datastore.loader import get_document_loader
+from ..datastore.singleflight import query_key
 from ..datastore.firestore import (
     FirestoreStore,
     QueryOptions,
+    WriteBatch,
     ensure_timestamps,
     get_firestore_store,
 )
+from ..utils.pagination import decode_cursor, encode_cursor
 
 T = TypeVar("T")
 
@@ -21,9 +28,48 @@ class FirestoreRepository(Generic[T]):
         self,
         factory: Callable[[Dict[str, Any]], T],
         store: Optional[FirestoreStore] = None,
+        bulk_factory: Optional[Callable[[Dict[str, Any]], T]] = None,
     ):
         self._factory = factory
+        # builds the entities of queries and get_many, e.g. lazy entities
+        # that decode only the fields a list response reads
+        self._bulk_factory = bulk_factory or factory
         self._store = store or get_firestore_store()
+        # the shared cache only fronts the shared store
+        self._cache: Optional[EntityCache] = None if store else get_entity_cache(self.collection_name)
+        self._query_cache: Optional[QueryCache] = None if store else get_query_cache(self.collection_name)
+        # batches get_by_id calls made concurrently across the process
+        self._loader = get_document_loader(self._store, self.collection_name)
+
+    def _invalidate(self, doc_id: str) -> None:
+        """Forget a document whose new state is not known here."""
+        if self._cache is not None:
+            self._cache.invalidate(doc_id)
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.discard(self.collection_name, doc_id)
+
+    def _remember(self, doc_id: str, document: Optional[Dict[str, Any]]) -> None:
+        """Record a document just written (``None`` once deleted) for the rest of the request."""
+        if self._cache is not None:
+            self._cache.invalidate(doc_id)
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.put(self.collection_name, doc_id, document)
+
+    def _created(self, doc_id: str, document: Dict[str, Any]) -> None:
+        self._remember(doc_id, document)
+        if self._query_cache is not None:
+            self._query_cache.on_create(doc_id, document)
+
+    def _updated(self, doc_id: str, payload: Dict[str, Any], document: Optional[Dict[str, Any]] = None) -> None:
+        """``document`` is the new state when known; otherwise it is forgotten."""
+        if document is None:
+            self._invalidate(doc_id)
+        else:
+            self._remember(doc_id, document)
+        if self._query_cache is not None:
+            self._query_cache.on_update(doc_id, payload)
 
     async def create(self, payload: Dict[str, Any], entity_id: Optional[uuid.UUID] = None) -> T:
         doc_id = str(entity_id or uuid.uuid4())
@@ -31,6 +77,7 @@ class FirestoreRepository(Generic[T]):
         payload[self.id_field] = doc_id
         payload = await ensure_timestamps(payload, created=True)
         await self._store.set_document(self.collection_name, doc_id, payload)
+        self._created(doc_id, payload)
         return self._factory(payload)
 
     async def upsert(self, payload: Dict[str, Any], entity_id: uuid.UUID) -> T:
@@ -39,20 +86,77 @@ class FirestoreRepository(Generic[T]):
         payload[self.id_field] = doc_id
         payload = await ensure_timestamps(payload, created=False)
         await self._store.set_document(self.collection_name, doc_id, payload)
+        self._remember(doc_id, payload)
+        if self._query_cache is not None:
+            self._query_cache.on_replace(doc_id, payload)
         return self._factory(payload)
 
     async def get_by_id(self, entity_id: uuid.UUID) -> Optional[T]:
         doc_id = str(entity_id)
-        document = await self._store.get_document(self.collection_name, doc_id)
+        [document] = await self._get_documents([doc_id])
         if not document:
             return None
-        document.setdefault(self.id_field, doc_id)
         try:
             return self._factory(document)
         except (ValueError, TypeError) as e:
             print(f"WARNING: Invalid document with ID {doc_id}: {e}")
             return None
 
+    async def get_many(self, entity_ids: Iterable[uuid.UUID]) -> Tuple[List[T], List[uuid.UUID]]:
+        """Load several entities with one batched read.
+
+        Returns the entities that were found, in the order their IDs were given,
+        and the IDs that have no (valid) document.
+        """
+        entity_ids = list(entity_ids)
+        documents = await self._get_documents([str(entity_id) for entity_id in entity_ids])
+        found: List[T] = []
+        missing: List[uuid.UUID] = []
+        for entity_id, document in zip(entity_ids, documents):
+            if not document:
+                missing.append(entity_id)
+                continue
+            document.setdefault(self.id_field, str(entity_id))
+            try:
+                found.append(self._build_entity(document))
+            except (ValueError, TypeError) as e:
+                print(f"WARNING: Invalid document with ID {entity_id}: {e}")
+                missing.append(entity_id)
+        return found, missing
+
+    async def _get_documents(self, doc_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Read documents by id, consulting the request's identity map, then
+        the entity cache, and fetching only the rest (with one batched read)."""
+        identity_map = current_identity_map()
+        documents: Dict[str, Optional[Dict[str, Any]]] = {}
+        absent: List[str] = []
+        for doc_id in dict.fromkeys(doc_ids):
+            known, document = (False, None) if identity_map is None else identity_map.get(self.collection_name, doc_id)
+            if not known and self._cache is not None:
+                document = self._cache.get(doc_id)
+                known = document is not None
+            if known:
+                documents[doc_id] = document
+            else:
+                absent.append(doc_id)
+
+        if absent:
+            if len(absent) == 1:
+                fetched = [await self._loader.load(absent[0])]
+            else:
+                fetched = await self._store.get_documents(self.collection_name, absent)
+            for doc_id, document in zip(absent, fetched):
+                if document:
+                    document.setdefault(self.id_field, doc_id)
+                    if self._cache is not None:
+                        self._cache.put(doc_id, document)
+                else:
+                    document = None
+                documents[doc_id] = document
+                if identity_map is not None:
+                    identity_map.put(self.collection_name, doc_id, document)
+        return [documents[doc_id] for doc_id in doc_ids]
+
     async def query(
         self,
         filters: Iterable[tuple[str, str, Any]] = (),
@@ -61,27 +165,171 @@ class FirestoreRepository(Generic[T]):
         order_by: Optional[tuple[str, str]] = None,
     ) -> List[T]:
         options = QueryOptions(filters=filters, limit=limit, offset=offset, order_by=order_by)
-        documents = await self._store.query(self.collection_name, options)
+        documents = await self._cached_query(options)
+        return self._build_entities(documents)
+
+    async def _cached_query(self, options: QueryOptions) -> List[Dict[str, Any]]:
+        """Run ``options`` through the query result cache when it is enabled.
+
+        Cached documents are shared between callers and must not be mutated.
+        """
+        if self._query_cache is None:
+            return await self._store.query(self.collection_name, options)
+        options = replace(options, filters=list(options.filters))
+        return await self._query_cache.get_or_load(
+            query_key(self.collection_name, options),
+            options,
+            lambda: self._store.query(self.collection_name, options),
+            self._result_ids,
+        )
+
+    def _result_ids(self, documents: List[Dict[str, Any]]) -> Optional[List[str]]:
+        doc_ids = [document.get(self.id_field) for document in documents]
+        if any(doc_id is None for doc_id in doc_ids):
+            return None
+        return [str(doc_id) for doc_id in doc_ids]
+
+    async def stream(
+        self,
+        filters: Iterable[tuple[str, str, Any]] = (),
+        order_by: Optional[tuple[str, str]] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[T]:
+        """Yield every matching entity, fetching ``page_size`` documents at a
+        time so large collections are never held in memory at once."""
+        options = QueryOptions(filters=filters, order_by=order_by)
+        async for document in self._store.iter_query(self.collection_name, options, page_size):
+            for entity in self._build_entities([document]):
+                yield entity
+
+    async def query_page(
+        self,
+        filters: Iterable[tuple[str, str, Any]] = (),
+        limit: int = 100,
+        order_by: Optional[tuple[str, str]] = None,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+    ) -> Tuple[List[T], Optional[str]]:
+        """Return one page of entities and the cursor of the next page.
+
+        ``cursor`` is a token previously returned by this method; it resumes
+        right after the last document of that page, so deep pages cost the
+        same as the first one. ``next_cursor`` is ``None`` once a page comes
+        back short.
+        """
+        start_after = decode_cursor(cursor) if cursor else None
+        options = QueryOptions(
+            filters=filters,
+            limit=limit,
+            offset=offset,
+            order_by=order_by,
+            start_after=start_after,
+        )
+        documents = await self._cached_query(options)
+        next_cursor = None
+        if documents and len(documents) == limit and self.id_field in documents[-1]:
+            last = documents[-1]
+            value = last.get(order_by[0]) if order_by else None
+            next_cursor = encode_cursor(value, str(last[self.id_field]))
+        return self._build_entities(documents), next_cursor
+
+    async def query_fields(
+        self,
+        fields: Iterable[str],
+        filters: Iterable[tuple[str, str, Any]] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        order_by: Optional[tuple[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return only ``fields`` (plus the id field) of matching documents as
+        plain dicts, without building models."""
+        select = list(dict.fromkeys([self.id_field, *fields]))
+        options = QueryOptions(filters=filters, limit=limit, offset=offset, order_by=order_by, select=select)
+        return await self._store.query(self.collection_name, options)
+
+    async def exists(self, filters: Iterable[tuple[str, str, Any]] = ()) -> bool:
+        """Whether any document matches ``filters``; reads no document data."""
+        return await self._store.exists(self.collection_name, filters)
+
+    async def count(self, filters: Iterable[tuple[str, str, Any]] = ()) -> int:
+        if self._query_cache is None:
+            return await self._store.count(self.collection_name, filters)
+        options = QueryOptions(filters=list(filters))
+        return await self._query_cache.get_or_load(
+            ("count", query_key(self.collection_name, options)),
+            options,
+            lambda: self._store.count(self.collection_name, options.filters),
+            lambda _: None,
+        )
+
+    def _build_entity(self, document: Dict[str, Any]) -> T:
+        entity = self._bulk_factory(document)
+        # decoded now so a malformed id is skipped here like with eager models
+        getattr(entity, self.id_field)
+        return entity
+
+    def _build_entities(self, documents: Iterable[Dict[str, Any]]) -> List[T]:
         results: List[T] = []
         for document in documents:
             if self.id_field not in document:
                 continue
             try:
-                results.append(self._factory(document))
+                results.append(self._build_entity(document))
             except (ValueError, TypeError) as e:
                 print(f"WARNING: Skipping invalid document {document.get(self.id_field, 'UNKNOWN')}: {e}")
                 continue
         return results
 
-    async def update(self, entity_id: uuid.UUID, payload: Dict[str, Any]) -> Optional[T]:
+    async def update(
+        self,
+        entity_id: uuid.UUID,
+        payload: Dict[str, Any],
+        existing: Optional[T] = None,
+    ) -> Optional[T]:
+        """Apply ``payload`` and return the updated entity.
+
+        With ``existing`` (the entity as the caller already loaded it) the
+        result is merged locally and the update is a single round trip;
+        without it the document is re-read after the write.
+        """
         doc_id = str(entity_id)
         payload = await ensure_timestamps(payload, created=False)
-        document = await self._store.update_document(self.collection_name, doc_id, payload)
+        if existing is not None:
+            document = await self._store.update_document(
+                self.collection_name,
+                doc_id,
+                payload,
+                base=existing.to_firestore(),
+            )
+        else:
+            document = await self._store.update_document(self.collection_name, doc_id, payload, reread=True)
         if not document:
+            self._remember(doc_id, None)
             return None
         document.setdefault(self.id_field, doc_id)
+        self._updated(doc_id, payload, document)
         return self._factory(document)
 
+    async def update_fields(self, entity_id: uuid.UUID, payload: Dict[str, Any]) -> bool:
+        """Apply ``payload`` with one write and no reads; False if the entity does not exist."""
+        payload = await ensure_timestamps(payload, created=False)
+        result = await self._store.update_document(self.collection_name, str(entity_id), payload)
+        self._updated(str(entity_id), payload)
+        return result is not None
+
     async def delete(self, entity_id: uuid.UUID) -> None:
         doc_id = str(entity_id)
         await self._store.delete_document(self.collection_name, doc_id)
+        self._remember(doc_id, None)
+        if self._query_cache is not None:
+            self._query_cache.on_delete(doc_id)
+
+    def write_batch(self) -> WriteBatch:
+        return self._store.write_batch()
+
+    def stage_delete(self, batch: WriteBatch, entity_id: uuid.UUID) -> None:
+        """Queue the deletion of an entity on ``batch`` instead of deleting it now."""
+        self._invalidate(str(entity_id))
+        if self._query_cache is not None:
+            self._query_cache.on_delete(str(entity_id))
+        batch.delete(self.collection_name, str(entity_id))
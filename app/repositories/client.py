@@ -4,7 +4,9 @@ import uuid
 from typing import Optional
 
 from .base import FirestoreRepository
+from ..datastore.firestore import ArrayUnion
 from ..models.client import Client
+from ..models.lazy import lazy_factory
 
 
 class ClientRepository(FirestoreRepository[Client]):
@@ -12,16 +14,15 @@ class ClientRepository(FirestoreRepository[Client]):
     id_field = "client_id"
 
     def __init__(self):
-        super().__init__(Client.from_firestore)
+        super().__init__(Client.from_firestore, bulk_factory=lazy_factory(Client))
 
     async def get_by_user_id(self, user_id: uuid.UUID) -> Optional[Client]:
         clients = await self.query(filters=[("user_id", "==", str(user_id))], limit=1)
         return clients[0] if clients else None
 
-    async def add_company(self, client_id: uuid.UUID, company_id: uuid.UUID) -> Optional[Client]:
-        client = await self.get_by_id(client_id)
-        if not client:
-            return None
-        company_ids = list({*client.company_ids, company_id})
-        await self.update(client_id, {"company_ids": [str(cid) for cid in company_ids]})
-        return await self.get_by_id(client_id)
+    async def has_profile(self, user_id: uuid.UUID) -> bool:
+        return await self.exists(filters=[("user_id", "==", str(user_id))])
+
+    async def add_company(self, client_id: uuid.UUID, company_id: uuid.UUID) -> bool:
+        """Add a company with one array-union write; False if the client does not exist."""
+        return await self.update_fields(client_id, {"company_ids": ArrayUnion([str(company_id)])})
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import hashlib
 import uuid
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .base import FirestoreRepository
+from ..datastore.firestore import MAX_BATCH_WRITES, ArrayRemove, ArrayUnion, QueryOptions
 from ..models.company import Company
+from ..models.lazy import lazy_factory
+
+# normalized company name -> ids of the companies using it. Names may
+# repeat, so this is an index of every company with a name, not a
+# uniqueness constraint; an entry left with no ids is kept (see _unregister_name)
+COMPANY_NAMES_COLLECTION = "company_names"
+# progress of resumable data migrations, one document per backfill
+MIGRATIONS_COLLECTION = "migrations"
 
 
 class CompanyRepository(FirestoreRepository[Company]):
@@ -12,7 +22,7 @@ class CompanyRepository(FirestoreRepository[Company]):
     id_field = "company_id"
 
     def __init__(self):
-        super().__init__(Company.from_firestore)
+        super().__init__(Company.from_firestore, bulk_factory=lazy_factory(Company))
 
     @staticmethod
     def normalize_name(company_name: Optional[str]) -> Optional[str]:
@@ -20,10 +30,40 @@ class CompanyRepository(FirestoreRepository[Company]):
             return None
         return company_name.strip().lower()
 
+    @staticmethod
+    def _name_key(normalized_name: str) -> str:
+        # names may contain "/" or be longer than a document id allows
+        return hashlib.sha256(normalized_name.encode("utf-8")).hexdigest()
+
+    def _stage_name(self, batch, normalized_name: str, company_ids, transform=ArrayUnion) -> None:
+        # array transforms in a merge write, so concurrent writers of the
+        # same name never overwrite each other's ids
+        batch.merge(
+            COMPANY_NAMES_COLLECTION,
+            self._name_key(normalized_name),
+            {"normalized_company_name": normalized_name, "company_ids": transform(list(company_ids))},
+        )
+
+    async def _register_name(self, normalized_name: str, company_id: str) -> None:
+        batch = self.write_batch()
+        self._stage_name(batch, normalized_name, [company_id])
+        await batch.commit()
+
+    async def _unregister_name(self, normalized_name: str, company_id: str) -> None:
+        # the entry is not deleted once empty: that would race with a
+        # concurrent _register_name of the same name
+        batch = self.write_batch()
+        self._stage_name(batch, normalized_name, [company_id], transform=ArrayRemove)
+        await batch.commit()
+
     async def create(self, payload: dict, entity_id: Optional[uuid.UUID] = None) -> Company:
+        entity_id = entity_id or uuid.uuid4()
         normalized = self.normalize_name(payload.get("company_name"))
         if normalized:
             payload["normalized_company_name"] = normalized
+            # registered first: an id whose company was never written is
+            # skipped by the lookup, a company missing from the registry is not
+            await self._register_name(normalized, str(entity_id))
 
         owner_ids = payload.get("owner_ids") or []
         owner_ids = [str(owner_id) for owner_id in owner_ids if owner_id]  # Filter out None/empty values
@@ -36,10 +76,25 @@ class CompanyRepository(FirestoreRepository[Company]):
 
         return await super().create(payload, entity_id=entity_id)
 
-    async def update(self, entity_id: uuid.UUID, payload: dict) -> Optional[Company]:
+    async def update(
+        self,
+        entity_id: uuid.UUID,
+        payload: dict,
+        existing: Optional[Company] = None,
+    ) -> Optional[Company]:
         if "company_name" in payload:
             normalized = self.normalize_name(payload.get("company_name"))
             payload["normalized_company_name"] = normalized
+            if existing is None:
+                existing = await self.get_by_id(entity_id)
+                if existing is None:
+                    return None
+            previous = self.normalize_name(existing.company_name)
+            if normalized != previous:
+                if normalized:
+                    await self._register_name(normalized, str(entity_id))
+                if previous:
+                    await self._unregister_name(previous, str(entity_id))
 
         if "owner_ids" in payload:
             unique_owner_ids: List[str] = []
@@ -48,49 +103,164 @@ class CompanyRepository(FirestoreRepository[Company]):
                     owner_id_str = str(owner_id)
                     if owner_id_str not in unique_owner_ids:
                         unique_owner_ids.append(owner_id_str)
-            existing = await self.get_by_id(entity_id)
+            if existing is None:
+                existing = await self.get_by_id(entity_id)
             if existing:
                 primary_owner = str(existing.client_id)
                 if primary_owner not in unique_owner_ids:
                     unique_owner_ids.append(primary_owner)
             payload["owner_ids"] = unique_owner_ids
 
-        return await super().update(entity_id, payload)
+        return await super().update(entity_id, payload, existing=existing)
+
+    async def delete(self, entity_id: uuid.UUID, existing: Optional[Company] = None) -> None:
+        """Delete a company and drop it from the name registry; pass
+        ``existing`` when already loaded to save reading it again."""
+        if existing is None:
+            existing = await self.get_by_id(entity_id)
+        await super().delete(entity_id)
+        if existing is not None:
+            await self.unregister_names([existing])
+
+    async def unregister_names(self, companies: Iterable[Company]) -> None:
+        """Drop deleted ``companies`` from the name registry.
+
+        Called after the companies are deleted; should that fail, the lookup
+        still skips their ids.
+        """
+        batch = self.write_batch()
+        for company in companies:
+            normalized = self.normalize_name(company.company_name)
+            if normalized:
+                self._stage_name(batch, normalized, [str(company.company_id)], transform=ArrayRemove)
+        await batch.commit()
 
     async def get_by_client_id(self, client_id: uuid.UUID) -> List[Company]:
-        all_companies = await self.query()
-        results: List[Company] = []
-        for company in all_companies:
-            if client_id in company.owner_ids or company.client_id == client_id:
-                results.append(company)
-        return results
+        # owner_ids always contains the primary client_id (see create/update
+        # and backfill_owner_ids), so one array_contains query covers both
+        return await self.query(filters=[("owner_ids", "array_contains", str(client_id))])
+
+    async def backfill_owner_ids(self, page_size: Optional[int] = None) -> int:
+        """One-off migration for companies written before owner_ids existed.
+
+        Gives every document an ``owner_ids`` array that includes its
+        ``client_id``, so ``get_by_client_id`` finds it by index. Returns the
+        number of documents updated; running it again updates none.
+        """
+        options = QueryOptions(select=[self.id_field, "client_id", "owner_ids"])
+        batch = self.write_batch()
+        staged: List[Tuple[str, dict]] = []
+        updated = 0
+
+        async def _commit() -> None:
+            await batch.commit()
+            for company_id, payload in staged:
+                self._updated(company_id, payload)
+            staged.clear()
+
+        async for document in self._store.iter_query(self.collection_name, options, page_size):
+            company_id = document.get(self.id_field)
+            stored = document.get("owner_ids")
+            owner_ids = [str(owner_id) for owner_id in stored or [] if owner_id]
+            client_id = document.get("client_id")
+            if client_id and str(client_id) not in owner_ids:
+                owner_ids.append(str(client_id))
+            if not company_id or owner_ids == stored:
+                continue
+            payload = {"owner_ids": owner_ids}
+            batch.update(self.collection_name, str(company_id), payload)
+            staged.append((str(company_id), payload))
+            updated += 1
+            if len(batch) >= MAX_BATCH_WRITES:
+                await _commit()
+        await _commit()
+        return updated
 
     async def get_by_normalized_name(self, normalized_name: str) -> Optional[Company]:
-        candidates = await self.query(filters=[("normalized_company_name", "==", normalized_name)], limit=1)
-        if candidates:
-            return candidates[0]
-        # fallback for legacy records without normalized field
-        all_companies = await self.query()
-        for company in all_companies:
+        """First company registered under ``normalized_name``: a point read of
+        the registry plus one batched read of the companies it lists.
+
+        Companies written before the registry existed are found only after
+        ``backfill_normalized_names`` has run.
+        """
+        registry = await self._store.get_document(COMPANY_NAMES_COLLECTION, self._name_key(normalized_name))
+        if not registry:
+            return None
+        company_ids = []
+        for company_id in registry.get("company_ids") or []:
+            try:
+                company_ids.append(uuid.UUID(company_id))
+            except (TypeError, ValueError, AttributeError):
+                continue  # malformed entry: skipped like the ids of deleted companies
+        companies, _ = await self.get_many(company_ids)
+        for company in companies:
+            # skips companies renamed or deleted since they were registered
             if self.normalize_name(company.company_name) == normalized_name:
                 return company
         return None
 
-    async def add_owner(self, company_id: uuid.UUID, owner_id: uuid.UUID) -> Optional[Company]:
-        company = await self.get_by_id(company_id)
-        if not company:
-            return None
-        if owner_id in company.owner_ids:
-            return company
-        updated_owner_ids = [str(oid) for oid in {*company.owner_ids, owner_id}]
-        return await self.update(company_id, {"owner_ids": updated_owner_ids})
-
-    async def add_order(self, company_id: uuid.UUID, order_id: uuid.UUID) -> Company:
-        company = await self.get_by_id(company_id)
-        orders = list({*company.company_orders, order_id}) if company else [order_id]
-        payload = {"company_orders": [str(oid) for oid in orders]}
-        updated = await self.update(company_id, payload)
-        if updated:
-            return updated
-        # If company did not previously exist in cache, fetch again after update
-        return await self.get_by_id(company_id)
+    async def backfill_normalized_names(self, page_size: int = 200, max_pages: Optional[int] = None) -> int:
+        """Resumable migration that writes ``normalized_company_name`` on legacy
+        companies and registers every company name.
+
+        Companies are processed in document id order, one page per batch.
+        Each batch also records the last id done in ``migrations``, so an
+        interrupted run (or one stopped by ``max_pages``) continues where it
+        left off. Returns the number of companies processed in this run.
+        """
+        checkpoint_id = "company-normalized-names"
+        checkpoint = await self._store.get_document(MIGRATIONS_COLLECTION, checkpoint_id) or {}
+        if checkpoint.get("completed"):
+            return 0
+        last_id = checkpoint.get("last_id")
+        processed = pages = 0
+        while max_pages is None or pages < max_pages:
+            options = QueryOptions(
+                limit=page_size,
+                start_after=(None, last_id) if last_id else None,
+                select=[self.id_field, "company_name", "normalized_company_name"],
+            )
+            documents = await self._store.query(self.collection_name, options)
+            documents = [document for document in documents if document.get(self.id_field)]
+            if not documents:
+                await self._store.set_document(
+                    MIGRATIONS_COLLECTION, checkpoint_id, {"last_id": last_id, "completed": True}
+                )
+                break
+
+            names: Dict[str, List[str]] = {}
+            batch = self.write_batch()
+            staged: List[Tuple[str, dict]] = []
+            for document in documents:
+                company_id = str(document[self.id_field])
+                normalized = self.normalize_name(document.get("company_name"))
+                if not normalized:
+                    continue
+                names.setdefault(normalized, []).append(company_id)
+                if document.get("normalized_company_name") != normalized:
+                    payload = {"normalized_company_name": normalized}
+                    batch.update(self.collection_name, company_id, payload)
+                    staged.append((company_id, payload))
+
+            for normalized, company_ids in names.items():
+                self._stage_name(batch, normalized, company_ids)
+
+            last_id = str(documents[-1][self.id_field])
+            done = len(documents) < page_size
+            batch.set(MIGRATIONS_COLLECTION, checkpoint_id, {"last_id": last_id, "completed": done})
+            await batch.commit()
+            for company_id, payload in staged:
+                self._updated(company_id, payload)
+            processed += len(documents)
+            pages += 1
+            if done:
+                break
+        return processed
+
+    async def add_owner(self, company_id: uuid.UUID, owner_id: uuid.UUID) -> bool:
+        """Add an owner with one array-union write; False if the company does not exist."""
+        return await self.update_fields(company_id, {"owner_ids": ArrayUnion([str(owner_id)])})
+
+    async def add_order(self, company_id: uuid.UUID, order_id: uuid.UUID) -> bool:
+        """Add an order with one array-union write; False if the company does not exist."""
+        return await self.update_fields(company_id, {"company_orders": ArrayUnion([str(order_id)])})
@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import uuid
 
 from .base import FirestoreRepository
 from ..models.freelancer import Freelancer, FreelancerStatus
+from ..models.lazy import lazy_factory
 
 
 class FreelancerRepository(FirestoreRepository[Freelancer]):
@@ -11,7 +12,7 @@ class FreelancerRepository(FirestoreRepository[Freelancer]):
     id_field = "freelancer_id"
 
     def __init__(self):
-        super().__init__(Freelancer.from_firestore)
+        super().__init__(Freelancer.from_firestore, bulk_factory=lazy_factory(Freelancer))
 
     async def get_by_user_id(self, user_id: uuid.UUID) -> Optional[Freelancer]:
         freelancers = await self.query(filters=[("user_id", "==", str(user_id))], limit=1)
@@ -21,23 +22,53 @@ class FreelancerRepository(FirestoreRepository[Freelancer]):
         freelancers = await self.query(filters=[("email", "==", email)], limit=1)
         return freelancers[0] if freelancers else None
 
+    async def has_profile(self, user_id: uuid.UUID) -> bool:
+        return await self.exists(filters=[("user_id", "==", str(user_id))])
+
+    async def is_email_registered(self, email: str) -> bool:
+        return await self.exists(filters=[("email", "==", email)])
+
     async def get_pending_freelancers(self, skip: int = 0, limit: int = 100) -> List[Freelancer]:
-        return await self.query(
+        freelancers, _ = await self.get_pending_freelancers_page(limit, skip=skip)
+        return freelancers
+
+    async def get_pending_freelancers_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[Freelancer], Optional[str]]:
+        return await self.query_page(
             filters=[("status", "==", FreelancerStatus.PENDING.value)],
             limit=limit,
+            cursor=cursor,
             offset=skip,
         )
 
     async def get_approved_freelancers(self, skip: int = 0, limit: int = 100) -> List[Freelancer]:
-        return await self.query(
+        freelancers, _ = await self.get_approved_freelancers_page(limit, skip=skip)
+        return freelancers
+
+    async def get_approved_freelancers_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[Freelancer], Optional[str]]:
+        return await self.query_page(
             filters=[("status", "==", FreelancerStatus.APPROVED.value)],
             limit=limit,
+            cursor=cursor,
             offset=skip,
         )
 
     async def count_by_status(self, status: FreelancerStatus) -> int:
-        freelancers = await self.query(filters=[("status", "==", status.value)])
-        return len(freelancers)
+        return await self.count(filters=[("status", "==", status.value)])
 
-    async def update_status(self, freelancer_id: uuid.UUID, status: FreelancerStatus) -> Optional[Freelancer]:
-        return await self.update(freelancer_id, {"status": status.value})
+    async def update_status(
+        self,
+        freelancer_id: uuid.UUID,
+        status: FreelancerStatus,
+        existing: Optional[Freelancer] = None,
+    ) -> Optional[Freelancer]:
+        return await self.update(freelancer_id, {"status": status.value}, existing=existing)
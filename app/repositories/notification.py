@@ -1,8 +1,9 @@
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from .base import FirestoreRepository
 from ..models.notification import Notification, NotificationStatus, NotificationType
+from ..models.lazy import lazy_factory
 
 
 class NotificationRepository(FirestoreRepository[Notification]):
@@ -10,7 +11,7 @@ class NotificationRepository(FirestoreRepository[Notification]):
     id_field = "notification_id"
 
     def __init__(self):
-        super().__init__(Notification.from_firestore)
+        super().__init__(Notification.from_firestore, bulk_factory=lazy_factory(Notification))
 
     async def get_admin_notifications(
         self, 
@@ -19,17 +20,36 @@ class NotificationRepository(FirestoreRepository[Notification]):
         limit: int = 100
     ) -> List[Notification]:
         """Get notifications for admin with optional status filter"""
+        notifications, _ = await self.get_admin_notifications_page(status, limit, skip=skip)
+        return notifications
+
+    async def get_admin_notifications_page(
+        self,
+        status: Optional[NotificationStatus] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[Notification], Optional[str]]:
+        """Get one page of admin notifications, newest first, plus the next cursor"""
         filters = []
         if status:
             filters.append(("status", "==", status.value))
-        
-        return await self.query(
+
+        return await self.query_page(
             filters=filters,
             limit=limit,
-            offset=skip,
             order_by=("created_at", "desc"),
+            cursor=cursor,
+            offset=skip,
         )
 
+    async def count_admin_notifications(self, status: Optional[NotificationStatus] = None) -> int:
+        """Count notifications shown to admins, optionally by status"""
+        filters = []
+        if status:
+            filters.append(("status", "==", status.value))
+        return await self.count(filters=filters)
+
     async def get_by_user_id(self, user_id: uuid.UUID, skip: int = 0, limit: int = 100) -> List[Notification]:
         """Get notifications for a specific user"""
         return await self.query(
@@ -69,21 +89,18 @@ class NotificationRepository(FirestoreRepository[Notification]):
 
     async def count_pending_by_type(self, notification_type: NotificationType) -> int:
         """Count pending notifications by type"""
-        notifications = await self.query(
+        return await self.count(
             filters=[
                 ("type", "==", notification_type.value),
                 ("status", "==", NotificationStatus.PENDING.value)
             ]
         )
-        return len(notifications)
 
-    async def get_pending_help_request_by_user(self, user_id: uuid.UUID) -> Optional[Notification]:
-        notifications = await self.query(
+    async def has_pending_help_request(self, user_id: uuid.UUID) -> bool:
+        return await self.exists(
             filters=[
                 ("user_id", "==", str(user_id)),
                 ("type", "==", NotificationType.HELP_REQUEST.value),
                 ("status", "==", NotificationStatus.PENDING.value),
-            ],
-            limit=1,
+            ]
         )
-        return notifications[0] if notifications else None
@@ -1,9 +1,10 @@
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from .base import FirestoreRepository
 from ..datastore.firestore import ensure_timestamps
 from ..models.order import Order, OrderCompleteStatus, OrderStatus
+from ..models.lazy import lazy_factory
 
 
 class OrderRepository(FirestoreRepository[Order]):
@@ -11,23 +12,43 @@ class OrderRepository(FirestoreRepository[Order]):
     id_field = "order_id"
 
     def __init__(self):
-        super().__init__(Order.from_firestore)
+        super().__init__(Order.from_firestore, bulk_factory=lazy_factory(Order))
 
     async def get_by_id_with_company(self, order_id: uuid.UUID) -> Optional[Order]:
         # Relationships are resolved in services; return order data only
         return await self.get_by_id(order_id)
 
     async def get_approved_orders(self, skip: int = 0, limit: int = 100) -> List[Order]:
-        return await self.query(
+        orders, _ = await self.get_approved_orders_page(limit, skip=skip)
+        return orders
+
+    async def get_approved_orders_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[Order], Optional[str]]:
+        return await self.query_page(
             filters=[("order_status", "==", OrderStatus.APPROVED.value)],
             limit=limit,
+            cursor=cursor,
             offset=skip,
         )
 
     async def get_pending_orders(self, skip: int = 0, limit: int = 100) -> List[Order]:
-        return await self.query(
+        orders, _ = await self.get_pending_orders_page(limit, skip=skip)
+        return orders
+
+    async def get_pending_orders_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[Order], Optional[str]]:
+        return await self.query_page(
             filters=[("order_status", "==", OrderStatus.PENDING.value)],
             limit=limit,
+            cursor=cursor,
             offset=skip,
         )
 
@@ -39,8 +60,7 @@ class OrderRepository(FirestoreRepository[Order]):
         )
 
     async def count_by_status(self, status: OrderStatus) -> int:
-        orders = await self.query(filters=[("order_status", "==", status.value)])
-        return len(orders)
+        return await self.count(filters=[("order_status", "==", status.value)])
 
     async def update_status(
         self,
@@ -65,4 +85,5 @@ class OrderRepository(FirestoreRepository[Order]):
         data = order.to_firestore()
         data = await ensure_timestamps(data, created=True)
         await self._store.set_document(self.collection_name, str(order_id), data)
+        self._created(str(order_id), data)
         return order
@@ -4,7 +4,9 @@ import uuid
 from typing import List, Optional
 
 from .base import FirestoreRepository
+from ..datastore.firestore import ArrayUnion
 from ..models.user import User
+from ..models.lazy import lazy_factory
 
 
 class UserRepository(FirestoreRepository[User]):
@@ -12,7 +14,7 @@ class UserRepository(FirestoreRepository[User]):
     id_field = "user_id"
 
     def __init__(self):
-        super().__init__(User.from_firestore)
+        super().__init__(User.from_firestore, bulk_factory=lazy_factory(User))
 
     async def get_by_phone(self, phone_number: str) -> Optional[User]:
         users = await self.query(filters=[("phone_number", "==", phone_number)], limit=1)
@@ -32,14 +34,8 @@ class UserRepository(FirestoreRepository[User]):
         return await self.create(payload, user_id)
 
     async def add_role(self, user_id: uuid.UUID, role: str) -> bool:
-        user = await self.get_by_id(user_id)
-        if not user:
-            return False
-        if role in user.roles:
-            return False
-        updated_roles = list(dict.fromkeys(user.roles + [role]))
-        await self.update(user_id, {"roles": updated_roles})
-        return True
+        """Add a role with one array-union write; False if the user does not exist."""
+        return await self.update_fields(user_id, {"roles": ArrayUnion([role])})
 
     async def get_user_roles(self, user_id: uuid.UUID) -> List[str]:
         user = await self.get_by_id(user_id)
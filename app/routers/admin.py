@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from typing import List, Optional
 
@@ -6,13 +7,15 @@ from fastapi import APIRouter, Depends, Path, Query
 from ..deps.auth import require_admin
 from ..models.user import User
 from ..models.notification import NotificationStatus
+from ..models.order import OrderStatus
 from ..schemas.common import APIResponse, PaginatedResponse
-from ..schemas.freelancer import FreelancerApproval
+from ..schemas.freelancer import FreelancerApproval, FreelancerStatus
 from ..schemas.order import OrderStatusUpdate, OrderUpdate
 from ..schemas.notification import NotificationResponse, NotificationUpdate
 from ..services.freelancer import FreelancerService
 from ..services.order import OrderService
 from ..services.notification import NotificationService
+from ..utils.errors import error_response
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -49,7 +52,7 @@ async def get_admin_notifications(
 
         return APIResponse(success=True, data=notifications)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/notifications/summary", response_model=APIResponse)
@@ -79,7 +82,7 @@ async def get_admin_notifications_summary(
         
         return APIResponse(success=True, data=notifications)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/help-requests", response_model=APIResponse)
@@ -87,25 +90,30 @@ async def get_help_requests(
     status: Optional[NotificationStatus] = Query(None, description="Filter by notification status"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
     current_user: User = Depends(require_admin()),
 ):
     """Get help request notifications with optional status filter"""
     try:
         notification_service = NotificationService()
-        skip = (page - 1) * size
-        notifications = await notification_service.get_admin_notifications(status, skip, size)
+        skip = 0 if cursor else (page - 1) * size
+        (notifications, next_cursor), total = await asyncio.gather(
+            notification_service.get_admin_notifications_page(status, size, cursor, skip),
+            notification_service.count_admin_notifications(status),
+        )
 
         paginated_response = PaginatedResponse(
             items=notifications,
-            total=len(notifications),
+            total=total,
             page=page,
             size=size,
-            pages=(len(notifications) + size - 1) // size
+            pages=(total + size - 1) // size,
+            next_cursor=next_cursor,
         )
 
         return APIResponse(success=True, data=paginated_response)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.put("/help-requests/{notification_id}", response_model=APIResponse)
@@ -120,7 +128,7 @@ async def update_help_request(
         notification = await notification_service.update_notification(notification_id, update_data)
         return APIResponse(success=True, data=notification)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.post("/help-requests/{notification_id}/read", response_model=APIResponse)
@@ -134,7 +142,7 @@ async def mark_help_request_as_read(
         notification = await notification_service.mark_as_read(notification_id)
         return APIResponse(success=True, data=notification)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.post("/help-requests/{notification_id}/resolve", response_model=APIResponse)
@@ -149,30 +157,35 @@ async def resolve_help_request(
         notification = await notification_service.mark_as_resolved(notification_id, admin_notes)
         return APIResponse(success=True, data=notification)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/freelancers/pending", response_model=APIResponse)
 async def get_pending_freelancers(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
     current_user: User = Depends(require_admin()),
 ):
     try:
         freelancer_service = FreelancerService()
-        skip = (page - 1) * size
-        freelancers = await freelancer_service.get_pending_freelancers(skip, size)
+        skip = 0 if cursor else (page - 1) * size
+        (freelancers, next_cursor), total = await asyncio.gather(
+            freelancer_service.get_pending_freelancers_page(size, cursor, skip),
+            freelancer_service.count_freelancers(FreelancerStatus.PENDING),
+        )
         
         paginated_response = PaginatedResponse(
             items=freelancers,
-            total=len(freelancers),
+            total=total,
             page=page,
             size=size,
-            pages=(len(freelancers) + size - 1) // size
+            pages=(total + size - 1) // size,
+            next_cursor=next_cursor,
         )
         return APIResponse(success=True, data=paginated_response)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.put("/freelancers/{freelancer_id}/approve", response_model=APIResponse)
@@ -186,7 +199,7 @@ async def approve_freelancer(
         freelancer = await freelancer_service.approve_freelancer(freelancer_id, approval)
         return APIResponse(success=True, data=freelancer)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/freelancers/{freelancer_id}/resume", response_model=APIResponse)
@@ -200,30 +213,35 @@ async def get_freelancer_resume_download_url(
         resume = await freelancer_service.get_resume_download_url_for_freelancer(freelancer_id)
         return APIResponse(success=True, data=resume)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/orders/pending", response_model=APIResponse)
 async def get_pending_orders(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
     current_user: User = Depends(require_admin()),
 ):
     try:
         order_service = OrderService()
-        skip = (page - 1) * size
-        orders = await order_service.get_pending_orders_for_admin(skip, size)
+        skip = 0 if cursor else (page - 1) * size
+        (orders, next_cursor), total = await asyncio.gather(
+            order_service.get_pending_orders_for_admin_page(size, cursor, skip),
+            order_service.count_orders(OrderStatus.PENDING),
+        )
         
         paginated_response = PaginatedResponse(
             items=orders,
-            total=len(orders),
+            total=total,
             page=page,
             size=size,
-            pages=(len(orders) + size - 1) // size
+            pages=(total + size - 1) // size,
+            next_cursor=next_cursor,
         )
         return APIResponse(success=True, data=paginated_response)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.post("/orders/{order_id}/complete", response_model=APIResponse)
@@ -237,7 +255,7 @@ async def complete_order(
         order = await order_service.complete_order(order_id, order_update)
         return APIResponse(success=True, data=order)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.put("/orders/{order_id}/status", response_model=APIResponse)
@@ -251,4 +269,4 @@ async def update_order_status(
         order = await order_service.update_order_status(order_id, status_update)
         return APIResponse(success=True, data=order)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
@@ -8,6 +8,7 @@ from ..schemas.common import APIResponse
 from ..services.auth import AuthService
 from ..services.user import UserService
 from ..exceptions.base import BadRequestException
+from ..utils.errors import reraise_backpressure
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -27,6 +28,7 @@ async def request_otp(
         logger.warning("Bad request in OTP", error=str(e))
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        reraise_backpressure(e)
         logger.error("Unexpected error in OTP request", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -45,6 +47,7 @@ async def verify_otp(
         logger.warning("Bad request in OTP verification", error=str(e))
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        reraise_backpressure(e)
         logger.error("Unexpected error in OTP verification", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -63,6 +66,7 @@ async def refresh_tokens(
         logger.warning("Bad request in token refresh", error=str(e))
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        reraise_backpressure(e)
         logger.error("Unexpected error in token refresh", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -83,5 +87,6 @@ async def select_role(
             logger.warning("Role already exists")
             return APIResponse(success=False, error="Role already exists")
     except Exception as e:
+        reraise_backpressure(e)
         logger.error("Unexpected error in role selection", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -7,6 +7,7 @@ from ..models.user import User
 from ..schemas.client import ClientCreate, ClientUpdate
 from ..schemas.common import APIResponse
 from ..services.client import ClientService
+from ..utils.errors import error_response
 
 router = APIRouter(prefix="/clients", tags=["Clients"])
 
@@ -21,7 +22,7 @@ async def create_client_profile(
         client = await client_service.create_client_profile(current_user.user_id, client_data)
         return APIResponse(success=True, data=client)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/profile", response_model=APIResponse)
@@ -33,7 +34,7 @@ async def get_my_client_profile(
         client = await client_service.get_client_by_user_id(current_user.user_id)
         return APIResponse(success=True, data=client)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.put("/profile", response_model=APIResponse)
@@ -47,7 +48,7 @@ async def update_client_profile(
         updated_client = await client_service.update_client(client.client_id, client_update)
         return APIResponse(success=True, data=updated_client)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/{client_id}", response_model=APIResponse)
@@ -61,4 +62,4 @@ async def get_client_by_id(
         client = await client_service.get_client_by_id(client_id)
         return APIResponse(success=True, data=client)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
@@ -8,6 +8,7 @@ from ..schemas.company import CompanyCreate, CompanyUpdate
 from ..schemas.common import APIResponse
 from ..deps.auth import get_current_user, require_client
 from ..models.user import User
+from ..utils.errors import error_response
 
 router = APIRouter(prefix="/companies", tags=["Companies"])
 
@@ -29,7 +30,7 @@ async def get_all_companies(
         companies = await company_service.get_all_companies()
         return APIResponse(success=True, data=companies)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.post("/", response_model=APIResponse)
@@ -44,7 +45,7 @@ async def create_company(
         company = await company_service.create_company(client.client_id, company_data)
         return APIResponse(success=True, data=company)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/my", response_model=APIResponse)
@@ -58,7 +59,7 @@ async def get_my_companies(
         companies = await company_service.get_companies_by_client(client.client_id)
         return APIResponse(success=True, data=companies)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/id/{company_id}", response_model=APIResponse)
@@ -71,7 +72,7 @@ async def get_company(
         company = await company_service.get_company(company_id)
         return APIResponse(success=True, data=company)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/{client_id}", response_model=APIResponse)
@@ -84,7 +85,7 @@ async def get_companies_for_client(
         companies = await company_service.get_companies_by_client(client_id)
         return APIResponse(success=True, data=companies)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.put("/id/{company_id}", response_model=APIResponse)
@@ -98,4 +99,4 @@ async def update_company(
         updated_company = await company_service.update_company(company_id, company_update)
         return APIResponse(success=True, data=updated_company)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
@@ -1,5 +1,6 @@
+import asyncio
 import uuid
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, Path, Query, UploadFile
 from pydantic import ValidationError
@@ -7,9 +8,10 @@ from pydantic import ValidationError
 from ..deps.auth import get_current_user, require_freelancer
 from ..models.user import User
 from ..schemas.common import APIResponse, PaginatedResponse
-from ..schemas.freelancer import FreelancerCreate, FreelancerUpdate
+from ..schemas.freelancer import FreelancerCreate, FreelancerStatus, FreelancerUpdate
 from ..services.freelancer import FreelancerService
 from ..exceptions import NotFoundException
+from ..utils.errors import error_response
 
 router = APIRouter(prefix="/freelancers", tags=["Freelancers"])
 
@@ -24,7 +26,7 @@ async def create_freelancer_profile(
         freelancer = await freelancer_service.create_freelancer_profile(current_user.user_id, freelancer_data)
         return APIResponse(success=True, data=freelancer)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/profile", response_model=APIResponse)
@@ -36,7 +38,7 @@ async def get_my_freelancer_profile(
         freelancer = await freelancer_service.get_freelancer_by_user_id(current_user.user_id)
         return APIResponse(success=True, data=freelancer)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.put("/profile", response_model=APIResponse)
@@ -79,7 +81,7 @@ async def update_freelancer_profile(
     except HTTPException:
         raise
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.post("/profile/resume", response_model=APIResponse)
@@ -99,7 +101,7 @@ async def upload_freelancer_resume(
         )
         return APIResponse(success=True, data=resume)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/profile/resume", response_model=APIResponse)
@@ -112,7 +114,7 @@ async def get_my_freelancer_resume_download_url(
         resume = await freelancer_service.get_resume_download_url_for_user(current_user.user_id)
         return APIResponse(success=True, data=resume)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.delete("/profile/resume", response_model=APIResponse)
@@ -125,29 +127,34 @@ async def delete_freelancer_resume(
         await freelancer_service.delete_resume(current_user.user_id)
         return APIResponse(success=True, data={"deleted": True})
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/", response_model=APIResponse)
 async def get_approved_freelancers(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
 ):
     try:
         freelancer_service = FreelancerService()
-        skip = (page - 1) * size
-        freelancers = await freelancer_service.get_approved_freelancers(skip, size)
+        skip = 0 if cursor else (page - 1) * size
+        (freelancers, next_cursor), total = await asyncio.gather(
+            freelancer_service.get_approved_freelancers_page(size, cursor, skip),
+            freelancer_service.count_freelancers(FreelancerStatus.APPROVED),
+        )
         
         paginated_response = PaginatedResponse(
             items=freelancers,
-            total=len(freelancers),
+            total=total,
             page=page,
             size=size,
-            pages=(len(freelancers) + size - 1) // size
+            pages=(total + size - 1) // size,
+            next_cursor=next_cursor,
         )
         return APIResponse(success=True, data=paginated_response)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/{freelancer_id}", response_model=APIResponse)
@@ -161,4 +168,4 @@ async def get_freelancer_by_id(
         freelancer = await freelancer_service.get_freelancer_by_id(freelancer_id)
         return APIResponse(success=True, data=freelancer)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
@@ -6,6 +6,7 @@ from ..schemas.common import APIResponse
 from ..schemas.order import AdminHelpRequest
 from ..schemas.notification import NotificationResponse
 from ..services.admin_help import AdminHelpService
+from ..utils.errors import error_response
 
 router = APIRouter(tags=["Admin Help"])
 
@@ -21,4 +22,4 @@ async def request_admin_help(
         notification = await help_service.create_help_request(current_user.user_id, help_request)
         return APIResponse(success=True, data=notification)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
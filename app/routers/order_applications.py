@@ -9,6 +9,7 @@ from ..schemas.common import APIResponse
 from ..schemas.order_application import OrderApplicationCreate, OrderApplicationUpdate
 from ..services.freelancer import FreelancerService
 from ..services.order_application import OrderApplicationService
+from ..utils.errors import error_response
 
 router = APIRouter(prefix="/applications", tags=["Order Applications"])
 
@@ -25,7 +26,7 @@ async def create_application(
         application = await application_service.create_application(freelancer.freelancer_id, application_data)
         return APIResponse(success=True, data=application)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/my", response_model=APIResponse)
@@ -39,7 +40,7 @@ async def get_my_applications(
         applications = await application_service.get_applications_by_freelancer(freelancer.freelancer_id)
         return APIResponse(success=True, data=applications)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/order/{order_id}", response_model=APIResponse)
@@ -52,7 +53,7 @@ async def get_order_applications(
         applications = await application_service.get_applications_by_order(order_id)
         return APIResponse(success=True, data=applications)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.put("/{application_id}", response_model=APIResponse)
@@ -66,7 +67,7 @@ async def update_application_status(
         updated_application = await application_service.update_application_status(application_id, status_update)
         return APIResponse(success=True, data=updated_application)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/order/{order_id}/available-specializations", response_model=APIResponse)
@@ -80,7 +81,7 @@ async def get_available_specializations(
         specializations = await application_service.get_available_specializations(order_id)
         return APIResponse(success=True, data=specializations)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/order/{order_id}/specialization/{specialization_index}", response_model=APIResponse)
@@ -95,7 +96,7 @@ async def get_applications_by_specialization(
         applications = await application_service.get_applications_by_specialization(order_id, specialization_index)
         return APIResponse(success=True, data=applications)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/eligibility/order/{order_id}", response_model=APIResponse)
@@ -114,4 +115,4 @@ async def check_application_eligibility(
         )
         return APIResponse(success=True, data=eligibility)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
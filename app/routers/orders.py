@@ -1,12 +1,16 @@
+import asyncio
 import uuid
+from typing import Optional
 
 from fastapi import APIRouter, Depends, Path, Query
 
 from ..deps.auth import get_current_user, require_client, require_freelancer
+from ..models.order import OrderStatus
 from ..models.user import User
 from ..schemas.common import APIResponse, PaginatedResponse
 from ..schemas.order import OrderCreate, OrderUpdate
 from ..services.order import OrderService
+from ..utils.errors import error_response
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
@@ -21,7 +25,7 @@ async def create_order(
         order = await order_service.create_order(current_user.user_id, order_data)
         return APIResponse(success=True, data=order)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 
@@ -35,30 +39,35 @@ async def get_my_orders(
         orders = await order_service.get_orders_by_client_user_id(current_user.user_id)
         return APIResponse(success=True, data=orders)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/", response_model=APIResponse)
 async def get_approved_orders(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
     current_user: User = Depends(require_freelancer()),
 ):
     try:
         order_service = OrderService()
-        skip = (page - 1) * size
-        orders = await order_service.get_approved_orders(skip, size)
+        skip = 0 if cursor else (page - 1) * size
+        (orders, next_cursor), total = await asyncio.gather(
+            order_service.get_approved_orders_page(size, cursor, skip),
+            order_service.count_orders(OrderStatus.APPROVED),
+        )
         
         paginated_response = PaginatedResponse(
             items=orders,
-            total=len(orders),
+            total=total,
             page=page,
             size=size,
-            pages=(len(orders) + size - 1) // size
+            pages=(total + size - 1) // size,
+            next_cursor=next_cursor,
         )
         return APIResponse(success=True, data=paginated_response)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/{order_id}", response_model=APIResponse)
@@ -71,7 +80,7 @@ async def get_order(
         order = await order_service.get_order_with_client_id(order_id)
         return APIResponse(success=True, data=order)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.put("/{order_id}", response_model=APIResponse)
@@ -85,4 +94,4 @@ async def update_order(
         updated_order = await order_service.update_order(order_id, order_update)
         return APIResponse(success=True, data=updated_order)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
@@ -7,6 +7,7 @@ from ..models.user import User
 from ..schemas.common import APIResponse
 from ..schemas.user import AccountDeletionRequest, UserUpdate
 from ..services.user import UserService
+from ..utils.errors import error_response
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -20,7 +21,7 @@ async def get_current_user_info(
         user_info = await user_service.get_user(current_user.user_id)
         return APIResponse(success=True, data=user_info)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.put("/me", response_model=APIResponse)
@@ -33,7 +34,7 @@ async def update_current_user(
         updated_user = await user_service.update_user(current_user.user_id, user_update)
         return APIResponse(success=True, data=updated_user)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.post("/me/avatar", response_model=APIResponse)
@@ -52,7 +53,7 @@ async def upload_user_avatar(
         )
         return APIResponse(success=True, data=avatar)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/me/avatar", response_model=APIResponse)
@@ -65,7 +66,7 @@ async def get_my_avatar_download_url(
         avatar = await user_service.get_avatar_download_url(current_user.user_id)
         return APIResponse(success=True, data=avatar)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.delete("/me/avatar", response_model=APIResponse)
@@ -78,7 +79,7 @@ async def delete_user_avatar(
         await user_service.delete_avatar(current_user.user_id)
         return APIResponse(success=True, data={"deleted": True})
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.delete("/me", response_model=APIResponse)
@@ -92,7 +93,7 @@ async def delete_current_user_account(
         result = await user_service.delete_account(current_user.user_id)
         return APIResponse(success=True, data=result)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/{user_id}/avatar", response_model=APIResponse)
@@ -106,7 +107,7 @@ async def get_user_avatar_download_url(
         avatar = await user_service.get_avatar_download_url(user_id)
         return APIResponse(success=True, data=avatar)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
 
 
 @router.get("/{user_id}", response_model=APIResponse)
@@ -120,4 +121,4 @@ async def get_user_by_id(
         user_info = await user_service.get_user(user_id)
         return APIResponse(success=True, data=user_info)
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return error_response(e)
@@ -19,3 +19,4 @@ class PaginatedResponse(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
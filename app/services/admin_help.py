@@ -36,8 +36,7 @@ class AdminHelpService:
             if not user:
                 raise NotFoundException("User not found")
 
-            pending_help_request = await self.notification_repo.get_pending_help_request_by_user(user_id)
-            if pending_help_request:
+            if await self.notification_repo.has_pending_help_request(user_id):
                 raise ConflictException(
                     "You already have a pending help request. "
                     "Please wait until an admin resolves it before submitting a new one."
@@ -2,6 +2,7 @@ from typing import Optional
 import uuid
 import structlog
 
+from ..datastore.executor import ExecutorSaturatedError
 from ..repositories.user import UserRepository
 from ..config.auth import create_access_token, create_refresh_token, verify_token
 from ..config.firebase import verify_firebase_token
@@ -90,6 +91,8 @@ class AuthService:
                 logger.info("User created successfully", user_id=str(user.user_id), roles=initial_roles)
             else:
                 logger.info("Existing user found", user_id=str(user.user_id))
+        except ExecutorSaturatedError:
+            raise
         except Exception as e:
             logger.error("Error with user repository operations", error=str(e))
             raise BadRequestException(f"User operation failed: {str(e)}")
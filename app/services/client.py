@@ -20,8 +20,7 @@ class ClientService:
         if not user:
             raise NotFoundException("User not found")
 
-        existing_client = await self.client_repo.get_by_user_id(user_id)
-        if existing_client:
+        if await self.client_repo.has_profile(user_id):
             raise ConflictException("Client profile already exists")
 
         client = await self.client_repo.create({
@@ -31,7 +30,7 @@ class ClientService:
 
         update_data = safe_model_dump(client_data, exclude_unset=True)
         if update_data:
-            await self.user_repo.update(user_id, update_data)
+            await self.user_repo.update_fields(user_id, update_data)
 
         await self.user_repo.add_role(user_id, "client")
 
@@ -59,7 +58,7 @@ class ClientService:
 
         update_data = safe_model_dump(client_update, exclude_unset=True)
         if update_data:
-            await self.user_repo.update(client.user_id, update_data)
+            await self.user_repo.update_fields(client.user_id, update_data)
 
         refreshed = await self.client_repo.get_by_id(client_id)
         if not refreshed:
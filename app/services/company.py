@@ -53,8 +53,7 @@ class CompanyService:
         return [await self._build_response(company) for company in companies]
 
     async def get_all_companies(self) -> List[CompanyResponse]:
-        companies = await self.company_repo.query()
-        return [await self._build_response(company) for company in companies]
+        return [await self._build_response(company) async for company in self.company_repo.stream()]
 
     async def update_company(self, company_id: uuid.UUID, company_update: CompanyUpdate) -> CompanyResponse:
         company = await self.company_repo.get_by_id(company_id)
@@ -73,11 +72,9 @@ class CompanyService:
             raise NotFoundException("Company not found")
 
         orders_data = []
-        for order_id in company.company_orders or []:
-            order = await self.order_repo.get_by_id(order_id)
-            if not order:
-                continue
-            order_colleagues = await self.application_repo.get_accepted_freelancers_by_order(order_id)
+        orders, _ = await self.order_repo.get_many(company.company_orders or [])
+        for order in orders:
+            order_colleagues = await self.application_repo.get_accepted_freelancers_by_order(order.order_id)
             orders_data.append({
                 "order_id": order.order_id,
                 "company_id": order.company_id,
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from ..repositories.freelancer import FreelancerRepository
 from ..repositories.user import UserRepository
@@ -42,10 +43,10 @@ class FreelancerService:
         if not user:
             raise NotFoundException("User not found")
 
-        if await self.freelancer_repo.get_by_user_id(user_id):
+        if await self.freelancer_repo.has_profile(user_id):
             raise ConflictException("Freelancer profile already exists")
 
-        if await self.freelancer_repo.get_by_email(freelancer_data.email):
+        if await self.freelancer_repo.is_email_registered(freelancer_data.email):
             raise ConflictException("Email already registered")
 
         user_update = {
@@ -66,7 +67,7 @@ class FreelancerService:
         freelancer = await self.freelancer_repo.create(payload)
 
         if user_update:
-            await self.user_repo.update(user_id, user_update)
+            await self.user_repo.update_fields(user_id, user_update)
 
         await self.user_repo.add_role(user_id, "freelancer")
 
@@ -78,7 +79,7 @@ class FreelancerService:
             if refreshed_user.avatar_storage_path:
                 sync_payload.update(self._avatar_payload_from_user(refreshed_user))
             if sync_payload:
-                await self.freelancer_repo.update(freelancer.freelancer_id, sync_payload)
+                await self.freelancer_repo.update_fields(freelancer.freelancer_id, sync_payload)
 
         refreshed = await self.freelancer_repo.get_by_id(freelancer.freelancer_id)
         return await self._build_response(refreshed)
@@ -116,29 +117,49 @@ class FreelancerService:
                 raise ConflictException("Email already registered")
 
         if update_payload:
-            await self.freelancer_repo.update(freelancer_id, update_payload)
+            await self.freelancer_repo.update_fields(freelancer_id, update_payload)
 
         if user_update:
-            await self.user_repo.update(freelancer.user_id, user_update)
+            await self.user_repo.update_fields(freelancer.user_id, user_update)
 
         refreshed = await self.freelancer_repo.get_by_id(freelancer_id)
         return await self._build_response(refreshed)
 
     async def get_pending_freelancers(self, skip: int = 0, limit: int = 100) -> List[FreelancerResponse]:
         freelancers = await self.freelancer_repo.get_pending_freelancers(skip, limit)
-        return [await self._build_response(f) for f in freelancers]
+        return await asyncio.gather(*(self._build_response(f) for f in freelancers))
 
     async def get_approved_freelancers(self, skip: int = 0, limit: int = 100) -> List[FreelancerResponse]:
         freelancers = await self.freelancer_repo.get_approved_freelancers(skip, limit)
-        return [await self._build_response(f) for f in freelancers]
+        return await asyncio.gather(*(self._build_response(f) for f in freelancers))
+
+    async def count_freelancers(self, status: SchemaFreelancerStatus) -> int:
+        return await self.freelancer_repo.count_by_status(ModelFreelancerStatus(status.value))
+
+    async def get_pending_freelancers_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[FreelancerResponse], Optional[str]]:
+        freelancers, next_cursor = await self.freelancer_repo.get_pending_freelancers_page(limit, cursor, skip)
+        return await asyncio.gather(*(self._build_response(f) for f in freelancers)), next_cursor
+
+    async def get_approved_freelancers_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[FreelancerResponse], Optional[str]]:
+        freelancers, next_cursor = await self.freelancer_repo.get_approved_freelancers_page(limit, cursor, skip)
+        return await asyncio.gather(*(self._build_response(f) for f in freelancers)), next_cursor
 
     async def approve_freelancer(self, freelancer_id: uuid.UUID, approval: FreelancerApproval) -> FreelancerResponse:
         status = ModelFreelancerStatus(approval.status.value)
         updated = await self.freelancer_repo.update_status(freelancer_id, status)
         if not updated:
             raise NotFoundException("Freelancer not found")
-        refreshed = await self.freelancer_repo.get_by_id(freelancer_id)
-        return await self._build_response(refreshed)
+        return await self._build_response(updated)
 
     async def upload_resume(
         self,
@@ -175,9 +196,9 @@ class FreelancerService:
             "resume_uploaded_at": uploaded_at.isoformat(),
         }
 
-        await self.user_repo.update(user_id, resume_update)
+        await self.user_repo.update_fields(user_id, resume_update)
         if freelancer:
-            await self.freelancer_repo.update(freelancer.freelancer_id, resume_update)
+            await self.freelancer_repo.update_fields(freelancer.freelancer_id, resume_update)
 
         return ResumeUploadResponse(
             resume_filename=filename,
@@ -204,9 +225,9 @@ class FreelancerService:
             "resume_filename": None,
             "resume_uploaded_at": None,
         }
-        await self.user_repo.update(user_id, clear_payload)
+        await self.user_repo.update_fields(user_id, clear_payload)
         if freelancer:
-            await self.freelancer_repo.update(freelancer.freelancer_id, clear_payload)
+            await self.freelancer_repo.update_fields(freelancer.freelancer_id, clear_payload)
 
     async def get_resume_download_url_for_user(self, user_id: uuid.UUID) -> ResumeDownloadResponse:
         user = await self.user_repo.get_by_id(user_id)
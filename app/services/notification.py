@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import uuid
 
@@ -20,23 +20,24 @@ class NotificationService:
     ) -> List[NotificationResponse]:
         """Get admin notifications with optional status filter"""
         notifications = await self.notification_repo.get_admin_notifications(status, skip, limit)
-        return [
-            NotificationResponse(
-                notification_id=notification.notification_id,
-                type=notification.type,
-                status=notification.status,
-                title=notification.title,
-                message=notification.message,
-                user_id=notification.user_id,
-                client_id=notification.client_id,
-                order_id=notification.order_id,
-                reason=notification.reason,
-                admin_notes=notification.admin_notes,
-                created_at=notification.created_at,
-                updated_at=notification.updated_at,
-            )
-            for notification in notifications
-        ]
+        return [self._build_response(notification) for notification in notifications]
+
+    async def get_admin_notifications_page(
+        self,
+        status: Optional[NotificationStatus] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[NotificationResponse], Optional[str]]:
+        """Get one page of admin notifications plus the cursor of the next page"""
+        notifications, next_cursor = await self.notification_repo.get_admin_notifications_page(
+            status, limit, cursor, skip
+        )
+        return [self._build_response(notification) for notification in notifications], next_cursor
+
+    async def count_admin_notifications(self, status: Optional[NotificationStatus] = None) -> int:
+        """Count admin notifications with optional status filter"""
+        return await self.notification_repo.count_admin_notifications(status)
 
     async def get_notification(self, notification_id: uuid.UUID) -> NotificationResponse:
         """Get a specific notification"""
@@ -136,4 +137,21 @@ class NotificationService:
             admin_notes=notification.admin_notes,
             created_at=notification.created_at,
             updated_at=notification.updated_at,
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def _build_response(notification) -> NotificationResponse:
+        return NotificationResponse(
+            notification_id=notification.notification_id,
+            type=notification.type,
+            status=notification.status,
+            title=notification.title,
+            message=notification.message,
+            user_id=notification.user_id,
+            client_id=notification.client_id,
+            order_id=notification.order_id,
+            reason=notification.reason,
+            admin_notes=notification.admin_notes,
+            created_at=notification.created_at,
+            updated_at=notification.updated_at,
+        )
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import uuid
 
@@ -119,6 +119,27 @@ class OrderService:
         orders = await self.order_repo.get_pending_orders(skip, limit)
         return [await self.get_order_admin_response(order) for order in orders]
 
+    async def count_orders(self, status: OrderStatus) -> int:
+        return await self.order_repo.count_by_status(status)
+
+    async def get_approved_orders_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[OrderResponse], Optional[str]]:
+        orders, next_cursor = await self.order_repo.get_approved_orders_page(limit, cursor, skip)
+        return [await self.get_order_response(order) for order in orders], next_cursor
+
+    async def get_pending_orders_for_admin_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[OrderAdminResponse], Optional[str]]:
+        orders, next_cursor = await self.order_repo.get_pending_orders_page(limit, cursor, skip)
+        return [await self.get_order_admin_response(order) for order in orders], next_cursor
+
     async def get_orders_by_company(
         self,
         company_id: uuid.UUID,
@@ -285,7 +306,7 @@ class OrderService:
             update_payload["surname"] = surname
 
         if update_payload:
-            await self.user_repo.update(user_id, update_payload)
+            await self.user_repo.update_fields(user_id, update_payload)
 
     async def _ensure_client_profile(self, user_id: uuid.UUID):
         client = await self.client_repo.get_by_user_id(user_id)
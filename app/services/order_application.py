@@ -1,5 +1,6 @@
 from typing import List, Optional
 
+import asyncio
 import uuid
 
 from ..exceptions import BadRequestException, ConflictException, NotFoundException
@@ -66,17 +67,11 @@ class OrderApplicationService:
                     raise ConflictException("This specialization is already occupied by another freelancer")
                 
                 # Check if freelancer already has ANY application for this order (prevents multiple applications per order)
-                existing_application = await self.application_repo.get_existing_application(
-                    application_data.order_id, freelancer_id
-                )
-                if existing_application:
+                if await self.application_repo.has_application(application_data.order_id, freelancer_id):
                     raise ConflictException("You have already applied for this order")
         else:
             # Check for general application (no specific specialization)
-            existing_application = await self.application_repo.get_existing_application(
-                application_data.order_id, freelancer_id
-            )
-            if existing_application:
+            if await self.application_repo.has_application(application_data.order_id, freelancer_id):
                 raise ConflictException("Application already exists for this order")
 
         application_dict = prepare_model_data_for_db(application_data)
@@ -96,16 +91,16 @@ class OrderApplicationService:
 
     async def get_applications_by_order(self, order_id: uuid.UUID) -> List[OrderApplicationResponse]:
         applications = await self.application_repo.get_by_order_id(order_id)
-        return [await self.get_application_response(a) for a in applications]
+        return await asyncio.gather(*(self.get_application_response(a) for a in applications))
 
     async def get_applications_by_freelancer(self, freelancer_id: uuid.UUID) -> List[OrderApplicationResponse]:
         applications = await self.application_repo.get_by_freelancer_id(freelancer_id)
-        return [await self.get_application_response(a) for a in applications]
+        return await asyncio.gather(*(self.get_application_response(a) for a in applications))
 
     async def get_applications_by_specialization(self, order_id: uuid.UUID, specialization_index: int) -> List[OrderApplicationResponse]:
         """Get all applications for a specific specialization"""
         applications = await self.application_repo.get_applications_for_specialization(order_id, specialization_index)
-        return [await self.get_application_response(a) for a in applications]
+        return await asyncio.gather(*(self.get_application_response(a) for a in applications))
 
     async def update_application_status(self, application_id: uuid.UUID, status_update: OrderApplicationUpdate) -> OrderApplicationResponse:
         application = await self.application_repo.get_by_id(application_id)
@@ -120,7 +115,11 @@ class OrderApplicationService:
         elif status_update.status == ApplicationStatus.REJECTED and application.status == ApplicationStatus.ACCEPTED and application.specialization_index is not None:
             await self._mark_specialization_as_available(application)
 
-        updated_application = await self.application_repo.update_status(application_id, status_update.status)
+        updated_application = await self.application_repo.update_status(
+            application_id,
+            status_update.status,
+            existing=application,
+        )
         if not updated_application:
             raise NotFoundException("Application not found")
         return await self.get_application_response(updated_application)
@@ -190,7 +189,7 @@ class OrderApplicationService:
             specialization.occupied_by_freelancer_id = application.freelancer_id
 
         # Update the order in the database
-        await self.order_repo.update(application.order_id, {"order_specializations": order.order_specializations})
+        await self.order_repo.update_fields(application.order_id, {"order_specializations": order.order_specializations})
 
     async def _mark_specialization_as_available(self, application) -> None:
         """Mark a specialization as available in the order"""
@@ -207,7 +206,7 @@ class OrderApplicationService:
             # Handle Pydantic model
             specialization.is_occupied = False
         # Update the order in the database
-        await self.order_repo.update(application.order_id, {"order_specializations": order.order_specializations})
+        await self.order_repo.update_fields(application.order_id, {"order_specializations": order.order_specializations})
 
     async def validate_application_eligibility(self, freelancer_id: uuid.UUID, order_id: uuid.UUID, vacancy_id: Optional[uuid.UUID] = None) -> dict:
         """Validate if a freelancer can apply for an order or specific specialization"""
@@ -245,13 +244,11 @@ class OrderApplicationService:
                     return {"eligible": False, "reason": "This specialization is already occupied by another freelancer"}
                 
                 # Check if freelancer already has ANY application for this order (prevents multiple applications per order)
-                existing_application = await self.application_repo.get_existing_application(order_id, freelancer_id)
-                if existing_application:
+                if await self.application_repo.has_application(order_id, freelancer_id):
                     return {"eligible": False, "reason": "You have already applied for this order"}
         else:
             # Check general application (no specific specialization)
-            existing_application = await self.application_repo.get_existing_application(order_id, freelancer_id)
-            if existing_application:
+            if await self.application_repo.has_application(order_id, freelancer_id):
                 return {"eligible": False, "reason": "Application already exists for this order"}
 
         return {"eligible": True, "reason": "Eligible to apply"}
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import uuid
 from datetime import timedelta
 from typing import Optional
@@ -9,6 +8,7 @@ from firebase_admin import storage
 
 from ..config.firebase import initialize_firebase
 from ..config.settings import settings
+from ..datastore.executor import get_executor
 from ..exceptions import BadRequestException
 
 ALLOWED_RESUME_CONTENT_TYPES = {
@@ -133,7 +133,7 @@ class FirebaseStorageService:
             except Exception as exc:
                 raise BadRequestException(_storage_error_message(exc)) from exc
 
-        await asyncio.to_thread(_upload)
+        await get_executor("storage").run(_upload)
         filename = original_filename or f"resume.{extension}"
         return storage_path, filename
 
@@ -157,7 +157,7 @@ class FirebaseStorageService:
             except Exception as exc:
                 raise BadRequestException(_storage_error_message(exc)) from exc
 
-        await asyncio.to_thread(_upload)
+        await get_executor("storage").run(_upload)
         return storage_path, f"avatar.{extension}"
 
     async def delete_file(self, storage_path: str) -> None:
@@ -170,7 +170,7 @@ class FirebaseStorageService:
             except Exception as exc:
                 raise BadRequestException(_storage_error_message(exc)) from exc
 
-        await asyncio.to_thread(_delete)
+        await get_executor("storage").run(_delete)
 
     async def delete_resume(self, storage_path: str) -> None:
         await self.delete_file(storage_path)
@@ -195,7 +195,7 @@ class FirebaseStorageService:
             except Exception as exc:
                 raise BadRequestException(_storage_error_message(exc)) from exc
 
-        return await asyncio.to_thread(_generate)
+        return await get_executor("storage").run(_generate)
 
 
 # Backward-compatible alias
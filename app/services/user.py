@@ -103,9 +103,9 @@ class UserService:
             "avatar_url": None,
         }
 
-        await self.user_repo.update(user_id, avatar_update)
+        await self.user_repo.update_fields(user_id, avatar_update)
         if freelancer:
-            await self.freelancer_repo.update(freelancer.freelancer_id, avatar_update)
+            await self.freelancer_repo.update_fields(freelancer.freelancer_id, avatar_update)
 
         return AvatarUploadResponse(avatar_uploaded_at=uploaded_at)
 
@@ -129,9 +129,9 @@ class UserService:
             "avatar_uploaded_at": None,
             "avatar_url": None,
         }
-        await self.user_repo.update(user_id, clear_payload)
+        await self.user_repo.update_fields(user_id, clear_payload)
         if freelancer:
-            await self.freelancer_repo.update(freelancer.freelancer_id, clear_payload)
+            await self.freelancer_repo.update_fields(freelancer.freelancer_id, clear_payload)
 
     async def delete_account(self, user_id: uuid.UUID) -> AccountDeletionResponse:
         """Permanently delete an account and data solely owned by that account."""
@@ -168,14 +168,18 @@ class UserService:
             "files": len(storage_paths),
         }
 
+        # Collect every deletion first and commit them together; the user record
+        # goes last so a partially applied commit can still be retried.
+        batch = self.user_repo.write_batch()
+
         if freelancer:
             applications = await self.application_repo.get_by_freelancer_id(
                 freelancer.freelancer_id
             )
             for application in applications:
-                await self.application_repo.delete(application.id)
+                self.application_repo.stage_delete(batch, application.id)
             deleted["order_applications"] += len(applications)
-            await self.freelancer_repo.delete(freelancer.freelancer_id)
+            self.freelancer_repo.stage_delete(batch, freelancer.freelancer_id)
             deleted["freelancer_profiles"] = 1
 
         if client:
@@ -185,21 +189,24 @@ class UserService:
                 for order in orders:
                     applications = await self.application_repo.get_by_order_id(order.order_id)
                     for application in applications:
-                        await self.application_repo.delete(application.id)
+                        self.application_repo.stage_delete(batch, application.id)
                     deleted["order_applications"] += len(applications)
-                    await self.order_repo.delete(order.order_id)
+                    self.order_repo.stage_delete(batch, order.order_id)
                 deleted["orders"] += len(orders)
-                await self.company_repo.delete(company.company_id)
+                self.company_repo.stage_delete(batch, company.company_id)
             deleted["companies"] = len(companies)
-            await self.client_repo.delete(client.client_id)
+            self.client_repo.stage_delete(batch, client.client_id)
             deleted["client_profiles"] = 1
 
         notifications = await self.notification_repo.get_for_account_deletion(user_id)
         for notification in notifications:
-            await self.notification_repo.delete(notification.notification_id)
+            self.notification_repo.stage_delete(batch, notification.notification_id)
         deleted["notifications"] = len(notifications)
 
-        await self.user_repo.delete(user_id)
+        self.user_repo.stage_delete(batch, user_id)
+        await batch.commit()
+        if client:
+            await self.company_repo.unregister_names(companies)
         return AccountDeletionResponse(deleted_resources=deleted)
 
     async def get_avatar_download_url(self, user_id: uuid.UUID) -> AvatarDownloadResponse:
@@ -215,6 +222,8 @@ class UserService:
         user = await self.user_repo.get_by_id(user_id)
         if not user:
             raise NotFoundException("User not found")
+        if role in user.roles:
+            return False
 
         return await self.user_repo.add_role(user_id, role)
 
@@ -0,0 +1,22 @@
+"""
+Error responses of the router handlers
+"""
+from ..datastore.executor import ExecutorSaturatedError
+from ..schemas.common import APIResponse
+
+
+def reraise_backpressure(exc: Exception) -> None:
+    """Re-raise ``exc`` if it is back-pressure from a datastore or storage
+    executor, so it reaches the 503 handler instead of the caller's own
+    error handling."""
+    if isinstance(exc, ExecutorSaturatedError):
+        raise exc
+
+
+def error_response(exc: Exception) -> APIResponse:
+    """The ``success=False`` response for an error caught by a handler.
+
+    Back-pressure is re-raised (see ``reraise_backpressure``).
+    """
+    reraise_backpressure(exc)
+    return APIResponse(success=False, error=str(exc))
@@ -0,0 +1,35 @@
+"""
+Opaque cursors for keyset pagination
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+
+def encode_cursor(value: Any, doc_id: str) -> str:
+    """
+    Encode the position of the last document of a page (order field value and
+    document id) as a URL-safe token.
+    """
+    if isinstance(value, datetime):
+        encoded_value: Any = {"$dt": value.isoformat()}
+    else:
+        encoded_value = value
+    raw = json.dumps([encoded_value, doc_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Reverse of ``encode_cursor``; raises ``ValueError`` for malformed tokens."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+    if not isinstance(doc_id, str):
+        raise ValueError("Invalid pagination cursor")
+    if isinstance(value, dict) and "$dt" in value:
+        value = datetime.fromisoformat(value["$dt"])
+    return value, doc_id
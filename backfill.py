@@ -0,0 +1,41 @@
+import asyncio
+import sys
+
+from app.config.firebase import initialize_firebase
+from app.repositories.company import CompanyRepository
+
+
+async def backfill_company_owner_ids():
+    """Give legacy companies an owner_ids array containing their client_id"""
+    updated = await CompanyRepository().backfill_owner_ids()
+    print(f"  companies.owner_ids backfilled ({updated} documents updated)")
+
+
+async def backfill_company_names():
+    """Write normalized_company_name on legacy companies and register every name (resumable)"""
+    processed = await CompanyRepository().backfill_normalized_names()
+    print(f"  company names backfilled ({processed} documents processed)")
+
+
+BACKFILLS = {
+    "company-owner-ids": backfill_company_owner_ids,
+    "company-names": backfill_company_names,
+}
+
+
+async def main(names):
+    # Initialize Firebase
+    initialize_firebase()
+
+    for name in names or BACKFILLS:
+        if name not in BACKFILLS:
+            print(f"Unknown backfill: {name} (available: {', '.join(BACKFILLS)})")
+            continue
+        print(f"Running backfill: {name}")
+        await BACKFILLS[name]()
+
+    print("Backfills completed!")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
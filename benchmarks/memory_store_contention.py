@@ -0,0 +1,135 @@
+"""
+Contention benchmark for InMemoryStore locking.
+
+Compares the per-collection reader/writer locks against a single global
+lock under a mixed read/write load spread over several collections.
+
+    python -m benchmarks.memory_store_contention [--seconds 2] [--workers 64]
+
+Two workloads are run:
+
+* ``store``: real InMemoryStore calls (point reads, indexed queries, updates).
+  Critical sections never await, so this mostly measures lock overhead.
+* ``hold``: the same lock acquisitions, but each holder awaits for
+  ``--hold-ms`` while holding the lock, standing in for work that yields
+  inside a critical section. This is where shared reads and per-collection
+  writes pay off.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.datastore.firestore import InMemoryStore, QueryOptions  # noqa: E402
+
+COLLECTIONS = ["users", "orders", "notifications", "companies"]
+DOCS_PER_COLLECTION = 2000
+
+
+class _GlobalLock:
+    """Stand-in for the previous behaviour: one lock for every operation."""
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+
+    def read(self, collection):
+        return self._lock
+
+    def write(self, collection):
+        return self._lock
+
+    def write_many(self, collections):
+        return self._lock
+
+    def write_all(self):
+        return self._lock
+
+
+def _make_store(mode: str) -> InMemoryStore:
+    store = InMemoryStore()
+    if mode == "global":
+        store._locks = _GlobalLock()
+    return store
+
+
+async def _seed(store: InMemoryStore) -> None:
+    for collection in COLLECTIONS:
+        batch = store.write_batch()
+        for i in range(DOCS_PER_COLLECTION):
+            batch.set(collection, f"{i}", {"owner": f"o{i % 50}", "status": "pending", "n": i})
+        await batch.commit()
+
+
+async def _store_worker(store, deadline, read_ratio, rng, counter):
+    while time.perf_counter() < deadline:
+        collection = rng.choice(COLLECTIONS)
+        doc_id = str(rng.randrange(DOCS_PER_COLLECTION))
+        if rng.random() < read_ratio:
+            if rng.random() < 0.5:
+                await store.get_document(collection, doc_id)
+            else:
+                owner = f"o{rng.randrange(50)}"
+                await store.query(collection, QueryOptions(filters=[("owner", "==", owner)], limit=10))
+        else:
+            await store.update_document(collection, doc_id, {"n": rng.random()})
+        counter[0] += 1
+        # let other workers interleave, like concurrent requests would
+        await asyncio.sleep(0)
+
+
+async def _hold_worker(store, deadline, read_ratio, rng, counter, hold):
+    locks = store._locks
+    while time.perf_counter() < deadline:
+        collection = rng.choice(COLLECTIONS)
+        guard = locks.read(collection) if rng.random() < read_ratio else locks.write(collection)
+        async with guard:
+            await asyncio.sleep(hold)
+        counter[0] += 1
+
+
+async def _run(mode, workload, seconds, workers, read_ratio, hold):
+    store = _make_store(mode)
+    await _seed(store)
+    counter = [0]
+    deadline = time.perf_counter() + seconds
+    rng = random.Random(42)
+    if workload == "store":
+        tasks = [_store_worker(store, deadline, read_ratio, random.Random(rng.random()), counter) for _ in range(workers)]
+    else:
+        tasks = [
+            _hold_worker(store, deadline, read_ratio, random.Random(rng.random()), counter, hold)
+            for _ in range(workers)
+        ]
+    started = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return counter[0] / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--hold-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'workload':<8} {'reads':>6} {'global ops/s':>14} {'per-collection ops/s':>21} {'speedup':>8}")
+    for workload in ("store", "hold"):
+        for read_ratio in (1.0, 0.9, 0.5):
+            results = {}
+            for mode in ("global", "per-collection"):
+                results[mode] = asyncio.run(
+                    _run(mode, workload, args.seconds, args.workers, read_ratio, args.hold_ms / 1000)
+                )
+            speedup = results["per-collection"] / results["global"]
+            print(
+                f"{workload:<8} {read_ratio:>6.0%} {results['global']:>14,.0f} "
+                f"{results['per-collection']:>21,.0f} {speedup:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Decode benchmark for the ``from_firestore`` converters of every model.
+
+Measures the per-document cost of turning a stored document into a model,
+with validation (``validate_stored_documents`` on, the previous behaviour)
+and with the trusted ``model_construct`` path used by default. The lazy
+entities returned by bulk queries are timed reading every field (what the
+list responses do) and reading three, next to the memory each entity keeps
+alive once its fields have been read.
+
+    python -m benchmarks.model_decoding [--rounds 20000]
+
+The documents are written by each model's own ``to_firestore``, so they
+look like what the repositories read back.
+"""
+import argparse
+import copy
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.settings import settings  # noqa: E402
+from app.models.lazy import lazy_factory  # noqa: E402
+from app.models import (  # noqa: E402
+    Client,
+    Company,
+    Freelancer,
+    Notification,
+    NotificationType,
+    Order,
+    OrderApplication,
+    User,
+)
+
+
+def _documents():
+    now = datetime.utcnow()
+    user_id, client_id, company_id, order_id = (uuid.uuid4() for _ in range(4))
+    models = [
+        User(
+            user_id=user_id,
+            name="Ann",
+            surname="Lee",
+            phone_number="+77000000000",
+            roles=["client", "freelancer"],
+            avatar_uploaded_at=now,
+        ),
+        Freelancer(
+            user_id=user_id,
+            iin="000000000000",
+            city="Almaty",
+            email="ann@example.com",
+            specializations_with_levels=[{"specialization": "backend", "skill_level": "senior"}] * 3,
+            payment_info={"iban": "KZ00"},
+            social_links={"github": "https://github.com/ann"},
+            portfolio_links={"site": "https://ann.dev"},
+            bio="Backend developer",
+            resume_uploaded_at=now,
+        ),
+        Client(client_id=client_id, user_id=user_id, company_ids=[uuid.uuid4() for _ in range(3)]),
+        Company(
+            company_id=company_id,
+            client_id=client_id,
+            owner_ids=[client_id, uuid.uuid4()],
+            company_name="Acme",
+            company_size=25,
+            company_orders=[uuid.uuid4() for _ in range(5)],
+        ),
+        Order(
+            order_id=order_id,
+            order_description="Build an API",
+            company_id=company_id,
+            order_title="API",
+            order_condition={"budget": 1000, "deadline": "2026-01-01"},
+            contracts=[{"type": "fixed", "amount": 1000}],
+            order_specializations=[{"specialization": "backend", "skill_level": "middle", "requirements": "Python"}] * 2,
+        ),
+        OrderApplication(
+            order_id=order_id,
+            freelancer_id=uuid.uuid4(),
+            company_id=company_id,
+            specialization_index=0,
+            specialization_name="backend",
+        ),
+        Notification(
+            type=NotificationType.HELP_REQUEST,
+            title="Help",
+            message="Need help with an order",
+            user_id=user_id,
+            client_id=client_id,
+            order_id=order_id,
+        ),
+    ]
+    return [(type(model), model.to_firestore()) for model in models]
+
+
+def _per_document_us(build, document, rounds, fields=()):
+    """Cost of building an entity with ``build`` and reading ``fields``."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        entity = build(document)
+        for field in fields:
+            getattr(entity, field)
+    return (time.perf_counter() - started) / rounds * 1_000_000
+
+
+def _retained_bytes(build, document, fields, count=1000):
+    """Memory kept per entity built from its own copy of ``document``."""
+    gc.collect()
+    tracemalloc.start()
+    documents = [copy.deepcopy(document) for _ in range(count)]
+    entities = [build(stored) for stored in documents]
+    for entity in entities:
+        for field in fields:
+            getattr(entity, field)
+    del documents
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20_000)
+    args = parser.parse_args()
+
+    configured = settings.validate_stored_documents
+    print(
+        f"{'':<18} {'decode us/doc':>29} {'read every field us/doc':>24} {'read 3':>7} {'bytes/entity':>15}"
+    )
+    print(
+        f"{'model':<18} {'validated':>10} {'trusted':>8} {'speedup':>8} {'model':>11} {'lazy':>12} "
+        f"{'lazy':>7} {'model':>7} {'lazy':>7}"
+    )
+    try:
+        for model, document in _documents():
+            lazy = lazy_factory(model)
+            fields = list(model.model_fields)
+            # warm up both decode paths before timing
+            settings.validate_stored_documents = True
+            _per_document_us(model.from_firestore, document, 100)
+            validated = _per_document_us(model.from_firestore, document, args.rounds)
+            settings.validate_stored_documents = False
+            _per_document_us(model.from_firestore, document, 100)
+            trusted = _per_document_us(model.from_firestore, document, args.rounds)
+            model_all = _per_document_us(model.from_firestore, document, args.rounds, fields)
+            lazy_all = _per_document_us(lazy, document, args.rounds, fields)
+            lazy_some = _per_document_us(lazy, document, args.rounds, fields[:3])
+            model_bytes = _retained_bytes(model.from_firestore, document, fields)
+            lazy_bytes = _retained_bytes(lazy, document, fields)
+            print(
+                f"{model.__name__:<18} {validated:>10.2f} {trusted:>8.2f} {validated / trusted:>7.2f}x "
+                f"{model_all:>11.2f} {lazy_all:>12.2f} {lazy_some:>7.2f} {model_bytes:>7.0f} {lazy_bytes:>7.0f}"
+            )
+    finally:
+        settings.validate_stored_documents = configured
+
+if __name__ == "__main__":
+    main()
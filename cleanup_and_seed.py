@@ -33,11 +33,12 @@ async def cleanup_database():
     for collection in collections:
         print(f"Cleaning up collection: {collection}")
         try:
-            # Get all documents in the collection (no filters, no limit)
-            from app.datastore.firestore import QueryOptions
+            # Stream all documents in the collection page by page (no filters, no limit)
+            from app.datastore.firestore import MAX_BATCH_WRITES, QueryOptions
             options = QueryOptions()  # Empty options to get all documents
-            documents = await store.query(collection, options)
-            for doc in documents:
+            batch = store.write_batch()
+            deleted_count = 0
+            async for doc in store.iter_query(collection, options):
                 # Find the ID field in the document
                 doc_id = None
                 for possible_id in ['id', 'user_id', 'client_id', 'company_id', 'order_id', 'freelancer_id', 'application_id']:
@@ -45,9 +46,11 @@ async def cleanup_database():
                         doc_id = str(doc[possible_id])
                         break
                 if doc_id:
-                    await store.delete_document(collection, doc_id)
-                    print(f"  Deleted document: {doc_id}")
-            print(f"  Collection {collection} cleaned up")
+                    batch.delete(collection, doc_id)
+                if len(batch) >= MAX_BATCH_WRITES:
+                    deleted_count += await batch.commit()
+            deleted_count += await batch.commit()
+            print(f"  Collection {collection} cleaned up ({deleted_count} documents deleted)")
         except Exception as e:
             print(f"  Error cleaning up {collection}: {e}")
 
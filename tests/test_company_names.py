@@ -1,6 +1,12 @@
+import asyncio
+import uuid
+
 import pytest
 from httpx import AsyncClient
 
+from app.datastore.firestore import get_firestore_store
+from app.repositories.company import COMPANY_NAMES_COLLECTION, CompanyRepository
+
 
 async def _client_headers(client: AsyncClient, phone_number: str) -> dict:
     response = await client.post("/auth/verify-otp", json={
@@ -35,3 +41,102 @@ async def test_duplicate_company_names_are_allowed(client: AsyncClient):
         second_data["data"]["company_id"]
         != first_company.json()["data"]["company_id"]
     )
+
+
+@pytest.mark.asyncio
+async def test_get_by_client_id_uses_owner_ids_after_backfill():
+    repo = CompanyRepository()
+    client_id, co_owner = uuid.uuid4(), uuid.uuid4()
+    owned = await repo.create({"client_id": str(client_id), "company_name": "Owned"})
+    shared = await repo.create({"client_id": str(uuid.uuid4()), "company_name": "Shared"})
+    await repo.add_owner(shared.company_id, client_id)
+    legacy_id = str(uuid.uuid4())
+    await get_firestore_store().set_document(
+        "companies",
+        legacy_id,
+        {"company_id": legacy_id, "client_id": str(co_owner), "company_name": "Legacy"},
+    )
+
+    found = await repo.get_by_client_id(client_id)
+    assert {company.company_id for company in found} == {owned.company_id, shared.company_id}
+    assert await repo.get_by_client_id(co_owner) == []
+
+    assert await repo.backfill_owner_ids(page_size=2) == 1
+    assert [company.company_name for company in await repo.get_by_client_id(co_owner)] == ["Legacy"]
+    assert await repo.backfill_owner_ids() == 0
+
+
+@pytest.mark.asyncio
+async def test_normalized_name_lookup_uses_registry_and_resumable_backfill():
+    repo = CompanyRepository()
+    store = get_firestore_store()
+    first = await repo.create({"client_id": str(uuid.uuid4()), "company_name": " Acme "})
+    await repo.create({"client_id": str(uuid.uuid4()), "company_name": "ACME"})
+    assert (await repo.get_by_normalized_name("acme")).company_id == first.company_id
+
+    await repo.update(first.company_id, {"company_name": "Renamed"})
+    assert (await repo.get_by_normalized_name("renamed")).company_id == first.company_id
+    assert (await repo.get_by_normalized_name("acme")).company_id != first.company_id
+
+    legacy_ids = sorted(str(uuid.uuid4()) for _ in range(3))
+    for index, legacy_id in enumerate(legacy_ids):
+        await store.set_document("companies", legacy_id, {
+            "company_id": legacy_id,
+            "client_id": str(uuid.uuid4()),
+            "company_name": f"Legacy {index}",
+        })
+    assert await repo.get_by_normalized_name("legacy 2") is None
+
+    # stopped after one page, then resumed from the checkpoint
+    assert await repo.backfill_normalized_names(page_size=2, max_pages=1) == 2
+    assert await repo.backfill_normalized_names(page_size=2) == 3
+    assert await repo.backfill_normalized_names(page_size=2) == 0
+
+    for index, legacy_id in enumerate(legacy_ids):
+        company = await repo.get_by_normalized_name(f"legacy {index}")
+        assert str(company.company_id) == legacy_id
+        assert (await store.get_document("companies", legacy_id))["normalized_company_name"] == f"legacy {index}"
+
+
+@pytest.mark.asyncio
+async def test_name_registry_keeps_concurrent_companies_and_drops_deleted_ones(monkeypatch):
+    repo = CompanyRepository()
+    store = get_firestore_store()
+    get_document = store.get_document
+
+    async def _slow_get_document(*args):
+        # let the other creates run between any read and write of the registry
+        await asyncio.sleep(0.01)
+        return await get_document(*args)
+
+    monkeypatch.setattr(store, "get_document", _slow_get_document)
+    created = await asyncio.gather(
+        *(repo.create({"client_id": str(uuid.uuid4()), "company_name": "Same Name"}) for _ in range(5))
+    )
+    key = repo._name_key("same name")
+
+    registry = await store.get_document(COMPANY_NAMES_COLLECTION, key)
+    assert sorted(registry["company_ids"]) == sorted(str(company.company_id) for company in created)
+
+    for company in created:
+        await repo.delete(company.company_id)
+    assert (await store.get_document(COMPANY_NAMES_COLLECTION, key))["company_ids"] == []
+    assert await repo.get_by_normalized_name("same name") is None
+
+
+@pytest.mark.asyncio
+async def test_name_registry_ignores_missing_companies_and_malformed_ids():
+    repo = CompanyRepository()
+    store = get_firestore_store()
+
+    assert await repo.update(uuid.uuid4(), {"company_name": "Ghost"}) is None
+    assert await store.get_document(COMPANY_NAMES_COLLECTION, repo._name_key("ghost")) is None
+
+    company = await repo.create({"client_id": str(uuid.uuid4()), "company_name": "Acme"})
+    batch = store.write_batch()
+    repo._stage_name(batch, "acme", ["not-a-uuid"])
+    await batch.commit()
+    assert (await repo.get_by_normalized_name("acme")).company_id == company.company_id
+
+    await repo.delete(company.company_id, existing=company)
+    assert await repo.get_by_normalized_name("acme") is None
@@ -0,0 +1,338 @@
+import os
+import uuid
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.datastore.firestore_async import AsyncFirestoreStore
+from app.datastore.firestore import (
+    ArrayRemove,
+    ArrayUnion,
+    DocumentNotFoundError,
+    FirestoreStore,
+    InMemoryStore,
+    QueryOptions,
+)
+from app.datastore.sqlite import SQLiteStore
+from app.repositories.notification import NotificationRepository
+from app.repositories.user import UserRepository
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+EMULATOR_HOST = os.environ.get("FIRESTORE_EMULATOR_HOST")
+EMULATOR_PROJECT = "collab-api-test"
+
+
+def _clear_emulator() -> None:
+    url = f"http://{EMULATOR_HOST}/emulator/v1/projects/{EMULATOR_PROJECT}/databases/(default)/documents"
+    httpx.delete(url).raise_for_status()
+
+
+@pytest.fixture(params=["memory", "sqlite", "firestore", "firestore_async"])
+def store(request, tmp_path) -> FirestoreStore:
+    """Every engine must pass the same conformance tests.
+
+    The Firestore engines run against the emulator when FIRESTORE_EMULATOR_HOST
+    is set and are skipped otherwise.
+    """
+    if request.param == "memory":
+        return FirestoreStore(memory_store=InMemoryStore())
+    if request.param == "sqlite":
+        return SQLiteStore(str(tmp_path / "store.sqlite3"))
+    if not EMULATOR_HOST:
+        pytest.skip("FIRESTORE_EMULATOR_HOST is not set")
+
+    from google.cloud import firestore
+
+    _clear_emulator()
+    if request.param == "firestore_async":
+        return AsyncFirestoreStore(client=firestore.AsyncClient(project=EMULATOR_PROJECT))
+    return FirestoreStore(client=firestore.Client(project=EMULATOR_PROJECT))
+
+
+@pytest.mark.asyncio
+async def test_get_documents_preserves_input_order(store: FirestoreStore):
+    await store.create_document("users", "a", {"name": "A"})
+    await store.create_document("users", "b", {"name": "B"})
+
+    documents = await store.get_documents("users", ["b", "missing", "a", "b"])
+
+    assert documents == [{"name": "B"}, None, {"name": "A"}, {"name": "B"}]
+
+
+@pytest.mark.asyncio
+async def test_repository_get_many_reports_missing_ids():
+    repo = UserRepository()
+    first = await repo.create_with_roles({"name": "First"}, ["client"])
+    second = await repo.create_with_roles({"name": "Second"}, ["freelancer"])
+    missing_id = uuid.uuid4()
+
+    found, missing = await repo.get_many([second.user_id, missing_id, first.user_id])
+
+    assert [user.user_id for user in found] == [second.user_id, first.user_id]
+    assert missing == [missing_id]
+
+
+@pytest.mark.asyncio
+async def test_update_document_single_round_trip(store: FirestoreStore):
+    await store.create_document("users", "a", {"name": "A", "surname": "Old"})
+
+    assert await store.update_document("users", "missing", {"name": "X"}) is None
+    assert await store.get_document("users", "missing") is None
+
+    result = await store.update_document("users", "a", {"name": "A2"})
+    assert set(result) == {"update_time"}
+
+    merged = await store.update_document(
+        "users",
+        "a",
+        {"surname": None},
+        base={"name": "A2", "surname": "Old"},
+    )
+    assert merged == {"name": "A2"}
+
+    reread = await store.update_document("users", "a", {"name": "A3"}, reread=True)
+    assert reread == {"name": "A3"}
+
+
+@pytest.mark.asyncio
+async def test_repository_update_merges_existing_entity():
+    repo = UserRepository()
+    user = await repo.create_with_roles({"name": "Ann", "phone_number": "+70000000003"}, ["client"])
+
+    updated = await repo.update(user.user_id, {"surname": "Lee"}, existing=user)
+    assert updated.surname == "Lee"
+    assert updated.roles == ["client"]
+
+    assert await repo.add_role(user.user_id, "freelancer") is True
+    stored = await repo.get_by_id(user.user_id)
+    assert stored.surname == "Lee"
+    assert stored.roles == ["client", "freelancer"]
+    assert await repo.update_fields(uuid.uuid4(), {"name": "Nobody"}) is False
+
+
+@pytest.mark.asyncio
+async def test_write_batch_applies_all_operations(store: FirestoreStore):
+    await store.create_document("users", "a", {"name": "A", "surname": "Old"})
+    await store.create_document("users", "b", {"name": "B"})
+
+    batch = store.write_batch()
+    batch.set("users", "c", {"name": "C"})
+    batch.update("users", "a", {"name": "A2", "surname": None})
+    batch.delete("users", "b")
+    assert await batch.commit() == 3
+
+    assert await store.get_documents("users", ["a", "b", "c"]) == [
+        {"name": "A2"},
+        None,
+        {"name": "C"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_array_union_and_remove_update_in_place(store: FirestoreStore):
+    await store.create_document("users", "a", {"roles": ["client"]})
+
+    payload = {"roles": ArrayUnion(["client", "freelancer"]), "tags": ArrayUnion(["x"])}
+    await store.update_document("users", "a", payload)
+    assert await store.get_document("users", "a") == {"roles": ["client", "freelancer"], "tags": ["x"]}
+    assert await store.query("users", QueryOptions(filters=[("roles", "array_contains", "freelancer")])) == [
+        {"roles": ["client", "freelancer"], "tags": ["x"]}
+    ]
+
+    batch = store.write_batch()
+    batch.update("users", "a", {"roles": ArrayRemove(["client"]), "missing": ArrayRemove(["x"])})
+    await batch.commit()
+    assert await store.get_document("users", "a") == {"roles": ["freelancer"], "tags": ["x"], "missing": []}
+    assert await store.update_document("users", "nobody", {"roles": ArrayUnion(["x"])}) is None
+
+    batch = store.write_batch()
+    batch.merge("users", "a", {"roles": ArrayUnion(["admin"])})
+    batch.merge("users", "new", {"name": "N", "roles": ArrayUnion(["client"])})
+    await batch.commit()
+    assert (await store.get_document("users", "a"))["roles"] == ["freelancer", "admin"]
+    assert await store.get_document("users", "new") == {"name": "N", "roles": ["client"]}
+
+
+@pytest.mark.asyncio
+async def test_write_batch_is_atomic_in_memory(store: FirestoreStore):
+    await store.create_document("users", "a", {"name": "A"})
+
+    batch = store.write_batch()
+    batch.delete("users", "a")
+    batch.update("users", "missing", {"name": "X"})
+
+    with pytest.raises(DocumentNotFoundError):
+        await batch.commit()
+    assert await store.get_document("users", "a") == {"name": "A"}
+
+
+@pytest.mark.asyncio
+async def test_query_start_after_resumes_after_cursor(store: FirestoreStore):
+    for doc_id, rank in [("d", 1), ("a", 2), ("c", 2), ("b", 3)]:
+        await store.create_document("items", doc_id, {"id": doc_id, "rank": rank})
+
+    first = await store.query("items", QueryOptions(order_by=("rank", "asc"), limit=2))
+    assert [doc["id"] for doc in first] == ["d", "a"]
+
+    second = await store.query(
+        "items",
+        QueryOptions(order_by=("rank", "asc"), limit=2, start_after=(2, "a")),
+    )
+    assert [doc["id"] for doc in second] == ["c", "b"]
+
+    by_id = await store.query("items", QueryOptions(limit=2, start_after=(None, "b")))
+    assert [doc["id"] for doc in by_id] == ["c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_query_page_walks_all_pages_with_cursor():
+    repo = NotificationRepository()
+    created = []
+    for index in range(5):
+        notification = await repo.create({
+            "type": "help_request",
+            "status": "pending",
+            "title": f"Help {index}",
+            "message": "Need help",
+            "user_id": str(uuid.uuid4()),
+            "created_at": datetime(2024, 1, 1, 12, index),
+        })
+        created.append(notification.notification_id)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = await repo.get_admin_notifications_page(limit=2, cursor=cursor)
+        seen.extend(notification.notification_id for notification in page)
+        if cursor is None:
+            break
+
+    assert seen == list(reversed(created))
+
+
+def test_cursor_round_trip():
+    moment = datetime(2024, 5, 1, 8, 30)
+    assert decode_cursor(encode_cursor(moment, "doc-1")) == (moment, "doc-1")
+    assert decode_cursor(encode_cursor(None, "doc-2")) == (None, "doc-2")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_count_matches_filters_without_limit(store: FirestoreStore):
+    for index in range(5):
+        status = "approved" if index % 2 else "pending"
+        await store.create_document("orders", str(index), {"order_status": status})
+
+    assert await store.count("orders") == 5
+    assert await store.count("orders", [("order_status", "==", "pending")]) == 3
+    assert await store.count("orders", [("order_status", "in", ["approved"])]) == 2
+    assert await store.count("missing") == 0
+
+
+@pytest.mark.asyncio
+async def test_range_array_and_inequality_operators(store: FirestoreStore):
+    rows = {
+        "a": {"salary": 100, "skills": ["python"]},
+        "b": {"salary": 300, "skills": ["go", "python"]},
+        "c": {"salary": "open", "skills": []},
+        "d": {"skills": ["go"]},
+    }
+    for doc_id, data in rows.items():
+        await store.create_document("orders", doc_id, {"id": doc_id, **data})
+
+    async def ids(*filters):
+        documents = await store.query("orders", QueryOptions(filters=list(filters)))
+        return sorted(doc["id"] for doc in documents)
+
+    assert await ids(("salary", ">=", 100), ("salary", "<", 300)) == ["a"]
+    assert await ids(("salary", ">", 0)) == ["a", "b"]
+    assert await ids(("skills", "array_contains", "go")) == ["b", "d"]
+    assert await ids(("skills", "array_contains_any", ["python", "rust"])) == ["a", "b"]
+    assert await ids(("salary", "not-in", [100])) == ["b", "c"]
+    assert await ids(("salary", "!=", 300)) == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_query_select_projects_fields_and_exists(store: FirestoreStore):
+    created = datetime(2024, 1, 1, 9, 0)
+    await store.create_document(
+        "order_applications",
+        "a",
+        {"id": "a", "order_id": "o1", "status": "accepted", "specialization_index": 0, "created_at": created},
+    )
+    await store.create_document(
+        "order_applications",
+        "b",
+        {"id": "b", "order_id": "o1", "status": "pending", "flags": [1], "active": True},
+    )
+
+    rows = await store.query(
+        "order_applications",
+        QueryOptions(select=["id", "specialization_index", "created_at", "flags", "active"]),
+    )
+    assert [{key: value for key, value in row.items() if key != "created_at"} for row in rows] == [
+        {"id": "a", "specialization_index": 0},
+        {"id": "b", "flags": [1], "active": True},
+    ]
+    assert rows[0]["created_at"].replace(tzinfo=None) == created
+
+    keys_only = await store.query("order_applications", QueryOptions(select=[]))
+    assert keys_only == [{}, {}]
+
+    assert await store.exists("order_applications", [("order_id", "==", "o1"), ("status", "==", "accepted")])
+    assert not await store.exists("order_applications", [("order_id", "==", "o2")])
+
+
+@pytest.mark.asyncio
+async def test_repository_query_fields_and_exists():
+    repo = NotificationRepository()
+    user_id = uuid.uuid4()
+    notification = await repo.create({
+        "type": "help_request",
+        "status": "pending",
+        "title": "Help",
+        "message": "Need help",
+        "user_id": str(user_id),
+    })
+
+    rows = await repo.query_fields(["status"], filters=[("user_id", "==", str(user_id))])
+    assert rows == [{"notification_id": str(notification.notification_id), "status": "pending"}]
+    assert await repo.has_pending_help_request(user_id)
+    assert not await repo.has_pending_help_request(uuid.uuid4())
+
+
+@pytest.mark.asyncio
+async def test_iter_query_pages_through_all_matches(store: FirestoreStore):
+    for index in range(7):
+        await store.create_document("items", f"{index:02d}", {"id": f"{index:02d}", "rank": index % 3, "kind": "x"})
+    await store.create_document("items", "other", {"id": "other", "rank": 0, "kind": "y"})
+
+    async def ids(options, page_size=2):
+        return [doc.get("id") async for doc in store.iter_query("items", options, page_size=page_size)]
+
+    by_id = QueryOptions(filters=[("kind", "==", "x")])
+    assert await ids(by_id) == [doc["id"] for doc in await store.query("items", by_id)]
+
+    ranked = QueryOptions(filters=[("kind", "==", "x")], order_by=("rank", "desc"), offset=1, limit=5)
+    assert await ids(ranked) == [doc["id"] for doc in await store.query("items", ranked)]
+
+    projected = QueryOptions(order_by=("rank", "asc"), select=["kind"])
+    rows = [doc async for doc in store.iter_query("items", projected, page_size=3)]
+    assert len(rows) == 8
+    assert all(set(row) == {"kind"} for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_repository_stream_yields_entities():
+    repo = UserRepository()
+    created = {
+        (await repo.create_with_roles({"name": f"User {index}"}, ["client"])).user_id
+        for index in range(5)
+    }
+
+    streamed = [user async for user in repo.stream(page_size=2)]
+
+    assert {user.user_id for user in streamed} == created
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+import app.datastore.cache as cache_module
+from app.config.settings import settings
+from app.datastore.cache import ENTITY_CACHE_EVICTIONS, ENTITY_CACHE_HITS, EntityCache
+from app.datastore.firestore import QueryOptions
+from app.repositories.user import UserRepository
+
+
+def _count(counter, collection: str) -> float:
+    return counter.labels(collection)._value.get()
+
+
+@pytest.fixture
+def cached_users(monkeypatch):
+    monkeypatch.setattr(settings, "entity_cache_ttl_seconds", {"users": 60})
+    monkeypatch.setattr(cache_module, "_CACHES", {})
+
+
+def test_cache_evicts_least_recently_used_and_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = EntityCache("lru-test", ttl=10, max_entries=2)
+    evictions = _count(ENTITY_CACHE_EVICTIONS, "lru-test")
+
+    cache.put("a", {"name": "A"})
+    cache.put("b", {"name": "B"})
+    assert cache.get("a") == {"name": "A"}
+    cache.put("c", {"name": "C"})
+
+    assert cache.get("b") is None
+    assert _count(ENTITY_CACHE_EVICTIONS, "lru-test") == evictions + 1
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_repository_reads_through_and_invalidates_on_writes(cached_users):
+    repo = UserRepository()
+    user = await repo.create_with_roles({"name": "Ann"}, ["client"])
+    hits = _count(ENTITY_CACHE_HITS, "users")
+
+    assert (await repo.get_by_id(user.user_id)).name == "Ann"
+    assert (await repo.get_by_id(user.user_id)).name == "Ann"
+    assert _count(ENTITY_CACHE_HITS, "users") == hits + 1
+
+    await repo.update_fields(user.user_id, {"name": "Bea"})
+    assert (await repo.get_by_id(user.user_id)).name == "Bea"
+
+    found, missing = await repo.get_many([user.user_id])
+    assert [entity.name for entity in found] == ["Bea"] and missing == []
+
+    await repo.delete(user.user_id)
+    assert await repo.get_by_id(user.user_id) is None
+
+
+def test_cache_is_disabled_unless_configured(monkeypatch):
+    monkeypatch.setattr(settings, "entity_cache_ttl_seconds", {})
+    monkeypatch.setattr(cache_module, "_CACHES", {})
+    assert UserRepository()._cache is None
+
+
+@pytest.fixture
+def cached_queries(monkeypatch):
+    monkeypatch.setattr(settings, "query_cache_ttl_seconds", {"users": 60})
+    monkeypatch.setattr(settings, "query_cache_stale_seconds", 60)
+    monkeypatch.setattr(cache_module, "_QUERY_CACHES", {})
+
+
+@pytest.mark.asyncio
+async def test_query_cache_drops_only_results_a_write_can_change(cached_queries, monkeypatch):
+    repo = UserRepository()
+    ann = await repo.create_with_roles({"name": "Ann", "surname": "A"}, ["client"])
+    await repo.create_with_roles({"name": "Bob", "surname": "B"}, ["freelancer"])
+    store = repo._store
+    queries = []
+    query = store.query
+
+    async def _counting_query(collection, options):
+        queries.append(options)
+        return await query(collection, options)
+
+    monkeypatch.setattr(store, "query", _counting_query)
+    by_name = [("name", "==", "Ann")]
+    by_phone = [("phone_number", "==", "+70000000001")]
+
+    assert [user.name for user in await repo.query(filters=by_name)] == ["Ann"]
+    assert await repo.query(filters=by_phone) == []
+    assert len(queries) == 2
+
+    # the surname is neither filtered on nor part of the phone result
+    await repo.update_fields(ann.user_id, {"surname": "Z"})
+    assert await repo.query(filters=by_phone) == []
+    assert [user.surname for user in await repo.query(filters=by_name)] == ["Z"]
+    assert len(queries) == 3
+
+    # a new matching document drops the result, a non-matching one does not
+    await repo.create_with_roles({"name": "Cid", "phone_number": "+70000000001"}, ["client"])
+    assert [user.name for user in await repo.query(filters=by_phone)] == ["Cid"]
+    assert [user.name for user in await repo.query(filters=by_name)] == ["Ann"]
+    assert len(queries) == 4
+
+
+@pytest.mark.asyncio
+async def test_query_cache_serves_stale_results_while_refreshing(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = cache_module.QueryCache("items", ttl=10, stale=10, max_entries=10)
+    loads = []
+
+    async def _load():
+        loads.append(1)
+        return [{"id": str(len(loads))}]
+
+    def _ids(documents):
+        return [document["id"] for document in documents]
+
+    options = QueryOptions()
+
+    assert await cache.get_or_load("key", options, _load, _ids) == [{"id": "1"}]
+    now[0] += 15
+    assert await cache.get_or_load("key", options, _load, _ids) == [{"id": "1"}]
+    await asyncio.sleep(0)
+    assert await cache.get_or_load("key", options, _load, _ids) == [{"id": "2"}]
+    assert len(loads) == 2
+
+    cache.on_delete("2")
+    assert await cache.get_or_load("key", options, _load, _ids) == [{"id": "3"}]
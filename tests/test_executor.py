@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.datastore.executor import BoundedExecutor, ExecutorSaturatedError
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_runs_blocking_calls():
+    executor = BoundedExecutor("test", max_workers=2, max_queue=4)
+    try:
+        assert await executor.run(lambda a, b: a + b, 2, b=3) == 5
+        assert executor.queue_depth == 0
+        assert executor.active_workers == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_fails_fast_when_queue_is_full():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        while executor.active_workers == 0:
+            await asyncio.sleep(0.001)
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0)
+        assert executor.queue_depth == 1
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: "rejected")
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+        assert executor.queue_depth == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_saturated_executor_reaches_clients_as_503(client, monkeypatch):
+    async def _saturated(*args, **kwargs):
+        raise ExecutorSaturatedError("datastore executor queue is full")
+
+    response = await client.post("/auth/verify-otp", json={"phone_number": "+1234567820", "code": "1234"})
+    headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+    monkeypatch.setattr("app.services.admin_help.AdminHelpService.create_help_request", _saturated)
+    monkeypatch.setattr("app.repositories.user.UserRepository.get_by_phone", _saturated)
+
+    help_response = await client.post("/request-help", json={"reason": "Stuck"}, headers=headers)
+    login_response = await client.post("/auth/verify-otp", json={"phone_number": "+1234567820", "code": "1234"})
+
+    for rejected in (help_response, login_response):
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "1"
+        assert rejected.json()["success"] is False
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.datastore.firestore import get_firestore_store
+from app.datastore.identity_map import current_identity_map, identity_map_scope
+from app.repositories.user import UserRepository
+
+
+@pytest.fixture
+def user_reads(monkeypatch):
+    store = get_firestore_store()
+    reads = []
+    get_document = store.get_document
+
+    async def _counting_get_document(collection, doc_id):
+        if collection == "users":
+            reads.append(doc_id)
+        return await get_document(collection, doc_id)
+
+    monkeypatch.setattr(store, "get_document", _counting_get_document)
+    return reads
+
+
+@pytest.mark.asyncio
+async def test_request_reads_current_user_once(client: AsyncClient, user_reads):
+    response = await client.post("/auth/verify-otp", json={"phone_number": "+1234567800", "code": "1234"})
+    headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+    user_reads.clear()
+
+    response = await client.get("/users/me", headers=headers)
+
+    assert response.status_code == 200
+    assert len(user_reads) == 1
+
+
+@pytest.mark.asyncio
+async def test_identity_map_follows_repository_writes(user_reads):
+    repo = UserRepository()
+    with identity_map_scope() as identity_map:
+        user = await repo.create_with_roles({"name": "Ann"}, ["client"])
+        assert (await repo.get_by_id(user.user_id)).name == "Ann"
+        assert user_reads == []
+
+        await repo.update_fields(user.user_id, {"name": "Bea"})
+        assert (await repo.get_by_id(user.user_id)).name == "Bea"
+        assert (await repo.get_by_id(user.user_id)).name == "Bea"
+        assert len(user_reads) == 1
+
+        await repo.delete(user.user_id)
+        assert await repo.get_by_id(user.user_id) is None
+        assert len(user_reads) == 1
+        assert len(identity_map) == 1
+    assert current_identity_map() is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_by_id_calls_share_one_batched_read(monkeypatch):
+    repo = UserRepository()
+    users = [await repo.create_with_roles({"name": f"User {index}"}, ["client"]) for index in range(3)]
+    store = get_firestore_store()
+    batches = []
+    get_documents = store.get_documents
+
+    async def _recording_get_documents(collection, doc_ids):
+        batches.append(list(doc_ids))
+        return await get_documents(collection, doc_ids)
+
+    monkeypatch.setattr(store, "get_documents", _recording_get_documents)
+    ids = [user.user_id for user in users] + [users[0].user_id]
+
+    loaded = await asyncio.gather(*(UserRepository().get_by_id(user_id) for user_id in ids))
+
+    assert [user.name for user in loaded] == ["User 0", "User 1", "User 2", "User 0"]
+    assert batches == [[str(user.user_id) for user in users]]
+    assert loaded[0] is not loaded[3]
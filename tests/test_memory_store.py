@@ -0,0 +1,278 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from app.config.settings import settings
+from app.datastore import firestore
+from app.datastore.firestore import InMemoryStore, QueryOptions
+from app.datastore.indexes import CollectionIndexes
+from app.datastore.locks import AsyncRWLock
+from app.datastore.persistence import StorePersistence
+
+
+async def _seed(store: InMemoryStore) -> None:
+    rows = [
+        ("n1", {"user_id": "u1", "status": "pending", "tags": ["a"]}),
+        ("n2", {"user_id": "u1", "status": "read", "tags": ["a"]}),
+        ("n3", {"user_id": "u2", "status": "pending", "tags": ["b"]}),
+        ("n4", {"user_id": "u3", "status": "pending"}),
+    ]
+    for doc_id, data in rows:
+        await store.create_document("notifications", doc_id, data)
+
+
+async def _ids(store: InMemoryStore, *filters) -> list:
+    documents = await store.query("notifications", QueryOptions(filters=list(filters)))
+    return [doc["user_id"] + ":" + doc["status"] for doc in documents]
+
+
+@pytest.mark.asyncio
+async def test_equality_index_intersects_filters():
+    store = InMemoryStore()
+    await _seed(store)
+
+    assert await _ids(store, ("user_id", "==", "u1"), ("status", "==", "pending")) == ["u1:pending"]
+    assert await _ids(store, ("user_id", "in", ["u2", "u3"]), ("status", "==", "pending")) == [
+        "u2:pending",
+        "u3:pending",
+    ]
+    assert await _ids(store, ("tags", "==", ["a"]), ("status", "==", "read")) == ["u1:read"]
+    assert await _ids(store, ("tags", "==", None)) == ["u3:pending"]
+    assert await store.count("notifications", [("status", "==", "pending")]) == 3
+
+    with pytest.raises(ValueError):
+        await store.query("notifications", QueryOptions(filters=[("status", "in", "pending")]))
+
+
+@pytest.mark.asyncio
+async def test_equality_index_follows_writes():
+    store = InMemoryStore()
+    await _seed(store)
+    assert await store.count("notifications", [("status", "==", "pending")]) == 3
+
+    await store.update_document("notifications", "n1", {"status": "read"})
+    await store.delete_document("notifications", "n3")
+    await store.set_document("notifications", "n4", {"user_id": "u3", "status": "resolved"})
+    batch = store.write_batch()
+    batch.set("notifications", "n5", {"user_id": "u4", "status": "pending"})
+    batch.update("notifications", "n2", {"status": None})
+    await batch.commit()
+
+    assert await _ids(store, ("status", "==", "pending")) == ["u4:pending"]
+    assert await _ids(store, ("status", "==", "read")) == ["u1:read"]
+    assert await store.count("notifications", [("status", "==", None)]) == 1
+    assert await store.count("notifications", [("user_id", "==", "u2")]) == 0
+
+    await store.reset()
+    assert await store.count("notifications", [("status", "==", "read")]) == 0
+
+
+def test_planner_uses_the_most_selective_index():
+    documents = {str(i): {"kind": "common", "owner": f"o{i}"} for i in range(100)}
+    indexes = CollectionIndexes()
+
+    assert indexes.candidates([("kind", "==", "common"), ("owner", "==", "o7")], documents) == {"7"}
+    assert indexes.candidates([("kind", "==", "rare")], documents) == set()
+    assert indexes.candidates([("owner", "!=", "o1")], documents) is None
+
+
+@pytest.mark.asyncio
+async def test_rw_lock_shares_reads_and_serialises_writes():
+    lock = AsyncRWLock()
+    events = []
+
+    async def reader(name, hold):
+        async with lock.read():
+            events.append(f"{name}+")
+            await asyncio.sleep(hold)
+            events.append(f"{name}-")
+
+    async def writer(name):
+        async with lock.write():
+            events.append(f"{name}+")
+            await asyncio.sleep(0)
+            events.append(f"{name}-")
+
+    first = asyncio.create_task(reader("r1", 0.02))
+    second = asyncio.create_task(reader("r2", 0.01))
+    await asyncio.sleep(0)
+    assert lock.readers == 2
+
+    blocked_writer = asyncio.create_task(writer("w"))
+    await asyncio.sleep(0)
+    late_reader = asyncio.create_task(reader("r3", 0))
+    await asyncio.gather(first, second, blocked_writer, late_reader)
+
+    # the queued writer runs after both readers and before the later reader
+    assert events == ["r1+", "r2+", "r2-", "r1-", "w+", "w-", "r3+", "r3-"]
+    assert lock.readers == 0 and not lock.writing
+
+
+@pytest.mark.asyncio
+async def test_rw_lock_cancelled_waiter_does_not_block_others():
+    lock = AsyncRWLock()
+    await lock.acquire(write=False)
+
+    cancelled = asyncio.create_task(lock.acquire(write=True))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    await asyncio.wait_for(lock.acquire(write=False), timeout=1)
+    assert lock.readers == 2
+    lock.release(write=False)
+    lock.release(write=False)
+    await asyncio.wait_for(lock.acquire(write=True), timeout=1)
+    assert lock.writing
+
+
+@pytest.mark.asyncio
+async def test_top_k_pages_match_full_sort():
+    store = InMemoryStore()
+    for i in range(50):
+        await store.create_document("orders", f"o{i:02d}", {"rank": i % 7, "kind": "even" if i % 2 == 0 else "odd"})
+
+    for direction in ("asc", "desc"):
+        everything = await store.query("orders", QueryOptions(order_by=("rank", direction)))
+        ranks = [doc["rank"] for doc in everything]
+        assert ranks == sorted(ranks, reverse=direction == "desc")
+        for offset, limit in [(0, 1), (0, 10), (5, 10), (45, 10), (60, 5)]:
+            page = await store.query(
+                "orders",
+                QueryOptions(order_by=("rank", direction), offset=offset, limit=limit),
+            )
+            assert page == everything[offset : offset + limit]
+
+    evens = await store.query("orders", QueryOptions(filters=[("kind", "==", "even")], limit=3))
+    assert [doc["rank"] for doc in evens] == [0, 2, 4]
+
+    page = await store.query("orders", QueryOptions(limit=2))
+    page[0]["rank"] = 99
+    assert (await store.query("orders", QueryOptions(limit=1)))[0]["rank"] == 0
+
+
+@pytest.mark.asyncio
+async def test_range_array_and_inequality_filters():
+    store = InMemoryStore()
+    rows = {
+        "a": {"salary": 100, "skills": ["python", "sql"], "created_at": datetime(2024, 1, 1)},
+        "b": {"salary": 250.5, "skills": ["go"], "created_at": datetime(2024, 2, 1, tzinfo=timezone.utc)},
+        "c": {"salary": 400, "skills": [], "created_at": datetime(2024, 3, 1)},
+        "d": {"salary": "negotiable", "skills": "python"},
+        "e": {"salary": None},
+        "f": {},
+    }
+    for doc_id, data in rows.items():
+        await store.create_document("orders", doc_id, {"id": doc_id, **data})
+
+    async def ids(*filters):
+        documents = await store.query("orders", QueryOptions(filters=list(filters)))
+        return sorted(doc["id"] for doc in documents)
+
+    assert await ids(("salary", ">=", 100), ("salary", "<", 400)) == ["a", "b"]
+    assert await ids(("salary", ">", 250.5)) == ["c"]
+    assert await ids(("salary", "<=", 100)) == ["a"]
+    assert await ids(("salary", ">", "a")) == ["d"]
+    assert await ids(("salary", "<", None)) == []
+    assert await ids(("created_at", ">=", datetime(2024, 2, 1)), ("created_at", "<", datetime(2024, 3, 1))) == ["b"]
+    assert await ids(("skills", "array_contains", "python")) == ["a"]
+    assert await ids(("skills", "array_contains_any", ["go", "sql"])) == ["a", "b"]
+    assert await ids(("salary", "!=", 100)) == ["b", "c", "d"]
+    assert await ids(("salary", "not-in", [100, 400])) == ["b", "d"]
+
+    ordered = await store.query("orders", QueryOptions(order_by=("salary", "asc")))
+    assert [doc.get("salary") for doc in ordered] == [None, 100, 250.5, 400, "negotiable"]
+
+    await store.update_document("orders", "a", {"salary": 500, "skills": ["rust"]})
+    assert await ids(("salary", ">", 400)) == ["a"]
+    assert await ids(("skills", "array_contains", "python")) == []
+    await store.delete_document("orders", "b")
+    assert await ids(("skills", "array_contains_any", ["go", "rust"])) == ["a"]
+
+    with pytest.raises(ValueError):
+        await store.query("orders", QueryOptions(filters=[("salary", "~", 1)]))
+
+
+@pytest.mark.asyncio
+async def test_persistent_store_restores_from_log_and_snapshot(tmp_path):
+    directory = str(tmp_path / "memory")
+    store = InMemoryStore(persistence=StorePersistence(directory))
+    await store.create_document("users", "a", {"name": "A", "created_at": datetime(2024, 1, 1)})
+    await store.create_document("users", "b", {"name": "B"})
+    await store.update_document("users", "a", {"name": "A2"})
+    await store.delete_document("users", "b")
+    batch = store.write_batch()
+    batch.set("orders", "o1", {"status": "pending"})
+    batch.update("users", "a", {"surname": "Z"})
+    await batch.commit()
+
+    restored = InMemoryStore(persistence=StorePersistence(directory))
+    assert await restored.get_documents("users", ["a", "b"]) == [
+        {"name": "A2", "created_at": datetime(2024, 1, 1), "surname": "Z"},
+        None,
+    ]
+    assert await restored.count("orders", [("status", "==", "pending")]) == 1
+
+    await restored.compact()
+    await restored.create_document("users", "c", {"name": "C"})
+    assert sorted(os.listdir(directory)) == ["mutations.1.log", "snapshot.pickle"]
+
+    again = InMemoryStore(persistence=StorePersistence(directory))
+    assert [doc["name"] for doc in await again.query("users", QueryOptions())] == ["A2", "C"]
+
+
+@pytest.mark.asyncio
+async def test_persistent_store_compacts_and_survives_torn_writes(tmp_path):
+    directory = str(tmp_path / "memory")
+    store = InMemoryStore(persistence=StorePersistence(directory), snapshot_every=3)
+    for index in range(4):
+        await store.create_document("users", str(index), {"n": index})
+    await asyncio.sleep(0.05)
+    assert os.path.exists(os.path.join(directory, "snapshot.pickle"))
+
+    log_path = os.path.join(directory, "mutations.1.log")
+    await store.create_document("users", "4", {"n": 4})
+    with open(log_path, "ab") as handle:
+        handle.write(b"\x40\x00\x00\x00partial")
+
+    restored = InMemoryStore(persistence=StorePersistence(directory))
+    assert await restored.count("users") == 5
+    await restored.create_document("users", "5", {"n": 5})
+    assert await InMemoryStore(persistence=StorePersistence(directory)).count("users") == 6
+
+
+@pytest.mark.asyncio
+async def test_failed_background_compaction_is_logged_and_loses_nothing(tmp_path, monkeypatch):
+    failures = []
+    monkeypatch.setattr("app.datastore.firestore.logger.exception", lambda event, **kw: failures.append(event))
+    persistence = StorePersistence(str(tmp_path / "memory"))
+
+    def _fail(collections, generation):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(persistence, "write_snapshot", _fail)
+    store = InMemoryStore(persistence=persistence, snapshot_every=2)
+    for index in range(3):
+        await store.create_document("users", str(index), {"n": index})
+    await asyncio.sleep(0.05)
+
+    assert len(failures) == 1
+    assert await InMemoryStore(persistence=StorePersistence(str(tmp_path / "memory"))).count("users") == 3
+
+
+def test_persistent_memory_store_is_restored_only_when_chosen(tmp_path, monkeypatch):
+    directory = tmp_path / "memory"
+    monkeypatch.setattr(settings, "memory_store_path", str(directory))
+    monkeypatch.setattr(settings, "datastore_engine", "sqlite")
+    monkeypatch.setattr(settings, "sqlite_path", str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(firestore, "_GLOBAL_STORE", None)
+    firestore.get_firestore_store()
+    assert not directory.exists()
+
+    monkeypatch.setattr(settings, "datastore_engine", "memory")
+    monkeypatch.setattr(firestore, "_GLOBAL_STORE", None)
+    assert firestore.get_firestore_store().using_memory
+    assert os.listdir(directory) == ["mutations.0.log"]
@@ -0,0 +1,156 @@
+import uuid
+
+import pytest
+
+from app.config.settings import settings
+from app.datastore.firestore import get_firestore_store
+from app.models import Client, Company, Freelancer, Notification, NotificationType, Order, OrderApplication, User
+from app.models.base import stored_uuid
+from app.models.lazy import LazyEntity, lazy_factory
+from app.repositories.order import OrderRepository
+
+
+@pytest.fixture
+def validated(monkeypatch):
+    monkeypatch.setattr(settings, "validate_stored_documents", True)
+
+
+@pytest.fixture
+def trusted(monkeypatch):
+    monkeypatch.setattr(settings, "validate_stored_documents", False)
+
+
+def test_trusted_decode_matches_validated_decode(monkeypatch):
+    client_id = uuid.uuid4()
+    models = [
+        User(name="Ann", roles=["client"]),
+        Company(client_id=client_id, owner_ids=[client_id], company_name="Acme", company_orders=[uuid.uuid4()]),
+        Notification(type=NotificationType.HELP_REQUEST, title="Help", message="Hi", user_id=uuid.uuid4()),
+    ]
+    for model in models:
+        document = model.to_firestore()
+        trusted = type(model).from_firestore(document)
+        monkeypatch.setattr(settings, "validate_stored_documents", True)
+        checked = type(model).from_firestore(document)
+        monkeypatch.setattr(settings, "validate_stored_documents", False)
+
+        assert trusted == checked
+        assert trusted.model_fields_set == checked.model_fields_set
+        assert trusted.to_firestore() == document
+
+
+def test_stored_uuid_matches_uuid_parsing():
+    value = uuid.uuid4()
+
+    parsed = stored_uuid(str(value))
+
+    assert parsed == value and hash(parsed) == hash(value) and str(parsed) == str(value)
+    with pytest.raises(ValueError):
+        stored_uuid("not-a-uuid")
+
+
+def test_validation_flag_rejects_bad_stored_data(validated):
+    document = Company(client_id=uuid.uuid4(), company_size=10).to_firestore()
+    document["company_size"] = "ten"
+
+    with pytest.raises(ValueError):
+        Company.from_firestore(document)
+
+
+def test_lazy_entities_decode_like_from_firestore(trusted):
+    client_id = uuid.uuid4()
+    company = Company(client_id=client_id, company_name="Acme", company_orders=[uuid.uuid4()]).to_firestore()
+    company["owner_ids"] = ["", str(uuid.uuid4())]  # legacy: empty id, primary owner missing
+    order = Order(order_description="API", company_id=uuid.uuid4()).to_firestore()
+    order["contracts"] = {"type": "fixed"}  # legacy: a single contract
+    notification = Notification(type=NotificationType.USER_ACTION, title="T", message="M", user_id=uuid.uuid4())
+    documents = [
+        (Company, company),
+        (Order, order),
+        (User, User(name="Ann", roles=["client"]).to_firestore()),
+        (Freelancer, Freelancer(user_id=uuid.uuid4(), iin="1", city="A", email="a@b.c").to_firestore()),
+        (Client, Client(user_id=uuid.uuid4(), company_ids=[uuid.uuid4()]).to_firestore()),
+        (
+            OrderApplication,
+            OrderApplication(order_id=uuid.uuid4(), freelancer_id=uuid.uuid4(), company_id=uuid.uuid4()).to_firestore(),
+        ),
+        (Notification, notification.to_firestore()),
+    ]
+    for model, document in documents:
+        entity = lazy_factory(model)(document)
+
+        assert isinstance(entity, LazyEntity)
+        assert entity.materialize() == model.from_firestore(document)
+        assert entity.to_firestore() == model.from_firestore(document).to_firestore()
+
+
+def test_lazy_entity_converts_only_the_fields_read(trusted):
+    document = Order(order_description="API", company_id=uuid.uuid4(), order_title="T").to_firestore()
+    document["created_at"] = "not a timestamp"
+    order = lazy_factory(Order)(document)
+
+    assert order.order_title == "T"
+    assert order.company_id == uuid.UUID(document["company_id"])
+    with pytest.raises(ValueError):
+        order.created_at
+
+    order.order_title = "New"
+    assert order.order_title == "New"
+    with pytest.raises(AttributeError):
+        order.unknown_field = 1
+
+
+@pytest.mark.asyncio
+async def test_repository_queries_return_lazy_entities(trusted):
+    repo = OrderRepository()
+    created = await repo.create({"order_description": "API", "company_id": str(uuid.uuid4())})
+    await get_firestore_store().set_document("orders", "broken", {"order_id": "broken", "company_id": "x"})
+
+    orders = await repo.query()
+
+    assert [order.order_id for order in orders] == [created.order_id]
+    assert isinstance(orders[0], LazyEntity)
+    assert isinstance(await repo.get_by_id(created.order_id), Order)
+
+
+@pytest.mark.asyncio
+async def test_changing_an_entity_leaves_the_stored_document_alone(trusted):
+    repo = OrderRepository()
+    created = await repo.create(
+        {
+            "order_description": "API",
+            "company_id": str(uuid.uuid4()),
+            "order_specializations": [{"specialization": "backend", "is_occupied": False}],
+        }
+    )
+
+    order = await repo.get_by_id(created.order_id)
+    order.order_specializations[0]["is_occupied"] = True
+
+    again = await repo.get_by_id(created.order_id)
+    assert again.order_specializations == [{"specialization": "backend", "is_occupied": False}]
+
+
+@pytest.mark.asyncio
+async def test_changing_a_lazy_entity_leaves_the_stored_document_alone(trusted):
+    repo = OrderRepository()
+    await repo.create(
+        {"order_description": "API", "company_id": str(uuid.uuid4()), "order_condition": {"budget": 100}}
+    )
+
+    (order,) = await repo.query()
+    order.order_condition["budget"] = 0
+    assert order.to_firestore()["order_condition"] == {"budget": 0}
+
+    (again,) = await repo.query()
+    assert again.order_condition == {"budget": 100}
+
+
+def test_lazy_required_fields_keep_stored_none(trusted):
+    document = Order(order_description="API", company_id=uuid.uuid4()).to_firestore()
+    document["order_description"] = None
+
+    assert lazy_factory(Order)(document).order_description is None
+    assert Order.from_firestore(document).order_description is None
+    del document["order_description"]
+    assert lazy_factory(Order)(document).order_description == Order.from_firestore(document).order_description == ""
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.datastore.firestore import FirestoreStore, QueryOptions
+from app.datastore.singleflight import COALESCED_READS, SingleFlight, query_key
+
+
+class _SlowClient:
+    """Just enough of a Firestore client for document reads."""
+
+    def __init__(self):
+        self.reads = 0
+
+    def collection(self, name):
+        return self
+
+    def document(self, doc_id):
+        return self
+
+    def get(self):
+        self.reads += 1
+        time.sleep(0.05)
+        return SimpleNamespace(exists=True, to_dict=lambda: {"name": "A", "roles": ["client"]})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_call_and_get_copies():
+    client = _SlowClient()
+    store = FirestoreStore(client=client)
+    coalesced = COALESCED_READS.labels("get_document")._value.get()
+
+    documents = await asyncio.gather(*(store.get_document("users", "a") for _ in range(5)))
+
+    assert client.reads == 1
+    assert COALESCED_READS.labels("get_document")._value.get() == coalesced + 4
+    assert all(document == {"name": "A", "roles": ["client"]} for document in documents)
+    documents[1]["roles"].append("admin")
+    assert documents[0]["roles"] == ["client"]
+
+    await store.get_document("users", "a")
+    assert client.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_fail_the_others():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def _read():
+        calls.append(1)
+        await release.wait()
+        return {"ok": True}
+
+    first = asyncio.ensure_future(flight.run("key", "test", _read))
+    second = asyncio.ensure_future(flight.run("key", "test", _read))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == {"ok": True}
+    assert calls == [1]
+    assert len(flight) == 0
+
+
+def test_equal_query_options_share_a_key():
+    first = QueryOptions(filters=[("status", "in", ["a", "b"])], limit=10, order_by=("created_at", "desc"))
+    second = QueryOptions(filters=[("status", "in", ["a", "b"])], limit=10, order_by=("created_at", "desc"))
+
+    assert query_key("orders", first) == query_key("orders", second)
+    assert query_key("orders", first) != query_key("orders", QueryOptions(limit=10))
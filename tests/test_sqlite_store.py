@@ -0,0 +1,75 @@
+import sqlite3
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.datastore.firestore import QueryOptions
+from app.datastore.sqlite import SQLiteStore
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_persists_and_restores_datetimes(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    store = SQLiteStore(path)
+    created = datetime(2024, 1, 1, 12, 30, 15, 250000)
+    await store.create_document("users", "u1", {"name": "Ann", "created_at": created, "tags": ["a"]})
+
+    reopened = SQLiteStore(path)
+    assert await reopened.get_document("users", "u1") == {"name": "Ann", "created_at": created, "tags": ["a"]}
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_orders_and_pages_on_generated_columns(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    store = SQLiteStore(path)
+    batch = store.write_batch()
+    for minute in range(5):
+        batch.set(
+            "notifications",
+            f"n{minute}",
+            {"id": f"n{minute}", "status": "pending", "created_at": datetime(2024, 1, 1, 12, minute)},
+        )
+    await batch.commit()
+
+    options = QueryOptions(
+        filters=[("status", "==", "pending")],
+        order_by=("created_at", "desc"),
+        limit=2,
+        start_after=(datetime(2024, 1, 1, 12, 3), "n3"),
+    )
+    page = await store.query("notifications", options)
+    assert [doc["id"] for doc in page] == ["n2", "n1"]
+    window = await store.count(
+        "notifications",
+        [("created_at", ">=", datetime(2024, 1, 1, 12, 1)), ("created_at", "<", datetime(2024, 1, 1, 12, 3))],
+    )
+    assert window == 2
+
+    connection = sqlite3.connect(path)
+    indexes = {row[1] for row in connection.execute("PRAGMA index_list(documents)")}
+    assert {"idx_f_status", "idx_f_created_at"} <= indexes
+    plan = " ".join(
+        row[3]
+        for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM documents WHERE collection = ? AND f_status = ?",
+            ("notifications", "pending"),
+        )
+    )
+    assert "idx_f_status" in plan
+
+    with pytest.raises(ValueError):
+        await store.query("notifications", QueryOptions(filters=[("bad field", "==", 1)]))
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_rejects_values_json_cannot_encode(tmp_path):
+    store = SQLiteStore(str(tmp_path / "store.sqlite3"))
+
+    for value in (uuid.uuid4(), object()):
+        with pytest.raises(TypeError):
+            await store.create_document("users", "u1", {"value": value})
+    assert await store.get_document("users", "u1") is None